@@ -0,0 +1,105 @@
+"""진입점별 import 시간 벤치마크.
+
+각 모듈을 새 파이썬 프로세스에서 불러와 걸린 시간과 함께 불러와진 무거운 의존성(crewAI, LiteLLM, pykrx)을 기록하고,
+IMPORT_BUDGETS 의 시간 예산과 LIGHT_MODULES 의 '불러오면 안 되는 의존성' 규칙을 어기면 회귀로 보고합니다
+(회귀가 있으면 종료 코드 1). 프로세스 시작 편차를 줄이기 위해 --repeat 번 측정해 최솟값을 사용합니다.
+-X importtime 으로 모듈별 누적 시간을 보면 어떤 import 가 예산을 넘겼는지 찾을 수 있습니다.
+
+    PYTHONPATH=src python -m benchmarks.bench_import --repeat 3
+    PYTHONPATH=src python -X importtime -c "import autostocktrading.pipeline" 2>&1 | sort -t'|' -k2 -n | tail
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# 불러오는 데 수 초가 걸려 필요할 때만 가져와야 하는 의존성
+HEAVY_MODULES = ("crewai", "litellm", "pykrx")
+
+# 진입점 → import 시간 예산(초). 측정 환경 편차를 감안해 실제 측정값(괄호)보다 넉넉하게 잡음
+IMPORT_BUDGETS = {
+    "autostocktrading": 0.5,                        # (0.01)
+    "autostocktrading.data.krx": 1.5,               # (0.45)
+    "autostocktrading.data.replay": 1.5,            # (0.5)
+    "autostocktrading.analysis.backtest": 1.5,      # (0.45)
+    "autostocktrading.pipeline": 1.5,               # (0.45)
+    "main": 2.0,                                    # (0.6, --help / --backtest 의 시작 시간)
+    "autostocktrading.crew": 10.0,                  # (5.9, crewAI import 가 대부분)
+}
+
+# crewAI 없이 불러와져야 하는 진입점. 크루 모듈도 pykrx 는 첫 KRX 조회 때까지 불러오지 않음
+LIGHT_MODULES = [name for name in IMPORT_BUDGETS if name != "autostocktrading.crew"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - started,
+                  "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int = 1) -> dict:
+    """새 프로세스에서 module 을 repeat 번 불러온 최소 시간(초)과 불러와진 무거운 의존성"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])),
+               PYTHONWARNINGS="ignore")
+    runs = []
+    for _ in range(max(1, repeat)):
+        completed = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                   capture_output=True, text=True, env=env, cwd=SRC_DIR, timeout=120)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{module} 를 불러오지 못했습니다: {completed.stderr.strip().splitlines()[-1:]}")
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    return {
+        "module": module,
+        "seconds": round(min(run["seconds"] for run in runs), 3),
+        "heavy": runs[0]["heavy"],
+        "budget_s": IMPORT_BUDGETS.get(module),
+    }
+
+
+def check(result: dict) -> list[str]:
+    """예산을 넘기거나 불러오면 안 되는 의존성을 불러온 항목"""
+    problems = []
+    if result["budget_s"] is not None and result["seconds"] > result["budget_s"]:
+        problems.append(f"{result['module']}: {result['seconds']}초 > 예산 {result['budget_s']}초")
+    forbidden = [name for name in result["heavy"]
+                 if result["module"] in LIGHT_MODULES or name == "pykrx"]
+    if forbidden:
+        problems.append(f"{result['module']}: {', '.join(forbidden)} 를 불러옴")
+    return problems
+
+
+def run_benchmarks(modules=None, repeat: int = 1) -> list[dict]:
+    results = []
+    for module in modules or IMPORT_BUDGETS:
+        result = measure(module, repeat)
+        heavy = ", ".join(result["heavy"]) or "없음"
+        print(f"[import] {module}: {result['seconds']:.3f}초 (예산 {result['budget_s']}초, 무거운 의존성: {heavy})")
+        results.append(result)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AutoStockTrading import 시간 벤치마크")
+    parser.add_argument("--modules", default=None, help=f"쉼표로 구분한 모듈 이름 (기본: {', '.join(IMPORT_BUDGETS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈마다 측정할 횟수 (최솟값 사용)")
+    args = parser.parse_args(argv)
+
+    modules = [name.strip() for name in args.modules.split(",")] if args.modules else None
+    problems = [problem for result in run_benchmarks(modules, args.repeat) for problem in check(result)]
+    if problems:
+        print("[import] 예산 초과:")
+        for line in problems:
+            print(f"  - {line}")
+        return 1
+    print("[import] 모든 진입점이 예산 안에 있습니다")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
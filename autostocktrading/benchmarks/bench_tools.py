@@ -0,0 +1,220 @@
+"""도구별 성능 벤치마크.
+
+autostocktrading.tools 의 정량 도구(가치 평가, 수급 분석, 리스크 분석, 비중 할당, 매매 계획)를
+FixtureKrx 픽스처 위에서 종목 수를 늘려 가며 실행하고, 크기별로 다음을 측정합니다.
+    cold_s / warm_s          빈 캐시에서의 첫 호출 / 같은 프로세스에서의 두 번째 호출 소요 시간(초)
+    network_calls            첫 호출의 KRX 호출 수 (warm_network_calls: 두 번째 호출)
+    peak_mb                  첫 호출 중 파이썬 메모리 할당 최대치 (tracemalloc)
+결과는 JSON 으로 저장되며, --baseline 으로 이전 결과를 지정하면 기준보다 느려지거나
+메모리, 네트워크 호출이 늘어난 항목을 회귀로 보고합니다 (회귀가 있으면 종료 코드 1).
+
+    PYTHONPATH=src python -m benchmarks.bench_tools --sizes 5,25,100,250,1000 --baseline .cache/benchmarks/<이전>.json
+
+결과는 기본적으로 캐시 디렉터리(AUTOSTOCK_CACHE_DIR, 기본 .cache) 아래 benchmarks/ 에 저장되어 커밋되지 않습니다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from autostocktrading.analysis.price_panel import clear_panel_cache
+from autostocktrading.data import krx
+from autostocktrading.data.storage import DEFAULT_CACHE_DIR
+from autostocktrading.tools.financial_tools import ValuationTool
+from autostocktrading.tools.market_data_tools import InsiderAnalysisTool
+from autostocktrading.tools.portfolio_tools import RiskAnalysisTool, AllocationTool
+from autostocktrading.tools.trading_tools import TradingPlannerTool
+
+from tests.fixtures import FixtureKrx, loaded_singletons
+
+DEFAULT_SIZES = (5, 25, 100, 250, 1000)
+RESULTS_DIR = os.path.join(os.getenv("AUTOSTOCK_CACHE_DIR", DEFAULT_CACHE_DIR), "benchmarks")
+
+# 회귀로 보지 않는 변화 폭 (상대 비율, 절대 시간 / 메모리)
+DEFAULT_THRESHOLD = 0.2
+MIN_SECONDS = 0.005
+MIN_MB = 1.0
+
+# 도구 이름 → 도구 인스턴스를 받아 티커 목록으로 구조화된 결과를 계산하는 함수
+TOOLS = {
+    "ValuationTool": (ValuationTool, lambda tool, tickers: tool.evaluate(tickers)),
+    "InsiderAnalysisTool": (InsiderAnalysisTool, lambda tool, tickers: tool.analyze(tickers)),
+    "RiskAnalysisTool": (RiskAnalysisTool, lambda tool, tickers: tool.correlation(tickers)),
+    "AllocationTool": (AllocationTool, lambda tool, tickers: tool.allocate(tickers)),
+    "TradingPlannerTool": (TradingPlannerTool, lambda tool, tickers: tool.plan(
+        {ticker: 100 / len(tickers) for ticker in tickers}, 1_000_000_000)),
+}
+
+@contextlib.contextmanager
+def isolated(backend, rate_limit: float = 0.0):
+    """빈 캐시 디렉터리와 새 공용 인스턴스로 backend 를 KRX 로 사용하는 환경. 끝나면 원래대로 되돌립니다."""
+    saved_env = {name: os.environ.get(name) for name in ("AUTOSTOCK_CACHE_DIR", "KRX_RATE_LIMIT")}
+    # 벤치마크마다 테스트와 같은 공용 인스턴스 목록(tests/fixtures.py)을 비움
+    saved = [(module, name, getattr(module, name)) for module, name in loaded_singletons()]
+    with tempfile.TemporaryDirectory(prefix="autostock-bench-") as root:
+        os.environ["AUTOSTOCK_CACHE_DIR"] = root
+        os.environ["KRX_RATE_LIMIT"] = str(rate_limit)
+        for module, name, _ in saved:
+            setattr(module, name, None)
+        clear_panel_cache()
+        krx.use_backend(backend)
+        try:
+            yield
+        finally:
+            krx.use_backend(None)
+            clear_panel_cache()
+            for module, name, value in saved:
+                setattr(module, name, value)
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def _timed(fn, *args) -> float:
+    # 도구의 진행 상황 출력은 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - started
+
+
+def measure(name: str, size: int, backend: FixtureKrx, rate_limit: float = 0.0) -> dict:
+    """도구 하나를 종목 size 개로 실행한 측정 결과"""
+    factory, call = TOOLS[name]
+    tool = factory()
+    tickers = backend.tickers[:size]
+
+    with isolated(backend, rate_limit):
+        backend.reset_calls()
+        cold = _timed(call, tool, tickers)
+        calls = dict(backend.calls)
+        backend.reset_calls()
+        warm = _timed(call, tool, tickers)
+        warm_calls = backend.total_calls
+
+    # 메모리는 추적 오버헤드가 시간 측정에 섞이지 않도록 빈 캐시에서 따로 한 번 더 실행
+    with isolated(backend, rate_limit):
+        tracemalloc.start()
+        try:
+            _timed(call, tool, tickers)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "tool": name,
+        "tickers": size,
+        "cold_s": round(cold, 4),
+        "warm_s": round(warm, 4),
+        "network_calls": sum(calls.values()),
+        "warm_network_calls": warm_calls,
+        "calls_by_endpoint": calls,
+        "peak_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), timeout=10).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, tools=None, latency: float = 0.0, rate_limit: float = 0.0) -> dict:
+    """tools(기본: 전체) × sizes 의 측정 결과와 실행 환경 정보"""
+    tools = list(tools or TOOLS)
+    unknown = [name for name in tools if name not in TOOLS]
+    if unknown:
+        raise ValueError(f"알 수 없는 도구입니다: {unknown} (가능: {list(TOOLS)})")
+
+    backend = FixtureKrx(tickers=max(sizes), latency=latency)
+    results = []
+    for name in tools:
+        for size in sizes:
+            result = measure(name, size, backend, rate_limit)
+            print(f"[벤치마크] {name} {size}종목: 첫 호출 {result['cold_s']:.3f}초 (KRX {result['network_calls']}회), "
+                  f"재호출 {result['warm_s']:.3f}초 (KRX {result['warm_network_calls']}회), "
+                  f"최대 메모리 {result['peak_mb']:.1f}MB")
+            results.append(result)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": latency,
+        "rate_limit": rate_limit,
+        "sizes": list(sizes),
+        "results": results,
+    }
+
+
+def save(report: dict, directory: str = RESULTS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.fromisoformat(report["created_at"]).strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{stamp}-{report['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """baseline 보다 나빠진 (도구, 종목 수, 지표) 목록. 네트워크 호출 수는 조금이라도 늘면 회귀입니다."""
+    before = {(r["tool"], r["tickers"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for current in report["results"]:
+        previous = before.get((current["tool"], current["tickers"]))
+        if previous is None:
+            continue
+        label = f"{current['tool']} {current['tickers']}종목"
+        for metric, floor in (("cold_s", MIN_SECONDS), ("warm_s", MIN_SECONDS), ("peak_mb", MIN_MB)):
+            old, new = previous[metric], current[metric]
+            if new - old > max(floor, old * threshold):
+                regressions.append(f"{label} {metric}: {old} → {new}")
+        for metric in ("network_calls", "warm_network_calls"):
+            if current[metric] > previous[metric]:
+                regressions.append(f"{label} {metric}: {previous[metric]} → {current[metric]}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AutoStockTrading 도구 벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="쉼표로 구분한 종목 수 목록")
+    parser.add_argument("--tools", default=None, help=f"쉼표로 구분한 도구 이름 (기본: 전체 {', '.join(TOOLS)})")
+    parser.add_argument("--latency", type=float, default=0.0, help="KRX 호출마다 흉내 낼 응답 지연(초)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="초당 KRX 요청 수 제한 (기본 0: 제한 없음)")
+    parser.add_argument("--output", default=RESULTS_DIR, help="결과 JSON 을 저장할 디렉터리")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 상대 변화 (기본 0.2)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    tools = [name.strip() for name in args.tools.split(",")] if args.tools else None
+    report = run_benchmarks(sizes, tools, latency=args.latency, rate_limit=args.rate_limit)
+    print(f"[벤치마크] 결과 저장: {save(report, args.output)}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print("[벤치마크] 기준 대비 회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("[벤치마크] 기준 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
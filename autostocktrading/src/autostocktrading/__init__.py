@@ -1,3 +1,25 @@
-from .crew import *
-from .tools import *
-from .config import *
\ No newline at end of file
+"""AutoStockTrading 패키지.
+
+크루와 도구 클래스는 crewAI 와 LiteLLM 을 불러오므로 (수 초) 처음 접근할 때 가져옵니다.
+data, analysis, instrumentation 처럼 가벼운 하위 모듈만 쓰는 CLI 명령과 테스트는 crewAI 없이 시작합니다.
+
+    from autostocktrading import Autostocktrading, ValuationTool
+"""
+import importlib
+
+from .tools import TOOL_MODULES
+
+# 공개 이름 → 정의된 하위 모듈
+_LAZY = {"Autostocktrading": ".crew", "DagCrew": ".crew", **{name: ".tools" for name in TOOL_MODULES}}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_LAZY[name], __name__), name)
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,285 @@
+"""정량 파이프라인의 결정적 단계(멀티 팩터 순위 → 역변동성 비중 → 주식 수 내림)를 과거 스냅샷으로 재현하는 백테스터.
+
+수년치 일별 시장 스냅샷을 날짜 × 종목 배열로 한 번만 적재해 두고,
+모든 리밸런싱 신호일의 전 종목 팩터 점수를 FactorEngine.score_panel() 로 한 번에 계산한 뒤
+리밸런싱마다 AllocationTool 과 같은 역변동성 비중, TradingPlannerTool 과 같은 주식 수 내림으로 목표 보유량을 정합니다.
+리밸런싱 사이의 평가금액은 (구간 종가 배열 @ 보유 주식 수) 한 번의 행렬 곱으로 계산하므로
+반복문은 리밸런싱 횟수만큼만 돌고, 10년치 KOSPI 일별 백테스트도 수 초 안에 끝납니다.
+
+미래 정보를 쓰지 않도록 신호(팩터 순위, 변동성)는 signal_lag 거래일 전 스냅샷으로 만들고 거래는 당일 종가로 체결합니다.
+수급 필터(InsiderAnalysisTool)와 업종 중립 정규화는 과거 시점의 데이터가 저장되어 있지 않으므로 재현하지 않습니다.
+    BACKTEST_WORKERS  파라미터 스윕에 사용할 프로세스 수 (기본: CPU 코어 수)
+"""
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .factor_engine import FactorEngine
+from ..data.calendar import get_calendar
+from ..data.fetcher import get_fetch_executor
+from ..data.snapshot_store import get_snapshot_store, FUNDAMENTAL_COLUMNS
+
+# 연 환산에 쓰는 거래일 수
+SESSIONS_PER_YEAR = 252
+
+# 거래 비용 기본값: 증권사 수수료(매수/매도), 증권거래세(매도), 체결가 불리 슬리피지
+DEFAULT_FEE_RATE = 0.00015
+DEFAULT_TAX_RATE = 0.0018
+DEFAULT_SLIPPAGE = 0.001
+
+REBALANCE_FREQUENCIES = ("D", "W", "M", "Q")
+
+# 백테스트에 적재하는 스냅샷 컬럼 (팩터 원값과 파생 팩터 계산에 필요한 컬럼)
+SNAPSHOT_COLUMNS = ["종가", "시가총액", *FUNDAMENTAL_COLUMNS]
+
+
+class BacktestData:
+    """거래일 × 종목 종가 배열과 팩터 계산용 스냅샷 컬럼 배열"""
+
+    def __init__(self, closes: pd.DataFrame, fields: dict = None):
+        self.closes = closes.astype(np.float64)
+        self.sessions = [d.strftime("%Y%m%d") for d in pd.DatetimeIndex(closes.index)]
+        self.tickers = list(closes.columns)
+        # 컬럼 이름 → (거래일 × 종목) 배열. 종가는 closes 를 그대로 사용
+        self.fields = {name: np.asarray(values, dtype=np.float32) for name, values in (fields or {}).items()}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def panel(self, rows) -> dict:
+        """지정한 거래일들의 컬럼 이름 → (거래일 × 종목) 배열. 종가가 없는 종목(상장 전, 거래정지)은 NaN 입니다."""
+        closes = self.closes.values[rows]
+        listed = ~np.isnan(closes)
+        panel = {name: np.where(listed, values[rows], np.nan) for name, values in self.fields.items()}
+        panel["종가"] = closes
+        return panel
+
+    def snapshot(self, i: int) -> pd.DataFrame:
+        """i 번째 거래일의 스냅샷 (종가가 있는 종목만)"""
+        columns = {"종가": self.closes.values[i]}
+        columns.update({name: values[i].astype(np.float64) for name, values in self.fields.items()})
+        snapshot = pd.DataFrame(columns, index=pd.Index(self.tickers, name="티커"))
+        return snapshot[snapshot["종가"].notna()]
+
+
+def load_backtest_data(fromdate: str, todate: str, market: str = "KOSPI") -> BacktestData:
+    """[fromdate, todate] 거래일의 시장 스냅샷을 적재합니다. 저장소에 없는 날짜만 네트워크로 조회합니다."""
+    sessions = get_calendar().sessions(fromdate, todate)
+    store = get_snapshot_store()
+    fetched = get_fetch_executor().map(lambda date: store.load_columns(date, ["market", *SNAPSHOT_COLUMNS]), sessions)
+    print(fetched.summary("백테스트 데이터", unit="거래일"))
+    for date, e in fetched.errors.items():
+        print(f"{date} 스냅샷을 가져오지 못했습니다.: {e}")
+
+    # 해당 시장 종목이 없는 날은 날짜째로 빼서 모든 패널의 날짜 축을 맞춤
+    frames = {}
+    for date, snapshot in fetched.ordered():
+        subset = snapshot[snapshot["market"] == market] if not snapshot.empty else snapshot
+        if not subset.empty:
+            frames[date] = subset.drop(columns="market")
+    if not frames:
+        return BacktestData(pd.DataFrame(dtype=np.float64))
+
+    # 날짜별 스냅샷을 (날짜, 티커) 긴 표로 이어 붙인 뒤 컬럼마다 날짜 × 종목 배열로 펼침
+    long = pd.concat(frames, names=["날짜", "티커"])
+    panels = {column: long[column].unstack("티커").reindex(list(frames)) for column in SNAPSHOT_COLUMNS}
+    closes = panels.pop("종가")
+    closes.index = pd.to_datetime(closes.index, format="%Y%m%d")
+    return BacktestData(closes, {name: panel.reindex(columns=closes.columns).values for name, panel in panels.items()})
+
+
+def rebalance_indices(sessions: list[str], rebalance="M") -> np.ndarray:
+    """리밸런싱할 거래일 번호. D/W/M/Q 는 각 일/주/월/분기의 첫 거래일, 정수 n 은 n 거래일마다입니다."""
+    if not sessions:
+        return np.empty(0, dtype=int)
+    if isinstance(rebalance, (int, np.integer)) or str(rebalance).isdigit():
+        step = int(rebalance)
+        if step <= 0:
+            raise ValueError("리밸런싱 간격은 1 이상이어야 합니다.")
+        return np.arange(0, len(sessions), step)
+
+    rebalance = str(rebalance).upper()
+    if rebalance not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"리밸런싱 주기는 {REBALANCE_FREQUENCIES} 또는 거래일 수여야 합니다: {rebalance}")
+    if rebalance == "D":
+        return np.arange(len(sessions))
+    periods = pd.to_datetime(sessions, format="%Y%m%d").to_period(rebalance).asi8
+    return np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+
+
+def performance(equity: pd.Series, sessions_per_year: int = SESSIONS_PER_YEAR) -> dict:
+    """평가금액 시리즈의 누적/연환산 수익률, 연환산 변동성, 샤프 지수(무위험 수익률 0), 최대 낙폭"""
+    values = equity.to_numpy(dtype=np.float64)
+    if len(values) < 2 or values[0] <= 0:
+        return {"total_return": 0.0, "cagr": 0.0, "volatility": 0.0, "sharpe": 0.0, "max_drawdown": 0.0}
+
+    returns = values[1:] / values[:-1] - 1.0
+    years = len(returns) / sessions_per_year
+    total = values[-1] / values[0] - 1.0
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    peak = np.maximum.accumulate(values)
+    return {
+        "total_return": total,
+        "cagr": (values[-1] / values[0]) ** (1 / years) - 1.0 if values[-1] > 0 else -1.0,
+        "volatility": std * math.sqrt(sessions_per_year),
+        "sharpe": returns.mean() / std * math.sqrt(sessions_per_year) if std > 0 else 0.0,
+        "max_drawdown": float((values / peak - 1.0).min()),
+    }
+
+
+class BacktestResult:
+    """일별 평가금액, 리밸런싱별 거래 내역, 성과 지표"""
+
+    def __init__(self, equity: pd.Series, trades: pd.DataFrame, rebalances: pd.DataFrame):
+        self.equity = equity
+        self.trades = trades
+        self.rebalances = rebalances
+
+    def stats(self) -> dict:
+        stats = performance(self.equity)
+        stats.update({
+            "rebalances": len(self.rebalances),
+            "turnover": float(self.rebalances["turnover"].mean()) if len(self.rebalances) else 0.0,
+            "costs": float(self.rebalances["costs"].sum()) if len(self.rebalances) else 0.0,
+            "final_equity": float(self.equity.iloc[-1]) if len(self.equity) else 0.0,
+        })
+        return stats
+
+
+class Backtester:
+    """팩터 순위 상위 top_n 종목을 역변동성 비중으로 주기적으로 리밸런싱하는 전략의 백테스터"""
+
+    def __init__(self, top_n: int = 10, rebalance="M", lookback: int = 60, initial_capital: float = 10_000_000,
+                 fee_rate: float = DEFAULT_FEE_RATE, tax_rate: float = DEFAULT_TAX_RATE,
+                 slippage: float = DEFAULT_SLIPPAGE, signal_lag: int = 1, factor_config: dict = None):
+        self.top_n = int(top_n)
+        self.rebalance = rebalance
+        self.lookback = int(lookback)
+        self.initial_capital = float(initial_capital)
+        self.fee_rate = float(fee_rate)
+        self.tax_rate = float(tax_rate)
+        self.slippage = float(slippage)
+        self.signal_lag = int(signal_lag)
+        self.engine = FactorEngine(factor_config)
+
+    def _weights(self, returns: np.ndarray, s: int, candidates: np.ndarray) -> tuple:
+        """s 번째 거래일까지 lookback 거래일 수익률의 역변동성 비중 (AllocationTool 과 같이 % 소수 둘째 자리 반올림)"""
+        window = returns[max(0, s + 1 - self.lookback):s + 1, candidates]
+        mask = ~np.isnan(window)
+        n = mask.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(mask, window, 0.0).sum(axis=0) / n
+            var = np.where(mask, (window - mean) ** 2, 0.0).sum(axis=0) / (n - 1)
+            inverse = 1.0 / np.sqrt(var)
+        usable = (n >= 2) & np.isfinite(inverse)
+        if not usable.any():
+            return candidates[:0], np.empty(0)
+        inverse = inverse[usable]
+        return candidates[usable], np.round(inverse / inverse.sum() * 100, 2) / 100
+
+    def run(self, data: BacktestData) -> BacktestResult:
+        prices = data.closes.to_numpy()
+        n_days, n_tickers = prices.shape
+        # 거래정지/상장폐지 종목은 마지막 종가로 평가, 상장 전은 0 (보유량도 0)
+        marks = np.nan_to_num(data.closes.ffill().to_numpy(), nan=0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.full((n_days, n_tickers), np.nan)
+            returns[1:] = prices[1:] / prices[:-1] - 1.0
+
+        schedule = [i for i in rebalance_indices(data.sessions, self.rebalance) if i >= self.signal_lag]
+        # 모든 신호일의 팩터 점수를 (신호일 × 종목) 배열로 한 번에 계산
+        scores = self.engine.score_panel(data.panel([i - self.signal_lag for i in schedule]))
+        buy_price_factor = (1 + self.slippage) * (1 + self.fee_rate)
+        # 전량 매도 비용까지 감안해 현금이 음수가 되지 않도록 평가금액의 일부만 투자
+        reserve = self.fee_rate + self.tax_rate + self.slippage
+
+        equity = np.full(n_days, self.initial_capital)
+        holdings = np.zeros(n_tickers)
+        cash = self.initial_capital
+        trades, rebalances = [], []
+
+        for k, i in enumerate(schedule):
+            s = i - self.signal_lag
+            # 신호일 점수 순위 중 체결일에 거래 가능한(종가가 있는) 종목만 편입 (동점은 FactorEngine.score 와 같이 티커 순서)
+            ranked = np.argsort(-scores[k], kind="stable")
+            ranked = ranked[~np.isnan(scores[k, ranked]) & ~np.isnan(prices[i, ranked])][:self.top_n]
+            selected, weights = self._weights(returns, s, ranked)
+
+            price = prices[i]
+            value = cash + holdings @ marks[i]
+            target = np.where(np.isnan(price), holdings, 0.0)
+            budget = value * (1 - reserve)
+            target[selected] = np.floor(budget * weights / (price[selected] * buy_price_factor))
+
+            delta = target - holdings
+            traded = np.flatnonzero(delta)
+            buys, sells = delta[traded] > 0, delta[traded] < 0
+            notional = np.abs(delta[traded]) * price[traded]
+            buy_amount = (notional[buys] * (1 + self.slippage)).sum()
+            sell_amount = (notional[sells] * (1 - self.slippage)).sum()
+            fees = buy_amount * self.fee_rate + sell_amount * (self.fee_rate + self.tax_rate)
+            cash += sell_amount - buy_amount - fees
+            holdings = target
+
+            end = schedule[k + 1] if k + 1 < len(schedule) else n_days
+            equity[i:end] = cash + marks[i:end] @ holdings
+
+            date = data.sessions[i]
+            trades.extend({"date": date, "ticker": data.tickers[j], "shares": int(d), "price": float(p)}
+                          for j, d, p in zip(traded, delta[traded], price[traded]))
+            rebalances.append({
+                "date": date,
+                "positions": int(np.count_nonzero(holdings)),
+                "turnover": float(notional.sum() / value) if value > 0 else 0.0,
+                "costs": float(fees + notional.sum() * self.slippage),
+                "cash": float(cash),
+            })
+
+        return BacktestResult(
+            pd.Series(equity, index=data.closes.index, name="equity"),
+            pd.DataFrame(trades, columns=["date", "ticker", "shares", "price"]),
+            pd.DataFrame(rebalances, columns=["date", "positions", "turnover", "costs", "cash"]),
+        )
+
+
+# 스윕 작업 프로세스가 공유하는 데이터 (프로세스를 만들 때 한 번만 전달)
+_worker_data = None
+
+
+def _init_worker(data: BacktestData) -> None:
+    global _worker_data
+    _worker_data = data
+
+
+def _run_params(params: dict) -> dict:
+    try:
+        return {**params, **Backtester(**params).run(_worker_data).stats()}
+    except Exception as e:
+        return {**params, "error": str(e)}
+
+
+def sweep(data: BacktestData, grid: dict, max_workers: int = None) -> pd.DataFrame:
+    """grid({파라미터: 값 목록})의 모든 조합을 여러 프로세스에서 백테스트하여 샤프 지수 순으로 반환합니다.
+
+    파라미터는 Backtester 의 인자(top_n, rebalance, lookback, fee_rate, slippage, ...)입니다.
+    """
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    max_workers = max_workers or int(os.getenv("BACKTEST_WORKERS", "0")) or os.cpu_count() or 1
+
+    if max_workers <= 1 or len(combos) <= 1:
+        _init_worker(data)
+        rows = [_run_params(params) for params in combos]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(combos)),
+                                 initializer=_init_worker, initargs=(data,)) as pool:
+            rows = list(pool.map(_run_params, combos))
+
+    result = pd.DataFrame(rows)
+    if "sharpe" in result.columns:
+        result = result.sort_values("sharpe", ascending=False, kind="stable", na_position="last")
+    return result.reset_index(drop=True)
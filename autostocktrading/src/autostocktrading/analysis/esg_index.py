@@ -0,0 +1,152 @@
+"""뉴스 코퍼스 기반 ESG 리스크 색인.
+
+NewsCache 가 모아 둔 기사(제목 + 요약)에 문자 바이그램 역색인을 만들어 두고,
+config/esg_lexicon.yaml 의 환경 / 노동·안전 / 지배구조 리스크 용어와 후보 종목명을 한 번씩만 조회하여
+모든 후보의 리스크 점수를 한 번에 계산합니다.
+한국어는 조사가 붙고 띄어쓰기가 일정하지 않으므로 공백을 없앤 본문에서 부분 문자열로 찾습니다.
+바이그램 색인은 후보 기사를 좁히는 데만 쓰고, 최종 일치 여부는 본문에서 다시 확인합니다.
+"""
+import os
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+
+import pandas as pd
+import yaml
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "esg_lexicon.yaml")
+
+# 플래그된 종목마다 함께 보여줄 기사 제목 수
+HEADLINES = 3
+
+_SPACE = re.compile(r"\s+")
+
+
+def _compact(text: str) -> str:
+    return _SPACE.sub("", unicodedata.normalize("NFKC", text or "")).lower()
+
+
+def _bigrams(text: str) -> set:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def load_lexicon(path: str = None) -> dict:
+    with open(path or LEXICON_PATH, 'r', encoding='utf-8') as f:
+        lexicon = yaml.safe_load(f) or {}
+    if not lexicon.get("categories"):
+        raise ValueError("ESG 어휘 사전에 categories 가 없습니다.")
+    return lexicon
+
+
+class NewsIndex:
+    """기사 제목 + 요약에 대한 문자 바이그램 역색인"""
+
+    def __init__(self, articles: list[dict]):
+        self.articles = list(articles)
+        self._texts = [_compact(f"{a.get('title', '')} {a.get('description', '')}") for a in self.articles]
+        self._postings = defaultdict(set)
+        for doc_id, text in enumerate(self._texts):
+            for gram in _bigrams(text):
+                self._postings[gram].add(doc_id)
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def lookup(self, term: str) -> set:
+        """term 이 (공백 무시) 들어 있는 기사 번호의 집합"""
+        term = _compact(term)
+        if not term:
+            return set()
+        if len(term) < 2:
+            return {doc_id for doc_id, text in enumerate(self._texts) if term in text}
+
+        # 가장 짧은 포스팅부터 교집합
+        postings = sorted((self._postings.get(gram, set()) for gram in _bigrams(term)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return {doc_id for doc_id in candidates if term in self._texts[doc_id]}
+
+    def age_days(self, doc_id: int, now: float) -> float:
+        """기사 발행일(없으면 수집 시각)로부터 지난 일수"""
+        article = self.articles[doc_id]
+        try:
+            published = parsedate_to_datetime(article["pub_date"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            published = article.get("fetched_at", now)
+        return max(0.0, (now - published) / 86400)
+
+
+class ESGRiskScreen:
+    """어휘 사전으로 후보 종목 전체의 ESG 리스크 점수를 한 번에 계산하는 스크리너"""
+
+    def __init__(self, lexicon: dict = None, path: str = None):
+        self.lexicon = lexicon or load_lexicon(path)
+        self.threshold = float(self.lexicon.get("threshold", 4))
+        self.half_life = float(self.lexicon.get("half_life_days", 30))
+        self.categories = self.lexicon["categories"]
+
+    def screen(self, names: dict, articles: list[dict], now: float = None) -> pd.DataFrame:
+        """{티커: 종목명} 의 종목별 리스크 점수를 점수순으로 담은 DataFrame 을 반환합니다.
+
+        컬럼: ticker, name, articles(종목 언급 기사 수), risk_articles, score, 분류별 점수, terms, headlines, flagged
+        """
+        now = time.time() if now is None else now
+        index = NewsIndex(articles)
+
+        # 어휘 사전 조회는 종목 수와 무관하게 한 번만 수행
+        term_docs = {
+            (category, term): (float(weight), index.lookup(term))
+            for category, spec in self.categories.items()
+            for term, weight in (spec.get("terms") or {}).items()
+        }
+        decay = {}
+
+        def weight_of(doc_id: int) -> float:
+            if doc_id not in decay:
+                decay[doc_id] = 0.5 ** (index.age_days(doc_id, now) / self.half_life) if self.half_life > 0 else 1.0
+            return decay[doc_id]
+
+        rows = []
+        for ticker, name in names.items():
+            docs = index.lookup(name) if name else set()
+            scores = dict.fromkeys(self.categories, 0.0)
+            term_counts = {}
+            doc_scores = defaultdict(float)
+            for (category, term), (weight, hits) in term_docs.items():
+                matched = docs & hits
+                if not matched:
+                    continue
+                term_counts[term] = len(matched)
+                for doc_id in matched:
+                    contribution = weight * weight_of(doc_id)
+                    scores[category] += contribution
+                    doc_scores[doc_id] += contribution
+
+            score = sum(scores.values())
+            top_docs = sorted(doc_scores, key=doc_scores.get, reverse=True)[:HEADLINES]
+            rows.append({
+                "ticker": ticker,
+                "name": name,
+                "articles": len(docs),
+                "risk_articles": len(doc_scores),
+                "score": round(score, 2),
+                **{category: round(value, 2) for category, value in scores.items()},
+                "terms": ", ".join(f"{term}({count})" for term, count in
+                                   sorted(term_counts.items(), key=lambda item: -item[1])),
+                "headlines": [index.articles[doc_id].get("title", "") for doc_id in top_docs],
+                "flagged": score >= self.threshold,
+            })
+
+        columns = ["ticker", "name", "articles", "risk_articles", "score", *self.categories,
+                   "terms", "headlines", "flagged"]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(rows, columns=columns).sort_values("score", ascending=False, kind="stable")
+
+    def category_name(self, category: str) -> str:
+        return self.categories[category].get("name", category)
@@ -0,0 +1,171 @@
+"""전 종목 멀티 팩터 순위 엔진.
+
+시장 스냅샷(전 종목 × 펀더멘탈) 전체를 한 번의 벡터 연산으로 점수화합니다.
+팩터와 가중치, 정규화 방식(백분위 / z-점수), 윈저라이징, 업종 중립 여부는 config/factors.yaml 로 정합니다.
+종목마다 행을 만들지 않으므로 2,500여 종목도 수 밀리초 안에 순위가 나옵니다.
+백테스트처럼 여러 날짜를 점수화할 때는 score_panel() 로 날짜 × 종목 배열 전체를 한 번에 계산합니다.
+"""
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import yaml
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "factors.yaml")
+
+NORMALIZATIONS = ("percentile", "zscore")
+
+# 스냅샷 컬럼으로 계산하는 파생 팩터
+DERIVED_FACTORS = {
+    "ROE": lambda df: df["EPS"] / df["BPS"] * 100,      # 자기자본이익률(%)
+    "EY": lambda df: df["EPS"] / df["종가"] * 100,       # 이익수익률(%), PER 의 역수
+    "SIZE": lambda df: np.log(df["시가총액"]),
+}
+
+
+def load_factor_config(path: str = None) -> dict:
+    with open(path or CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    if not config.get("factors"):
+        raise ValueError("팩터 설정에 factors 가 없습니다.")
+    if config.get("normalization", "percentile") not in NORMALIZATIONS:
+        raise ValueError(f"normalization 은 {NORMALIZATIONS} 중 하나여야 합니다.")
+    for name, spec in config["factors"].items():
+        if spec.get("direction", "high") not in ("high", "low"):
+            raise ValueError(f"{name}: direction 은 high 또는 low 여야 합니다.")
+    return config
+
+
+class FactorEngine:
+    """설정된 팩터로 종목 전체를 한 번에 정규화·가중합하여 종합 점수와 순위를 매기는 엔진"""
+
+    def __init__(self, config: dict = None, path: str = None):
+        self.config = config or load_factor_config(path)
+        self.factors = self.config["factors"]
+        self.normalization = self.config.get("normalization", "percentile")
+        self.winsorize = float(self.config.get("winsorize", 0) or 0)
+        self.sector_neutral = bool(self.config.get("sector_neutral", False))
+        self.require_positive = list(self.config.get("require_positive") or [])
+
+    def factor_values(self, snapshot: pd.DataFrame) -> pd.DataFrame:
+        """종목 × 팩터 원값. 설정된 파생 팩터만 계산합니다."""
+        columns = {}
+        for name in self.factors:
+            if name in snapshot.columns:
+                columns[name] = snapshot[name]
+            elif name in DERIVED_FACTORS:
+                columns[name] = DERIVED_FACTORS[name](snapshot)
+            else:
+                raise KeyError(f"스냅샷에 없는 팩터입니다: {name}")
+        values = pd.DataFrame(columns, index=snapshot.index).astype(float)
+        return values.replace([np.inf, -np.inf], np.nan)
+
+    def _normalize(self, values: pd.DataFrame, groups) -> pd.DataFrame:
+        # 작을수록 좋은 팩터는 부호를 바꿔 모든 팩터를 '클수록 좋음' 으로 맞춤
+        signs = pd.Series({name: -1.0 if spec.get("direction") == "low" else 1.0
+                           for name, spec in self.factors.items()})
+        values = values * signs
+
+        grouped = values.groupby(groups) if groups is not None else None
+        if self.winsorize > 0:
+            if grouped is not None:
+                lower = grouped.transform(lambda x: x.quantile(self.winsorize))
+                upper = grouped.transform(lambda x: x.quantile(1 - self.winsorize))
+            else:
+                lower, upper = values.quantile(self.winsorize), values.quantile(1 - self.winsorize)
+            values = values.clip(lower, upper, axis=1 if grouped is None else None)
+            grouped = values.groupby(groups) if groups is not None else None
+
+        if self.normalization == "percentile":
+            return grouped.rank(pct=True) if grouped is not None else values.rank(pct=True)
+
+        if grouped is not None:
+            mean, std = grouped.transform("mean"), grouped.transform("std")
+        else:
+            mean, std = values.mean(), values.std()
+        return (values - mean) / std.replace(0, np.nan)
+
+    def score(self, snapshot: pd.DataFrame, groups: pd.Series = None) -> pd.DataFrame:
+        """종목별 팩터 원값, 정규화 점수({팩터}_score), 종합 점수(score), 순위(total_rank, 1 이 최상위)를
+        점수순으로 담은 DataFrame 을 반환합니다. groups(티커 → 업종)는 sector_neutral 일 때 사용합니다."""
+        columns = ["ticker", *self.factors, *(f"{name}_score" for name in self.factors), "score", "total_rank"]
+        if snapshot.empty:
+            return pd.DataFrame(columns=columns)
+
+        usable = pd.Series(True, index=snapshot.index)
+        for column in self.require_positive:
+            usable &= snapshot[column] > 0
+        snapshot = snapshot[usable]
+        if snapshot.empty:
+            return pd.DataFrame(columns=columns)
+
+        values = self.factor_values(snapshot)
+        if self.sector_neutral and groups is not None:
+            # 업종 정보가 없는 종목은 '기타' 한 그룹으로 정규화
+            groups = groups.reindex(values.index).fillna("기타")
+        else:
+            groups = None
+        scores = self._normalize(values, groups)
+
+        # 팩터 값이 없는 종목은 있는 팩터의 가중치만으로 평균
+        weights = pd.Series({name: float(spec.get("weight", 1)) for name, spec in self.factors.items()})
+        available = scores.notna()
+        composite = scores.fillna(0).mul(weights).sum(axis=1) / available.mul(weights).sum(axis=1).replace(0, np.nan)
+
+        result = pd.concat([values, scores.add_suffix("_score")], axis=1)
+        result["score"] = composite
+        result = result[composite.notna()].sort_values("score", ascending=False, kind="stable")
+        result["total_rank"] = np.arange(1, len(result) + 1)
+        return result.rename_axis("ticker").reset_index()[columns]
+
+    def top(self, snapshot: pd.DataFrame, n: int, groups: pd.Series = None) -> pd.DataFrame:
+        return self.score(snapshot, groups).head(n)
+
+    def score_panel(self, fields: dict) -> np.ndarray:
+        """여러 날짜의 스냅샷을 한 번에 점수화합니다.
+
+        fields 는 스냅샷 컬럼 이름 → (날짜 × 종목) 배열이며, 날짜마다 score() 와 같은 종합 점수를
+        (날짜 × 종목) 배열로 반환합니다. 순위에서 제외된 종목은 NaN 입니다. 업종 중립 정규화는 적용하지 않습니다.
+        """
+        values = {}
+        for name in self.factors:
+            if name in fields:
+                values[name] = np.asarray(fields[name], dtype=np.float64)
+            elif name in DERIVED_FACTORS:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    values[name] = np.asarray(DERIVED_FACTORS[name](fields), dtype=np.float64)
+            else:
+                raise KeyError(f"스냅샷에 없는 팩터입니다: {name}")
+
+        shape = next(iter(values.values())).shape
+        usable = np.ones(shape, dtype=bool)
+        for column in self.require_positive:
+            with np.errstate(invalid="ignore"):
+                usable &= np.asarray(fields[column], dtype=np.float64) > 0
+
+        total = np.zeros(shape)
+        weight_sum = np.zeros(shape)
+        for name, spec in self.factors.items():
+            sign = -1.0 if spec.get("direction") == "low" else 1.0
+            v = np.where(usable & np.isfinite(values[name]), sign * values[name], np.nan)
+            # 날짜(행)마다 score() 의 _normalize 와 같은 윈저라이징, 정규화
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                if self.winsorize > 0:
+                    lower = np.nanquantile(v, self.winsorize, axis=1, keepdims=True)
+                    upper = np.nanquantile(v, 1 - self.winsorize, axis=1, keepdims=True)
+                    v = np.clip(v, lower, upper)
+                if self.normalization == "percentile":
+                    normalized = pd.DataFrame(v).rank(axis=1, pct=True).to_numpy()
+                else:
+                    std = np.nanstd(v, axis=1, ddof=1, keepdims=True)
+                    normalized = (v - np.nanmean(v, axis=1, keepdims=True)) / np.where(std == 0, np.nan, std)
+
+            available = ~np.isnan(normalized)
+            weight = float(spec.get("weight", 1))
+            total += np.where(available, normalized, 0.0) * weight
+            weight_sum += available * weight
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(weight_sum != 0, total / weight_sum, np.nan)
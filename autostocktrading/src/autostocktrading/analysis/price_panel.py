@@ -0,0 +1,128 @@
+"""날짜 × 종목 종가 패널.
+
+종목별 종가 시리즈를 미리 할당한 NumPy 배열 하나에 정렬해 담고,
+수익률·변동성·상관관계를 벡터 연산으로 계산합니다.
+결측값은 pandas 의 std()/corr() 와 같이 종목(쌍)별로 유효한 관측치만 사용합니다.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ..data.fetcher import get_fetch_executor
+from ..data.price_store import get_price_store
+
+
+class PricePanel:
+    """dates × tickers 실수 배열과 티커 인덱스로 이루어진 가격 패널"""
+
+    def __init__(self, dates, tickers: list[str], values: np.ndarray):
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_series(cls, series: list) -> "PricePanel":
+        """이름(티커)이 붙은 시리즈 목록을 날짜 합집합 기준으로 정렬하여 패널을 만듭니다."""
+        series = [s for s in series if s is not None]
+        if not series:
+            return cls([], [], np.empty((0, 0)))
+
+        dates = np.unique(np.concatenate([s.index.values.astype("datetime64[ns]") for s in series]))
+        values = np.full((len(dates), len(series)), np.nan)
+        for col, s in enumerate(series):
+            rows = np.searchsorted(dates, s.index.values.astype("datetime64[ns]"))
+            values[rows, col] = s.to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(dates, [s.name for s in series], values)
+
+    @property
+    def empty(self) -> bool:
+        return self.values.size == 0
+
+    def select(self, tickers: list[str]) -> "PricePanel":
+        cols = [self.ticker_index[t] for t in tickers]
+        return PricePanel(self.dates, tickers, self.values[:, cols])
+
+    def dropna_tickers(self) -> "PricePanel":
+        """모든 값이 비어있는 종목(예: 거래정지)을 제거합니다."""
+        keep = ~np.isnan(self.values).all(axis=0) if len(self.dates) else np.zeros(len(self.tickers), bool)
+        return PricePanel(self.dates, [t for t, k in zip(self.tickers, keep) if k], self.values[:, keep])
+
+    def returns(self) -> np.ndarray:
+        """일일 수익률 배열 ((날짜 - 1) × 종목). 전일이나 당일 가격이 없으면 NaN 입니다."""
+        if len(self.dates) < 2:
+            return np.empty((0, len(self.tickers)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.values[1:] / self.values[:-1] - 1.0
+
+    def volatility(self) -> pd.Series:
+        """종목별 일일 수익률의 표본 표준편차"""
+        r = self.returns()
+        mask = ~np.isnan(r)
+        n = mask.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(mask, r, 0.0).sum(axis=0) / n
+            var = np.where(mask, (r - mean) ** 2, 0.0).sum(axis=0) / (n - 1)
+        var[n < 2] = np.nan
+        return pd.Series(np.sqrt(var), index=self.tickers)
+
+    def correlation(self) -> pd.DataFrame:
+        """일일 수익률의 상관관계 매트릭스 (종목 쌍마다 둘 다 유효한 날만 사용)"""
+        r = self.returns()
+        mask = ~np.isnan(r)
+        m = mask.astype(np.float64)
+        x = np.where(mask, r, 0.0)
+
+        n = m.T @ m
+        sx = x.T @ m
+        sxx = (x * x).T @ m
+        sxy = x.T @ x
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * sxy - sx * sx.T
+            var_x = n * sxx - sx * sx
+            corr = cov / np.sqrt(var_x * var_x.T)
+        corr[n < 2] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        valid = np.diag(n) >= 2
+        corr[np.diag_indices_from(corr)] = np.where(valid, 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.tickers, columns=self.tickers)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=self.dates, columns=self.tickers)
+
+
+# 한 사이클 안에서 리스크 분석과 비중 할당이 같은 패널을 공유하도록 최근 패널 몇 개만 보관
+MAX_CACHED_PANELS = 8
+
+_panel_cache = {}
+_panel_lock = threading.Lock()
+
+
+def load_price_panel(tickers: list[str], fromdate: str, todate: str, label: str = "가격 패널") -> PricePanel:
+    """종목들의 종가 패널을 만듭니다. 같은 인자로 다시 부르면 이미 만든 패널을 재사용합니다."""
+    key = (tuple(tickers), fromdate, todate)
+    with _panel_lock:
+        if key in _panel_cache:
+            return _panel_cache[key]
+
+    price_store = get_price_store()
+    # 로컬 캐시를 거쳐 종가 데이터만 병렬 조회 (빠진 거래일만 네트워크로 요청)
+    fetched = get_fetch_executor().map(lambda ticker: price_store.get_close(ticker, fromdate, todate), tickers)
+    print(fetched.summary(label))
+    for ticker, e in fetched.errors.items():
+        print(f"티커 {ticker}의 주가 데이터를 가져오는데 실패했습니다.: {e}")
+
+    panel = PricePanel.from_series([series for _, series in fetched.ordered()])
+    with _panel_lock:
+        if len(_panel_cache) >= MAX_CACHED_PANELS:
+            _panel_cache.pop(next(iter(_panel_cache)))
+        _panel_cache[key] = panel
+    return panel
+
+
+def clear_panel_cache() -> None:
+    """사이클이 끝나면 호출하여 이전 사이클의 패널을 비웁니다."""
+    with _panel_lock:
+        _panel_cache.clear()
@@ -0,0 +1,221 @@
+"""증분형 롤링 변동성 / 상관관계 엔진.
+
+종목 쌍마다 윈도우 내 합계(관측 수, Σx, Σx², Σxy)를 누적해 두고,
+새 거래일이 들어오면 가장 오래된 날을 빼고 새 날을 더하는 O(N²) 갱신만 수행합니다.
+halflife 를 지정하면 윈도우 대신 지수 가중(pandas ewm(halflife=..., adjust=True) 와 동일)으로 누적합니다.
+결측값은 pandas 와 같이 종목 쌍별로 둘 다 유효한 날만 사용합니다.
+
+상태는 종목 구성·윈도우마다 .npz 파일로 저장되어 다음 실행에서 이어서 갱신되며,
+최근에 쓴 MAX_STATE_FILES 개만 남기고 오래된 상태 파일은 저장할 때 지웁니다.
+    ROLLING_WINDOW    윈도우 길이(거래일, 기본 60)
+    ROLLING_HALFLIFE  지수 가중 반감기(거래일). 지정하면 윈도우 대신 사용
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from ..data.storage import cache_dir, atomic_write
+
+# 덧셈/뺄셈 누적으로 생기는 부동소수점 오차를 없애기 위해 이 횟수마다 버퍼에서 다시 계산합니다.
+REBUILD_INTERVAL = 250
+
+# 남겨 둘 상태 파일 수. 종목 구성이 바뀔 때마다 새 파일이 생기므로 최근에 쓴 것만 유지
+MAX_STATE_FILES = 8
+
+
+class RollingStats:
+    """종목별 롤링 변동성과 종목 쌍별 롤링 상관관계를 증분 계산하는 엔진"""
+
+    def __init__(self, tickers: list[str], window: int = 60, halflife: float = None, min_periods: int = 2):
+        self.tickers = list(tickers)
+        self.window = int(window)
+        self.halflife = halflife
+        self.min_periods = min_periods
+        self.last_date = None
+        self.updates_since_rebuild = 0
+
+        n = len(self.tickers)
+        self._buffer = np.full((self.window, n), np.nan)
+        self._head = 0
+        self._filled = 0
+        self._reset_accumulators()
+
+    def _reset_accumulators(self) -> None:
+        n = len(self.tickers)
+        self._obs = np.zeros((n, n))    # 둘 다 유효했던 날의 수
+        self._w = np.zeros((n, n))      # 가중치 합 (윈도우 모드에서는 관측 수)
+        self._w2 = np.zeros((n, n))     # 가중치 제곱 합
+        self._sx = np.zeros((n, n))     # [i, j]: i, j 모두 유효한 날의 x_i 합
+        self._sxx = np.zeros((n, n))
+        self._sxy = np.zeros((n, n))
+
+    @property
+    def decay(self) -> float:
+        return 0.5 ** (1.0 / self.halflife)
+
+    def _accumulate(self, row: np.ndarray, sign: float) -> None:
+        mask = ~np.isnan(row)
+        m = mask.astype(np.float64)
+        x = np.where(mask, row, 0.0)
+        pair = np.outer(m, m)
+
+        self._obs += sign * pair
+        self._w += sign * pair
+        self._w2 += sign * pair
+        self._sx += sign * np.outer(x, m)
+        self._sxx += sign * np.outer(x * x, m)
+        self._sxy += sign * np.outer(x, x)
+
+    def update(self, row: np.ndarray, date=None) -> None:
+        """하루치 수익률 벡터(종목 순서는 tickers 와 동일)를 반영합니다."""
+        row = np.asarray(row, dtype=np.float64)
+
+        if self.halflife:
+            # 지수 가중: 기존 누적값을 한 단계 감쇠시킨 뒤 새 관측을 가중치 1로 더함
+            decay = self.decay
+            for acc in (self._w, self._sx, self._sxx, self._sxy):
+                acc *= decay
+            self._w2 *= decay * decay
+            self._accumulate(row, 1.0)
+        else:
+            if self._filled == self.window:
+                self._accumulate(self._buffer[self._head], -1.0)
+            self._accumulate(row, 1.0)
+            self._buffer[self._head] = row
+            self._head = (self._head + 1) % self.window
+            self._filled = min(self._filled + 1, self.window)
+
+            self.updates_since_rebuild += 1
+            if self.updates_since_rebuild >= REBUILD_INTERVAL:
+                self.rebuild()
+
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+
+    def update_many(self, dates, rows: np.ndarray) -> None:
+        for date, row in zip(dates, rows):
+            self.update(row, date)
+
+    def rebuild(self) -> None:
+        """윈도우 버퍼로부터 누적값을 처음부터 다시 계산합니다. (윈도우 모드 전용)"""
+        self._reset_accumulators()
+        for k in range(self._filled):
+            self._accumulate(self._buffer[(self._head - self._filled + k) % self.window], 1.0)
+        self.updates_since_rebuild = 0
+
+    def _valid(self) -> np.ndarray:
+        return self._obs >= self.min_periods
+
+    def covariance(self) -> pd.DataFrame:
+        """종목 쌍별 표본 공분산 (pandas 의 bias=False 와 동일한 보정)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = (self._sxy * self._w - self._sx * self._sx.T) / (self._w * self._w - self._w2)
+        cov[~self._valid()] = np.nan
+        return pd.DataFrame(cov, index=self.tickers, columns=self.tickers)
+
+    def volatility(self) -> pd.Series:
+        """종목별 일일 수익률의 표준편차"""
+        var = np.diag(self.covariance().values).copy()
+        var[var < 0] = 0.0
+        return pd.Series(np.sqrt(var), index=self.tickers)
+
+    def correlation(self) -> pd.DataFrame:
+        """종목 쌍별 상관계수 (두 종목이 모두 유효한 날만 사용)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = self._sxy * self._w - self._sx * self._sx.T
+            var_x = self._sxx * self._w - self._sx * self._sx
+            corr = cov / np.sqrt(var_x * var_x.T)
+        corr[~self._valid()] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        diagonal = np.diag(self._valid()).copy()
+        corr[np.diag_indices_from(corr)] = np.where(diagonal, 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.tickers, columns=self.tickers)
+
+    def save(self, path: str) -> None:
+        state = {
+            "tickers": np.array(self.tickers),
+            "params": np.array([self.window, self.halflife or 0.0, self.min_periods, self._head,
+                                self._filled, self.updates_since_rebuild]),
+            "last_date": np.array(str(self.last_date.date()) if self.last_date is not None else ""),
+            "buffer": self._buffer, "obs": self._obs, "w": self._w, "w2": self._w2,
+            "sx": self._sx, "sxx": self._sxx, "sxy": self._sxy,
+        }
+        atomic_write(path, lambda f: np.savez(f, **state))
+
+    @classmethod
+    def load(cls, path: str) -> "RollingStats":
+        with np.load(path, allow_pickle=False) as state:
+            window, halflife, min_periods, head, filled, updates = state["params"]
+            stats = cls(list(state["tickers"]), int(window), float(halflife) or None, int(min_periods))
+            stats._head, stats._filled, stats.updates_since_rebuild = int(head), int(filled), int(updates)
+            last_date = str(state["last_date"])
+            stats.last_date = pd.Timestamp(last_date) if last_date else None
+            stats._buffer = state["buffer"]
+            stats._obs, stats._w, stats._w2 = state["obs"], state["w"], state["w2"]
+            stats._sx, stats._sxx, stats._sxy = state["sx"], state["sxx"], state["sxy"]
+        return stats
+
+
+def default_params() -> dict:
+    halflife = os.getenv("ROLLING_HALFLIFE")
+    return {
+        "window": int(os.getenv("ROLLING_WINDOW", "60")),
+        "halflife": float(halflife) if halflife else None,
+    }
+
+
+def _state_path(tickers: list[str], window: int, halflife) -> str:
+    key = hashlib.sha1(f"{','.join(tickers)}|{window}|{halflife}".encode()).hexdigest()[:16]
+    return os.path.join(cache_dir("rolling"), f"{key}.npz")
+
+
+def _prune_states(keep: str) -> None:
+    """keep 을 제외하고 최근에 쓴 상태 파일 MAX_STATE_FILES 개만 남깁니다."""
+    directory = os.path.dirname(keep)
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.endswith(".npz") and os.path.join(directory, name) != keep]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[MAX_STATE_FILES - 1:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_rolling_stats(panel, window: int = None, halflife: float = None) -> RollingStats:
+    """패널의 종목 구성에 맞는 저장된 엔진을 불러와, 마지막 반영일 이후의 거래일만 갱신합니다."""
+    params = default_params()
+    window = window or params["window"]
+    halflife = halflife if halflife is not None else params["halflife"]
+    path = _state_path(panel.tickers, window, halflife)
+
+    returns = panel.returns()
+    return_dates = panel.dates[1:]
+
+    stats = None
+    if os.path.exists(path):
+        try:
+            stats = RollingStats.load(path)
+        except Exception as e:
+            print(f"롤링 통계 상태를 불러오지 못해 다시 계산합니다.: {e}")
+
+    # 마지막 반영일이 패널 안에 없으면 그 사이 거래일을 이어서 갱신할 수 없으므로 새로 계산
+    if stats is not None and (stats.last_date is None or stats.last_date not in panel.dates):
+        stats = None
+
+    if stats is None:
+        stats = RollingStats(panel.tickers, window=window, halflife=halflife)
+        new_rows = np.ones(len(return_dates), dtype=bool)
+    else:
+        new_rows = return_dates > stats.last_date
+
+    if new_rows.any():
+        stats.update_many(return_dates[new_rows], returns[new_rows])
+        stats.save(path)
+        _prune_states(path)
+    elif os.path.exists(path):
+        # 갱신 없이 재사용한 상태도 최근에 쓴 것으로 보아 정리 대상에서 뺌
+        os.utime(path)
+    return stats
@@ -1,16 +1,67 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.crews.crew_output import CrewOutput
 from typing import List
+import threading
 
-from langchain_ollama import OllamaLLM
+from .dag import DagExecutor
+from .data.replay import is_replay
+from .env import load_env
+from .llm_cache import make_llm
+from .tools import get_tool
 
-from .tools.economic_tools import *
-from .tools.market_data_tools import *
-from .tools.financial_tools import *
-from .tools.search_tools import *
-from .tools.trading_tools import *
-from .tools.portfolio_tools import *
+# 모든 에이전트가 사용하는 로컬 Ollama 모델
+AGENT_MODEL = 'ollama/exaone-deep'
+
+
+def agent_tools(*names: str) -> list:
+    """에이전트에 줄 도구 목록. 도구 모듈은 처음 쓰일 때 가져오고, 인스턴스는 에이전트와 사이클이 공유합니다."""
+    return [get_tool(name) for name in names]
+
+
+class DagCrew(Crew):
+    """tasks.yaml 의 context 를 의존성으로 삼아, 서로 의존하지 않는 태스크를 동시에 실행하는 크루
+
+    Crew 의 비공개 메서드(_prepare_tools, _get_context, _process_task_result 등)를 사용하므로
+    pyproject.toml 의 crewAI 버전(0.203.2)을 올릴 때는 tests/test_crew.py 로 먼저 확인합니다.
+    """
+
+    max_parallel: int = 1
+
+    def _run_sequential_process(self) -> CrewOutput:
+        tasks = {task.name or str(i): task for i, task in enumerate(self.tasks)}
+        names = {id(task): name for name, task in tasks.items()}
+        index = {name: i for i, name in enumerate(tasks)}
+        # context 를 지정하지 않은 태스크는 선행 태스크 없이 바로 실행
+        dependencies = {
+            name: [names[id(c)] for c in task.context if id(c) in names] if isinstance(task.context, list) else []
+            for name, task in tasks.items()
+        }
+
+        # 같은 에이전트는 동시에 두 태스크를 수행하지 않도록 에이전트별로 잠금
+        agent_locks = {id(task.agent): threading.Lock() for task in self.tasks}
+        log_lock = threading.Lock()
+
+        def execute(name):
+            task = tasks[name]
+            agent = task.agent
+            tools = self._prepare_tools(agent, task, task.tools or agent.tools or [])
+            with agent_locks[id(agent)]:
+                self._log_task_start(task, agent.role)
+                output = task.execute_sync(agent=agent, context=self._get_context(task, []), tools=tools)
+            with log_lock:
+                self._process_task_result(task, output)
+                self._store_execution_log(task, output, index[name])
+            return output
+
+        result = DagExecutor(dependencies, max_parallel=self.max_parallel).run(execute)
+        print(result.summary("태스크 DAG"))
+        for name in tasks:
+            if name in result.errors:
+                raise result.errors[name]
+
+        return self._create_crew_output([result.results[name] for name in tasks if name in result.results])
 
 @CrewBase
 class Autostocktrading():
@@ -20,7 +71,10 @@ class Autostocktrading():
     tasks: List[Task]
 
     def __init__(self):
-        self.ollama_llm = OllamaLLM(model='ollama/exaone-deep')
+        load_env()
+        # 같은 거래일의 같은 프롬프트는 디스크 캐시에서 응답 (LLM_CACHE=0 이면 사용하지 않음)
+        # AUTOSTOCK_DATA_MODE=replay 이면 기록된 응답을 돌려주는 로컬 스텁
+        self.ollama_llm = make_llm(model=AGENT_MODEL)
 
     # 1: Market Trend Analyst
     @agent
@@ -29,7 +83,7 @@ class Autostocktrading():
             role='Market Trend Analyst',
             goal='현재 보유 포트폴리오와 시장 상황을 종합 분석하여, 리밸런싱을 포함한 최적의 투자 방향을 결정한다.',
             backstory="경제와 산업 전반을 아우르는 넓은 시야를 가진 분석가. 데이터와 최신 트렌드를 결합하여 미래 시장을 예측하는 능력이 탁월하다.",
-            tools=[NaverNewsSearchTool(), KREconomicIndicatorTool(), USEconomicIndicatorTool(), PortfolioReaderTool()],
+            tools=agent_tools('NaverNewsSearchTool', 'KREconomicIndicatorTool', 'USEconomicIndicatorTool', 'PortfolioReaderTool'),
             verbose=True,
             llm=self.ollama_llm
         )
@@ -46,7 +100,7 @@ class Autostocktrading():
                 "특히, 한국 시장 분석을 위해 네이버 뉴스(news.naver.com)의 정보를 최우선으로 활용하여 "
                 "신뢰도 높은 분석을 수행한다."
             ),
-            tools=[NaverNewsSearchTool()],
+            tools=agent_tools('NaverNewsSearchTool', 'TickerResolverTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -59,7 +113,7 @@ class Autostocktrading():
             role='Ticker Screener',
             goal='주어진 투자 시장과 섹터에서 거래 가능한 모든 주식의 티커를 찾아 목록을 만든다.',
             backstory="대한민국 주식 시장의 베테랑. KOSPI와 KOSDAQ의 모든 종목을 꿰뚫고 있다.",
-            tools=[TickerListTool()],
+            tools=agent_tools('SectorMembersTool', 'TickerResolverTool', 'TickerListTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -72,7 +126,7 @@ class Autostocktrading():
             role='Fundamental Fetcher',
             goal='주어진 주식 티커 목록에 대해 각 종목의 핵심 재무 지표를 수집한다.',
             backstory="꼼꼼하고 정확한 재무 분석가. 숫자를 통해 기업의 본질을 파악한다.",
-            tools=[StockFundamentalTool()],
+            tools=agent_tools('FactorRankingTool', 'StockFundamentalTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -85,7 +139,7 @@ class Autostocktrading():
             role='Valuation Analyst',
             goal='수집된 재무 데이터를 기반으로 기업에 대한 멀티 팩터 점수를 매겨 투자 매력도를 평가한다.',
             backstory="퀀트 분석의 귀재. 다양한 가치 평가 모델을 활용하여 기업의 내재 가치를 정확하게 계산한다.",
-            tools=[ValuationTool()],
+            tools=agent_tools('ValuationTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -101,7 +155,7 @@ class Autostocktrading():
                 "당신은 기업의 재무적 성과 너머를 보는 윤리적 투자 전문가입니다."
                 "뉴스기사, NGO 보고서, 소셜 미디어 등을 샅샅이 뒤져가며 기업의 숨겨진 사회적 리스크를 찾아내는 데 특화되어 있습니다."
             ),
-            tools=[NaverNewsSearchTool()],
+            tools=agent_tools('ESGRiskScreenTool', 'NaverNewsSearchTool'),
             verbose=True,
             llm=self.ollama_llm
         )
@@ -113,7 +167,7 @@ class Autostocktrading():
             role='Insider Ownership Analyst',
             goal='기관 투자자 및 주요 주주의 자금 흐름과 지분 변동을 추적하여 시장의 숨은 의도를 파악한다.',
             backstory="시장의 '큰 손'들의 움직임을 쫓는 정보 분석가. 공시 정보와 데이터를 통해 시장의 신뢰도를 판단한다.",
-            tools=[InsiderAnalysisTool()],
+            tools=agent_tools('InsiderAnalysisTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -126,7 +180,7 @@ class Autostocktrading():
             role='Risk Analyst',
             goal='포트폴리오에 포함될 종목들 간의 상관관계 매트릭스를 생성하여 리스크를 최소화한다.',
             backstory="신중한 리스크 관리 전문가. 변동성과 종목 간 상관관계를 면밀히 분석하여 안정적인 포트폴리오를 구축한다.",
-            tools=[RiskAnalysisTool()],
+            tools=agent_tools('RiskAnalysisTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -139,7 +193,7 @@ class Autostocktrading():
             role='Allocator',
             goal='분석된 데이터를 종합하여 각 종목에 대한 최적의 투자 비중을 결정한다.',
             backstory="포트폴리오 최적화의 마스터. 기대 수익률을 극대화하면서도 리스크를 통제하는 최적의 포지션 크기를 결정한다.",
-            tools=[AllocationTool()],
+            tools=agent_tools('AllocationTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -152,7 +206,7 @@ class Autostocktrading():
             role='Trader Planner',
             goal='결정된 포트폴리오 비중에 따라 시장 상황을 고려하여 정확한 매수/매도 주문 계획을 수립한다.',
             backstory="실행력 있는 트레이딩 전략가. 거래 비용을 최소화할 수 있는 최적의 주문 시점과 방식을 결정한다.",
-            tools=[TradingPlannerTool()],
+            tools=agent_tools('TradingPlannerTool'),
             allow_delegation=False,
             verbose=True,
             llm=self.ollama_llm
@@ -165,7 +219,7 @@ class Autostocktrading():
             role="Trade Executor",
             goal="수립된 매매 계획을 오차 없이 정확하게 실행하고 그 결과를 기록한다.",
             backstory='냉철하고 신속한 판단력을 지닌 트레이더. 감정의 개입 없이 오직 계획에 따라서만 주문을 집행한다.',
-            tools=[TradeExecutorTool()],
+            tools=agent_tools('BatchTradeExecutorTool', 'TradeExecutorTool'),
             verbose=True,
             llm=self.ollama_llm
         )
@@ -217,12 +271,40 @@ class Autostocktrading():
         return Task(config=self.tasks_config['trade_execution_task'], agent=self.trade_executor())
 
     @crew
-    def crew(self) -> Crew:
-        """Creates the Autostocktrading crew"""
+    def crew(self, max_parallel: int = 1) -> Crew:
+        """Creates the Autostocktrading crew
+
+        max_parallel 이 2 이상이면 context 의존성을 따라 독립적인 태스크를 동시에 실행합니다.
+        """
+        if max_parallel > 1:
+            return DagCrew(
+                agents=self.agents,
+                tasks=self.tasks,
+                process=Process.sequential,
+                max_parallel=max_parallel,
+                tracing=not is_replay(),
+                verbose=True,
+            )
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            tracing=True,
+            tracing=not is_replay(),
             verbose=True,
-        )
\ No newline at end of file
+        )
+
+    def narrative_crew(self) -> Crew:
+        """정량 파이프라인(--fast)과 함께 실행하는 서술형 분석 크루 (시장 트렌드, 섹터, 후보 종목 ESG 검토)"""
+        # esg_review_task 는 @task 로 등록하지 않아 전체 크루에는 포함되지 않음
+        tasks = [
+            self.trend_analysis_task(),
+            self.sector_research_task(),
+            Task(config=self.tasks_config['esg_review_task'], agent=self.esg_analyst(), name='esg_review_task'),
+        ]
+        return Crew(
+            agents=[task.agent for task in tasks],
+            tasks=tasks,
+            process=Process.sequential,
+            tracing=not is_replay(),
+            verbose=True,
+        )
@@ -0,0 +1,254 @@
+"""상주 스케줄러 데몬 (main.py --daemon).
+
+한 프로세스를 계속 띄워 두고 config/schedule.yaml 의 일정대로 작업을 실행합니다.
+    prefetch   장 시작 전 준비. 시장 스냅샷, 종목명/섹터 색인, 후보 종목 일봉, 거시 지표, 직전 사이클의 뉴스를
+               메모리와 디스크 캐시에 올리고 Ollama 모델을 로드해 둠
+    main       메인 투자 사이클 (main.py 가 제공)
+    intraday   장중 재점검 (main.py 가 제공)
+    health     상태 점검. LLM 서버, 원장, 디스크 여유 공간, 작업 결과를 캐시 디렉터리의 daemon/health.json 에 기록
+스냅샷, 일봉, 뉴스, LLM 응답 캐시는 프로세스 공용 인스턴스이므로 사이클이 끝나도 메모리에 남아
+다음 사이클이 준비된 상태에서 시작합니다. 오늘 준비가 끝나지 않은 채 메인 사이클 시각이 되면 먼저 준비합니다.
+health 를 제외한 작업은 하나의 실행 잠금을 공유하므로 동시에 실행되지 않으며,
+앞 작업이 끝나지 않았으면 다음 작업은 기다리지 않고 건너뜁니다. (APScheduler max_instances=1, coalesce)
+    DAEMON_SCHEDULE    작업 일정 YAML 경로 (기본 config/schedule.yaml)
+    OLLAMA_API_BASE    Ollama 서버 주소 (기본 http://localhost:11434)
+    OLLAMA_KEEP_ALIVE  모델 유지 시간 (기본: 일정 파일의 llm_keep_alive)
+    NEWS_REUSE_MINUTES 사이클 간 뉴스 재사용 시간 (기본: 일정 파일의 news_reuse_minutes)
+"""
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import yaml
+
+from .data import replay
+from .data.calendar import DATE_FORMAT, current_time, get_calendar
+from .data.http_client import get_http_client
+from .data.storage import cache_dir, cache_path, write_json
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "schedule.yaml")
+
+DEFAULT_OLLAMA_API_BASE = "http://localhost:11434"
+
+
+def load_schedule(path: str = None) -> dict:
+    with open(path or os.getenv("DAEMON_SCHEDULE") or CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    for name, spec in (config.get("jobs") or {}).items():
+        if spec.get("trigger") not in ("cron", "interval"):
+            raise ValueError(f"{name}: trigger 는 cron 또는 interval 이어야 합니다.")
+    return config
+
+
+def _today() -> str:
+    return current_time().strftime(DATE_FORMAT)
+
+
+class TradingDaemon:
+    """작업 일정에 따라 한 프로세스에서 장 시작 전 준비, 투자 사이클, 장중 재점검, 상태 점검을 실행하는 데몬"""
+
+    def __init__(self, jobs: dict, config: dict = None, market: str = 'KOSPI', top_n: int = None):
+        self.config = config or load_schedule()
+        self.jobs = {"prefetch": self.prefetch, "health": self.check_health, **jobs}
+        unknown = [name for name in self.config.get("jobs", {}) if name not in self.jobs]
+        if unknown:
+            raise ValueError(f"알 수 없는 작업입니다: {unknown} (가능: {list(self.jobs)})")
+        self.market = market
+        self.top_n = top_n
+        self.status = {}
+        self.running = None
+        self.warm_day = None
+        self.health = {}
+        self._run_lock = threading.Lock()
+        self._status_lock = threading.Lock()
+
+    # 작업 실행
+
+    def run_job(self, name: str) -> bool:
+        """작업 하나를 실행합니다. 다른 작업이 실행 중이면 기다리지 않고 건너뛰며 False 를 반환합니다."""
+        if name == "health":
+            self.check_health()
+            return True
+        if not self._run_lock.acquire(blocking=False):
+            self._update(name, skipped=1)
+            print(f"[데몬] '{self.running}' 작업이 아직 실행 중이어서 '{name}' 작업을 건너뜁니다.")
+            return False
+
+        self.running = name
+        started = time.perf_counter()
+        error = None
+        try:
+            # 준비 작업이 실패했거나 그 뒤에 데몬이 시작됐으면 메인 사이클 전에 먼저 준비
+            if name == "main" and self.warm_day != _today():
+                self.prefetch()
+            self.jobs[name]()
+        except Exception as e:
+            error = str(e)
+            print(f"[데몬] '{name}' 작업 실행 중 오류가 발생했습니다: {e}")
+        finally:
+            self.running = None
+            self._run_lock.release()
+        self._update(name, runs=1, failures=int(error is not None), last_run=datetime.now().isoformat(timespec="seconds"),
+                     last_seconds=round(time.perf_counter() - started, 2), last_error=error)
+        return error is None
+
+    def _update(self, name: str, **fields) -> None:
+        with self._status_lock:
+            state = self.status.setdefault(name, {"runs": 0, "skipped": 0, "failures": 0})
+            for key, value in fields.items():
+                state[key] = state[key] + value if key in ("runs", "skipped", "failures") else value
+
+    # 장 시작 전 준비
+
+    def prefetch(self) -> dict:
+        """다음 사이클이 쓰는 데이터와 모델을 미리 올려 둡니다. 단계별 소요 시간(초)을 반환합니다."""
+        from .data.macro_store import get_macro_store
+        from .data.name_resolver import get_name_resolver
+        from .data.news_cache import get_news_cache
+        from .data.sector_index import get_sector_index
+        from .data.snapshot_store import get_snapshot_store
+        from .pipeline import DEFAULT_TOP_N, QuantPipeline
+
+        news = get_news_cache()
+        steps = [
+            ("시장 스냅샷", lambda: get_snapshot_store().load(get_calendar().last_trading_day(settled=True))),
+            ("종목명 색인", lambda: get_name_resolver().load()),
+            ("섹터 색인", lambda: get_sector_index().load()),
+            # 가치 평가 상위 후보의 일봉과 수급까지 받아 둠 (주문은 실행하지 않음)
+            ("후보 종목", lambda: QuantPipeline(market=self.market, top_n=self.top_n or DEFAULT_TOP_N).run()),
+            ("거시 지표", lambda: get_macro_store().refresh()),
+            ("뉴스", lambda: news.prefetch(int(self.config.get("news_prefetch_queries", 20)))),
+            ("LLM 모델", self.load_model),
+        ]
+
+        timings, errors = {}, {}
+        for label, step in steps:
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                errors[label] = e
+                print(f"[데몬] 준비 단계 '{label}' 실패: {e}")
+            timings[label] = round(time.perf_counter() - started, 2)
+
+        # 준비 중 받은 뉴스도 오늘 사용량에 포함
+        print(news.quota_report())
+        print("[데몬] 장 시작 전 준비 " + ", ".join(f"{label} {seconds:.2f}초" for label, seconds in timings.items())
+              + (f" (실패 {len(errors)}단계)" if errors else ""))
+        # 일부 단계가 실패해도 메인 사이클에서 다시 준비하지 않음 (같은 실패를 반복하지 않도록)
+        self.warm_day = _today()
+        return timings
+
+    @staticmethod
+    def _model() -> str:
+        from .crew import AGENT_MODEL
+        return AGENT_MODEL.split("/", 1)[1]
+
+    def load_model(self) -> None:
+        """Ollama 에 빈 요청을 보내 모델을 메모리에 올리고 keep_alive 동안 유지시킵니다."""
+        if replay.is_replay():
+            return
+        base = os.getenv("OLLAMA_API_BASE", DEFAULT_OLLAMA_API_BASE).rstrip("/")
+        get_http_client().post_json(f"{base}/api/generate",
+                                    {"model": self._model(), "keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", "24h")},
+                                    timeout=float(self.config.get("llm_load_timeout", 300)))
+
+    # 상태 점검
+
+    def _check_llm(self) -> str:
+        if replay.is_replay():
+            return "재생 모드 (로컬 스텁)"
+        base = os.getenv("OLLAMA_API_BASE", DEFAULT_OLLAMA_API_BASE).rstrip("/")
+        names = [model.get("name", "") for model in get_http_client().get_json(f"{base}/api/tags").get("models", [])]
+        model = self._model()
+        if not any(name == model or name.startswith(f"{model}:") for name in names):
+            raise ValueError(f"Ollama 에 {model} 모델이 없습니다.")
+        return f"{model} 사용 가능"
+
+    @staticmethod
+    def _check_ledger() -> str:
+        from .data.ledger import get_ledger
+        return f"현금 {get_ledger().snapshot()['cash']:,.0f}원"
+
+    def _check_disk(self) -> str:
+        free_mb = shutil.disk_usage(cache_dir()).free / 2 ** 20
+        minimum = float(self.config.get("min_free_mb", 500))
+        if free_mb < minimum:
+            raise ValueError(f"여유 공간 {free_mb:,.0f}MB (최소 {minimum:,.0f}MB)")
+        return f"여유 공간 {free_mb:,.0f}MB"
+
+    def _check_jobs(self) -> str:
+        with self._status_lock:
+            failed = [name for name, state in self.status.items() if state.get("last_error")]
+        if failed:
+            raise ValueError(f"마지막 실행이 실패한 작업: {', '.join(failed)}")
+        return "정상"
+
+    def check_health(self) -> dict:
+        """상태를 점검해 daemon/health.json 에 기록하고, 결과가 바뀌었을 때만 출력합니다."""
+        checks = {}
+        for name, check in (("llm", self._check_llm), ("ledger", self._check_ledger),
+                            ("disk", self._check_disk), ("jobs", self._check_jobs)):
+            try:
+                checks[name] = {"ok": True, "detail": check()}
+            except Exception as e:
+                checks[name] = {"ok": False, "detail": str(e)}
+
+        with self._status_lock:
+            jobs = {name: dict(state) for name, state in self.status.items()}
+        health = {
+            "checked_at": datetime.now().isoformat(timespec="seconds"),
+            "healthy": all(check["ok"] for check in checks.values()),
+            "warm": self.warm_day == _today(),
+            "running": self.running,
+            "checks": checks,
+            "jobs": jobs,
+        }
+        write_json(cache_path("daemon", "health.json"), health)
+
+        failing = sorted(name for name, check in checks.items() if not check["ok"])
+        if failing != sorted(name for name, check in self.health.get("checks", {}).items() if not check["ok"]):
+            if failing:
+                print("[데몬] 상태 점검 이상: " + ", ".join(f"{name} ({checks[name]['detail']})" for name in failing))
+            else:
+                print("[데몬] 상태 점검 정상: " + ", ".join(f"{name} {check['detail']}" for name, check in checks.items()))
+        self.health = health
+        return health
+
+    # 스케줄러
+
+    def schedule(self, scheduler) -> None:
+        """일정 파일의 작업을 scheduler 에 등록합니다. 같은 작업은 한 번에 하나만 실행하고, 밀린 회차는 한 번으로 합칩니다."""
+        timezone = self.config.get("timezone", "Asia/Seoul")
+        for name, spec in self.config.get("jobs", {}).items():
+            spec = dict(spec)
+            trigger = spec.pop("trigger")
+            scheduler.add_job(self.run_job, trigger, args=[name], id=name, name=name, max_instances=1, coalesce=True,
+                              misfire_grace_time=int(self.config.get("misfire_grace_seconds", 600)),
+                              timezone=timezone, replace_existing=True, **spec)
+
+    def start(self, scheduler=None) -> None:
+        """작업을 등록하고 스케줄러를 시작합니다. Ctrl+C 로 종료할 때까지 반환하지 않습니다."""
+        from apscheduler.schedulers.blocking import BlockingScheduler
+
+        # 에이전트의 LLM 과 준비 단계가 같은 유지 시간을 쓰도록 환경 변수로 지정
+        os.environ.setdefault("OLLAMA_KEEP_ALIVE", str(self.config.get("llm_keep_alive", "24h")))
+        os.environ.setdefault("NEWS_REUSE_MINUTES", str(self.config.get("news_reuse_minutes", 0)))
+        from .data.news_cache import get_news_cache
+        get_news_cache().reuse_seconds = 60 * float(os.environ["NEWS_REUSE_MINUTES"])
+
+        scheduler = scheduler or BlockingScheduler(timezone=self.config.get("timezone", "Asia/Seoul"))
+        self.schedule(scheduler)
+        self.check_health()
+        if self.config.get("prefetch_on_start", True):
+            self.run_job("prefetch")
+
+        print("[데몬] 자동 투자 시스템이 시작되었습니다. 작업 일정:")
+        for name, spec in self.config.get("jobs", {}).items():
+            print(f"  - {name}: " + ", ".join(f"{key}={value}" for key, value in spec.items()))
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            pass
@@ -0,0 +1,144 @@
+"""의존성 그래프(DAG) 기반 동시 실행기.
+
+노드별 선행 노드 목록으로 그래프를 만들고, 선행 노드가 모두 끝난 노드부터
+최대 max_parallel 개씩 스레드 풀에서 동시에 실행합니다.
+실행이 끝나면 노드별 소요 시간으로 임계 경로(가장 오래 걸린 의존성 사슬)를 계산해
+순차 실행 대비 얼마나 줄었는지 보여줍니다.
+    CREW_MAX_PARALLEL  동시에 실행할 태스크 수 (기본 1, main.py 의 --parallel 기본값)
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class DagResult:
+    """DAG 실행 결과. 노드별 결과, 실패 사유, 시작/종료 시각과 임계 경로를 담습니다."""
+
+    def __init__(self, dependencies: dict):
+        self.dependencies = dependencies
+        self.results = {}
+        self.errors = {}
+        self.skipped = []
+        self.started = {}
+        self.finished = {}
+        self.elapsed = 0.0
+
+    def duration(self, node) -> float:
+        return self.finished[node] - self.started[node] if node in self.finished else 0.0
+
+    @property
+    def serial_time(self) -> float:
+        """모든 노드를 순서대로 실행했을 때의 소요 시간 (노드별 소요 시간의 합)"""
+        return sum(self.duration(node) for node in self.finished)
+
+    def critical_path(self) -> tuple:
+        """(임계 경로 길이(초), 경로 노드 목록). 선행 노드를 따라 소요 시간 합이 가장 큰 사슬입니다."""
+        length, previous = {}, {}
+        for node in self.dependencies:
+            deps = self.dependencies[node]
+            best = max(deps, key=lambda d: length[d], default=None)
+            length[node] = self.duration(node) + (length[best] if best is not None else 0.0)
+            previous[node] = best
+
+        if not length:
+            return 0.0, []
+        node = max(length, key=length.get)
+        total, path = length[node], []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return total, path[::-1]
+
+    def summary(self, label: str = "DAG") -> str:
+        """동시 실행 효과를 보여주는 요약 (실제 소요, 순차 합계, 임계 경로)"""
+        length, path = self.critical_path()
+        lines = [
+            f"[{label}] {len(self.dependencies)}개 노드 (성공 {len(self.results)}, 실패 {len(self.errors)}, "
+            f"건너뜀 {len(self.skipped)}) 총 {self.elapsed:.2f}초, 순차 합계 {self.serial_time:.2f}초, "
+            f"임계 경로 {length:.2f}초",
+            f"  임계 경로: {' → '.join(str(node) for node in path)}",
+        ]
+        return "\n".join(lines)
+
+
+class DagExecutor:
+    """선행 노드가 끝난 노드부터 동시에 실행하는 실행기. 노드는 dependencies 의 선언 순서대로 제출됩니다."""
+
+    def __init__(self, dependencies: dict, max_parallel: int = 1):
+        self.dependencies = {node: list(deps) for node, deps in dependencies.items()}
+        self.max_parallel = max(1, int(max_parallel))
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list:
+        for node, deps in self.dependencies.items():
+            unknown = [d for d in deps if d not in self.dependencies]
+            if unknown:
+                raise ValueError(f"'{node}'의 선행 노드 {unknown}이(가) 그래프에 없습니다.")
+
+        order, state = [], {}
+
+        def visit(node, chain):
+            if state.get(node) == "done":
+                return
+            if state.get(node) == "visiting":
+                raise ValueError(f"순환 의존성이 있습니다: {' → '.join(map(str, chain + [node]))}")
+            state[node] = "visiting"
+            for dep in self.dependencies[node]:
+                visit(dep, chain + [node])
+            state[node] = "done"
+            order.append(node)
+
+        for node in self.dependencies:
+            visit(node, [])
+        return order
+
+    def run(self, fn) -> DagResult:
+        """각 노드에 fn(node) 를 실행합니다. 실패한 노드에 의존하는 노드는 실행하지 않고 skipped 에 담습니다."""
+        # 위상 정렬 순서로 다시 담아 임계 경로 계산에서 선행 노드가 먼저 오도록 함
+        result = DagResult({node: self.dependencies[node] for node in self.order})
+        remaining = {node: set(deps) for node, deps in self.dependencies.items()}
+        dependents = {node: [] for node in self.dependencies}
+        for node, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].append(node)
+
+        def call(node):
+            result.started[node] = time.perf_counter()
+            try:
+                return fn(node)
+            finally:
+                result.finished[node] = time.perf_counter()
+
+        def skip(node):
+            for dependent in dependents[node]:
+                if dependent not in result.skipped:
+                    result.skipped.append(dependent)
+                    remaining.pop(dependent, None)
+                    skip(dependent)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="dag") as pool:
+            running = {}
+            while remaining or running:
+                ready = [node for node, deps in remaining.items() if not deps]
+                for node in ready:
+                    del remaining[node]
+                    # 호출한 쪽의 contextvars(트레이싱 컨텍스트 등)를 작업 스레드에도 전달
+                    running[pool.submit(contextvars.copy_context().run, call, node)] = node
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        result.results[node] = future.result()
+                        for dependent in dependents[node]:
+                            if dependent in remaining:
+                                remaining[dependent].discard(node)
+                    except Exception as e:
+                        result.errors[node] = e
+                        skip(node)
+
+        result.elapsed = time.perf_counter() - started
+        return result
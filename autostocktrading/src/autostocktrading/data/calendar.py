@@ -0,0 +1,148 @@
+"""KRX 영업일 캘린더.
+
+pykrx 에서 받은 영업일 목록을 로컬 JSON 으로 캐시하고, 한 번 조회한 구간은 다시 요청하지 않습니다.
+모든 도구는 이 모듈로 '최근 거래일', 'N 거래일 전', '구간 내 거래일'을 구해
+실제로 거래가 있었던 날만 요청합니다.
+"""
+import bisect
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from . import krx
+from .storage import cache_path, read_json, write_json
+
+DATE_FORMAT = "%Y%m%d"
+
+# 장 마감 후 이 시각(시)이 지나야 당일 데이터를 확정된 것으로 보고 캐시에 기록합니다.
+SETTLE_HOUR = 16
+
+# freeze_clock() 으로 고정한 현재 시각 (재생 모드에서 기록 시점을 재현)
+_frozen_now = None
+
+
+def current_time() -> datetime:
+    """현재 시각. freeze_clock() 으로 고정했다면 고정한 시각을 반환합니다."""
+    return _frozen_now or datetime.now()
+
+
+def freeze_clock(at: datetime = None) -> None:
+    """날짜 계산에 쓰는 현재 시각을 at 으로 고정합니다. None 이면 실제 시각으로 되돌립니다."""
+    global _frozen_now
+    _frozen_now = at
+
+
+def settled_date(now: datetime = None) -> str:
+    """일봉이 확정된 가장 최근 날짜(YYYYMMDD)를 반환합니다. 장중에는 전일입니다."""
+    now = now or current_time()
+    if now.hour < SETTLE_HOUR:
+        now = now - timedelta(days=1)
+    return now.strftime(DATE_FORMAT)
+
+
+def shift_date(date_str: str, days: int) -> str:
+    """YYYYMMDD 문자열을 달력일 기준으로 이동합니다."""
+    return (datetime.strptime(date_str, DATE_FORMAT) + timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+class TradingCalendar:
+    """영업일 목록을 캐시하고 거래일 기준 날짜 계산을 제공하는 캘린더"""
+
+    def __init__(self, path: str = None):
+        self.path = path or cache_path("calendar.json")
+        state = read_json(self.path, {})
+        self._sessions = sorted(state.get("sessions", []))
+        self._coverage = state.get("coverage")
+        # 확정되지 않은 최근 구간(장중의 당일)은 프로세스 안에서만 기억
+        self._live = {}
+        self._lock = threading.RLock()
+
+    def _fetch(self, start: str, end: str) -> list[str]:
+        days = krx.get_previous_business_days(fromdate=start, todate=end)
+        return [pd.Timestamp(day).strftime(DATE_FORMAT) for day in days]
+
+    def _ensure(self, start: str, end: str) -> None:
+        with self._lock:
+            settled = settled_date()
+            covered_end = min(end, settled)
+
+            ranges = []
+            if not self._coverage:
+                if start <= covered_end:
+                    ranges.append((start, covered_end))
+            else:
+                if start < self._coverage["start"]:
+                    ranges.append((start, shift_date(self._coverage["start"], -1)))
+                if covered_end > self._coverage["end"]:
+                    ranges.append((shift_date(self._coverage["end"], 1), covered_end))
+
+            if ranges:
+                fetched = set(self._sessions)
+                for range_start, range_end in ranges:
+                    fetched.update(self._fetch(range_start, range_end))
+                self._sessions = sorted(fetched)
+                self._coverage = {
+                    "start": min([start] + ([self._coverage["start"]] if self._coverage else [])),
+                    "end": max([covered_end] + ([self._coverage["end"]] if self._coverage else [])),
+                }
+                write_json(self.path, {"coverage": self._coverage, "sessions": self._sessions})
+
+            # 아직 확정되지 않은 구간(장중의 당일)은 프로세스 안에서 한 번만 확인
+            if end > settled:
+                today = current_time().strftime(DATE_FORMAT)
+                key = (shift_date(settled, 1), today)
+                if key not in self._live and key[0] <= today:
+                    self._live = {key: self._fetch(*key)}
+
+    def _all_sessions(self) -> list[str]:
+        live = [day for days in self._live.values() for day in days]
+        return sorted(set(self._sessions).union(live)) if live else self._sessions
+
+    def sessions(self, start: str, end: str) -> list[str]:
+        """[start, end] 구간의 거래일(YYYYMMDD) 목록"""
+        if start > end:
+            return []
+        self._ensure(start, end)
+        sessions = self._all_sessions()
+        return sessions[bisect.bisect_left(sessions, start):bisect.bisect_right(sessions, end)]
+
+    def is_session(self, date: str) -> bool:
+        return bool(self.sessions(date, date))
+
+    def last_trading_day(self, asof: str = None, settled: bool = False) -> str:
+        """asof(기본: 오늘) 이전의 가장 최근 거래일. settled=True 이면 종가가 확정된 거래일만 고려합니다."""
+        asof = asof or current_time().strftime(DATE_FORMAT)
+        if settled:
+            asof = min(asof, settled_date())
+        sessions = self.sessions(shift_date(asof, -14), asof)
+        if not sessions:
+            sessions = self.sessions(shift_date(asof, -60), asof)
+        return sessions[-1] if sessions else None
+
+    def trading_days_back(self, n: int, asof: str = None, settled: bool = False) -> str:
+        """최근 거래일로부터 n 거래일 전 날짜 (n=0 이면 최근 거래일)"""
+        last = self.last_trading_day(asof, settled=settled)
+        if last is None:
+            return None
+        # 거래일은 대략 달력일의 2/3 이므로 넉넉하게 구간을 잡고 부족하면 넓힘
+        span = int(n * 1.6) + 14
+        while True:
+            sessions = self.sessions(shift_date(last, -span), last)
+            if len(sessions) > n or span > n * 7 + 30:
+                return sessions[max(0, len(sessions) - 1 - n)]
+            span *= 2
+
+    def previous_session(self, date: str) -> str:
+        return self.last_trading_day(shift_date(date, -1))
+
+
+_default_calendar = None
+
+
+def get_calendar() -> TradingCalendar:
+    """모든 도구가 공유하는 기본 TradingCalendar 를 반환합니다."""
+    global _default_calendar
+    if _default_calendar is None:
+        _default_calendar = TradingCalendar()
+    return _default_calendar
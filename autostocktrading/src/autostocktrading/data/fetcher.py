@@ -0,0 +1,133 @@
+"""종목별 조회를 병렬로 처리하는 공용 실행기.
+
+스레드 풀 크기, KRX 요청 속도 제한(토큰 버킷), 재시도 횟수와 백오프는 .env 로 조정할 수 있습니다.
+    KRX_MAX_WORKERS   동시에 실행할 조회 수 (기본 4)
+    KRX_RATE_LIMIT    초당 최대 KRX 요청 수 (기본 5)
+    KRX_MAX_RETRIES   네트워크 오류, 타임아웃, 429/5xx 응답 시 재시도 횟수 (기본 2)
+    KRX_RETRY_BACKOFF 첫 재시도 대기 시간(초), 이후 두 배씩 증가 (기본 0.5)
+"""
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .http_client import RETRY_STATUS
+
+
+def is_transient(error: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 오류인지 (연결 오류, 타임아웃, 429/5xx 응답)"""
+    if isinstance(error, requests.HTTPError):
+        return error.response is None or error.response.status_code in RETRY_STATUS
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError))
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰을 채우고, 요청마다 하나씩 소비하는 속도 제한기"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰을 얻을 때까지 대기합니다. rate 가 0 이하이면 제한하지 않습니다."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchResult:
+    """병렬 조회 결과. 성공한 값, 실패 사유, 종목별 소요 시간을 담습니다."""
+
+    def __init__(self, items: list):
+        self.items = list(dict.fromkeys(items))
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.elapsed = 0.0
+
+    def ordered(self) -> list:
+        """성공한 (항목, 값) 쌍을 요청 순서대로 반환합니다."""
+        return [(item, self.results[item]) for item in self.items if item in self.results]
+
+    def summary(self, label: str = "조회", unit: str = "종목") -> str:
+        """동시성 튜닝을 위한 한 줄 요약 (총 소요, 평균/최대 종목별 소요 시간)"""
+        line = f"[{label}] {len(self.items)}{unit} (성공 {len(self.results)}, 실패 {len(self.errors)}) 총 {self.elapsed:.2f}초"
+        if self.timings:
+            slowest = max(self.timings, key=self.timings.get)
+            average = sum(self.timings.values()) / len(self.timings)
+            line += f", 평균 {average:.2f}초, 최대 {self.timings[slowest]:.2f}초({slowest})"
+        return line
+
+
+class FetchExecutor:
+    """스레드 풀에서 종목별 조회 함수를 실행하고, 일시적인 오류로 실패한 조회는 백오프 후 재시도합니다."""
+
+    def __init__(self, max_workers: int = None, retries: int = None, backoff: float = None):
+        self.max_workers = max_workers or int(os.getenv("KRX_MAX_WORKERS", "4"))
+        self.retries = int(os.getenv("KRX_MAX_RETRIES", "2")) if retries is None else retries
+        self.backoff = float(os.getenv("KRX_RETRY_BACKOFF", "0.5")) if backoff is None else backoff
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fetch")
+
+    def _call(self, fn, item):
+        started = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                return fn(item), time.perf_counter() - started
+            except Exception as e:
+                # 잘못된 입력이나 응답 형식 오류는 다시 시도해도 같으므로 바로 실패
+                if attempt == self.retries or not is_transient(e):
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random() * 0.1))
+
+    def map(self, fn, items: list) -> FetchResult:
+        """items 각각에 fn 을 적용합니다. 실패한 항목은 errors 에 담고 나머지 결과는 그대로 반환합니다."""
+        result = FetchResult(items)
+        started = time.perf_counter()
+        # 호출한 쪽의 contextvars(계측 구간 등)를 작업 스레드에도 전달
+        futures = {item: self._pool.submit(contextvars.copy_context().run, self._call, fn, item)
+                   for item in result.items}
+        for item, future in futures.items():
+            try:
+                value, elapsed = future.result()
+                result.results[item] = value
+                result.timings[item] = elapsed
+            except Exception as e:
+                result.errors[item] = e
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+_rate_limiter = None
+_default_executor = None
+
+
+def get_rate_limiter() -> TokenBucket:
+    """KRX 로 나가는 모든 요청이 공유하는 속도 제한기를 반환합니다."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = TokenBucket(float(os.getenv("KRX_RATE_LIMIT", "5")))
+    return _rate_limiter
+
+
+def get_fetch_executor() -> FetchExecutor:
+    """모든 도구가 공유하는 기본 FetchExecutor 를 반환합니다."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = FetchExecutor()
+    return _default_executor
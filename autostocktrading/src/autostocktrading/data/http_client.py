@@ -0,0 +1,164 @@
+"""외부 API(BOK ECOS, FRED, 네이버 검색) 공용 HTTP 클라이언트.
+
+하나의 requests.Session 으로 연결을 재사용하고, 모든 요청에 타임아웃을 걸며,
+연결 오류와 429/5xx 응답은 백오프 후 재시도합니다.
+JSON 응답은 데이터 갱신 주기에 맞춘 TTL 동안 메모리와 디스크에 캐시합니다.
+(월별 거시 지표는 하루, 뉴스는 몇 분)
+    HTTP_TIMEOUT        요청 타임아웃(초, 기본 10)
+    HTTP_MAX_RETRIES    실패 시 재시도 횟수 (기본 2)
+    HTTP_RETRY_BACKOFF  첫 재시도 대기 시간(초), 이후 두 배씩 증가 (기본 0.5)
+
+테스트나 오프라인 실행에서는 StubTransport 를 transport 로 넘기면 네트워크 없이 동작합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from .. import instrumentation
+from .storage import cache_dir, read_json, write_json
+
+# 데이터 갱신 주기에 맞춘 응답 캐시 유효 시간(초)
+MACRO_TTL = 24 * 3600
+NEWS_TTL = 10 * 60
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """연결 풀, 타임아웃, 재시도, TTL 응답 캐시를 갖춘 JSON 전용 HTTP 클라이언트"""
+
+    def __init__(self, timeout: float = None, retries: int = None, backoff: float = None,
+                 transport: BaseAdapter = None, root: str = None):
+        self.timeout = float(os.getenv("HTTP_TIMEOUT", "10")) if timeout is None else timeout
+        self.retries = int(os.getenv("HTTP_MAX_RETRIES", "2")) if retries is None else retries
+        self.backoff = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5")) if backoff is None else backoff
+        self.root = root or cache_dir("http")
+        self.session = requests.Session()
+        self.mount(transport or HTTPAdapter(pool_connections=8, pool_maxsize=16))
+        self._memory = {}
+        self._lock = threading.Lock()
+        # 호스트별 실제 네트워크 요청 수 (캐시 응답과 재시도 제외, 할당량 집계용)
+        self.network_calls = Counter()
+
+    def mount(self, transport: BaseAdapter) -> None:
+        """모든 http/https 요청을 처리할 어댑터를 지정합니다."""
+        self.session.mount("https://", transport)
+        self.session.mount("http://", transport)
+
+    @staticmethod
+    def _key(url: str, params: dict = None) -> str:
+        # API 키가 URL/파라미터에 들어가므로 원문 대신 해시만 파일 이름으로 사용
+        payload = json.dumps({"url": url, "params": params or {}}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            entry = read_json(os.path.join(self.root, f"{key}.json"))
+        if entry and now - entry["fetched_at"] < ttl:
+            with self._lock:
+                self._memory[key] = entry
+            return entry["data"]
+        return None
+
+    def _store(self, key: str, data) -> None:
+        entry = {"fetched_at": time.time(), "data": data}
+        with self._lock:
+            self._memory[key] = entry
+        write_json(os.path.join(self.root, f"{key}.json"), entry)
+
+    def _request(self, url: str, params: dict = None, headers: dict = None, method: str = "GET",
+                 payload: dict = None, timeout: float = None) -> requests.Response:
+        with self._lock:
+            self.network_calls[urlsplit(url).hostname] += 1
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.request(method, url, params=params, headers=headers, json=payload,
+                                                timeout=timeout or self.timeout)
+                if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                    instrumentation.add(requests=1, bytes=len(response.content))
+                    response.raise_for_status()
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            time.sleep(self.backoff * (2 ** attempt))
+
+    def get_json(self, url: str, params: dict = None, headers: dict = None, ttl: float = 0):
+        """GET 요청의 JSON 응답. ttl(초) 이 0 보다 크면 그 시간 동안 같은 요청은 캐시에서 반환합니다."""
+        key = self._key(url, params)
+        if ttl > 0:
+            cached = self._cached(key, ttl)
+            instrumentation.cache(cached is not None)
+            if cached is not None:
+                return cached
+
+        data = self._request(url, params=params, headers=headers).json()
+        if ttl > 0:
+            self._store(key, data)
+        return data
+
+    def post_json(self, url: str, payload: dict, timeout: float = None):
+        """JSON 본문을 담은 POST 요청의 JSON 응답. 캐시하지 않습니다. (timeout 을 생략하면 HTTP_TIMEOUT)"""
+        return self._request(url, method="POST", payload=payload, timeout=timeout).json()
+
+    def clear(self) -> None:
+        """메모리 캐시를 비웁니다. (디스크 캐시는 TTL 이 지나면 무시됩니다)"""
+        with self._lock:
+            self._memory.clear()
+
+
+class StubTransport(BaseAdapter):
+    """네트워크 없이 미리 등록한 JSON 응답을 돌려주는 requests 어댑터 (테스트/오프라인 실행용)"""
+
+    def __init__(self):
+        super().__init__()
+        self.routes = []
+        self.calls = []
+
+    def add(self, url_prefix: str, data=None, status: int = 200) -> "StubTransport":
+        """url_prefix 로 시작하는 요청에 대한 응답을 등록합니다. 같은 접두어를 여러 번 등록하면 등록 순서대로 응답합니다."""
+        self.routes.append({"prefix": url_prefix, "data": data, "status": status, "served": False})
+        return self
+
+    def send(self, request, **kwargs) -> requests.Response:
+        self.calls.append(request.url)
+        matches = [route for route in self.routes if request.url.startswith(route["prefix"])]
+        if not matches:
+            raise requests.ConnectionError(f"등록되지 않은 URL 입니다: {request.url}")
+
+        # 아직 쓰지 않은 응답을 순서대로 쓰고, 모두 썼다면 마지막 응답을 계속 사용
+        route = next((route for route in matches if not route["served"]), matches[-1])
+        route["served"] = True
+
+        response = requests.Response()
+        response.status_code = route["status"]
+        response._content = json.dumps(route["data"], ensure_ascii=False).encode("utf-8")
+        response.headers["Content-Type"] = "application/json; charset=utf-8"
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+_default_client = None
+
+
+def get_http_client() -> HttpClient:
+    """모든 도구가 공유하는 기본 HttpClient 를 반환합니다."""
+    global _default_client
+    if _default_client is None:
+        _default_client = HttpClient()
+    return _default_client
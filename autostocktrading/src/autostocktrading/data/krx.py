@@ -0,0 +1,83 @@
+"""pykrx 호출을 한 곳으로 모으는 게이트웨이.
+
+모든 데이터 저장소는 pykrx.stock 을 직접 부르지 않고 이 모듈을 통해 호출합니다.
+모든 요청은 공용 속도 제한기를 거치며, 테스트나 벤치마크에서는 use_backend() 로
+동일한 함수 이름을 가진 객체를 주입할 수 있습니다.
+"""
+from .. import instrumentation
+from .fetcher import get_rate_limiter
+
+_backend = None
+# 백엔드가 종목명 조회용 상장 종목 목록을 이미 받아 두었는지
+_names_loaded = False
+
+
+def use_backend(backend) -> None:
+    """pykrx.stock 대신 사용할 백엔드를 지정합니다. None 이면 pykrx.stock 으로 되돌립니다."""
+    global _backend, _names_loaded
+    _backend = backend
+    _names_loaded = False
+
+
+def backend():
+    global _backend
+    if _backend is None:
+        from pykrx import stock
+        _backend = stock
+    return _backend
+
+
+def _call(name: str, *args, _request: bool = True, **kwargs):
+    """백엔드 함수를 호출합니다. _request=False 는 네트워크 요청 없이 메모리에서 답하는 호출로, 속도 제한과 요청 수 집계를 건너뜁니다."""
+    if _request:
+        get_rate_limiter().acquire()
+        instrumentation.add(requests=1)
+    return getattr(backend(), name)(*args, **kwargs)
+
+
+def get_market_ohlcv(*args, **kwargs):
+    return _call("get_market_ohlcv", *args, **kwargs)
+
+
+def get_market_ticker_list(*args, **kwargs):
+    return _call("get_market_ticker_list", *args, **kwargs)
+
+
+def get_market_fundamental(*args, **kwargs):
+    return _call("get_market_fundamental", *args, **kwargs)
+
+
+def get_market_cap(*args, **kwargs):
+    return _call("get_market_cap", *args, **kwargs)
+
+
+def get_market_trading_value_by_date(*args, **kwargs):
+    return _call("get_market_trading_value_by_date", *args, **kwargs)
+
+
+def get_previous_business_days(**kwargs):
+    return _call("get_previous_business_days", **kwargs)
+
+
+def get_market_ticker_name(*args, **kwargs):
+    # pykrx 는 첫 호출 때 상장 종목 목록을 한 번 받아 두고 이후에는 메모리에서 이름을 찾으므로 첫 호출만 요청으로 셈
+    global _names_loaded
+    name = _call("get_market_ticker_name", *args, _request=not _names_loaded, **kwargs)
+    _names_loaded = True
+    return name
+
+
+def get_market_sector_classifications(*args, **kwargs):
+    return _call("get_market_sector_classifications", *args, **kwargs)
+
+
+def get_index_ticker_list(*args, **kwargs):
+    return _call("get_index_ticker_list", *args, **kwargs)
+
+
+def get_index_ticker_name(*args, **kwargs):
+    return _call("get_index_ticker_name", *args, **kwargs)
+
+
+def get_index_portfolio_deposit_file(*args, **kwargs):
+    return _call("get_index_portfolio_deposit_file", *args, **kwargs)
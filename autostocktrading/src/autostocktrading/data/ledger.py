@@ -0,0 +1,233 @@
+"""모의 거래 포트폴리오 원장.
+
+SQLite(WAL 모드) 하나에 추가만 하는 거래 기록(trades)과 종목별 보유 현황(positions),
+현금(account)을 함께 보관합니다. 여러 주문은 하나의 트랜잭션으로 한꺼번에 반영되며,
+BEGIN IMMEDIATE 로 DB 파일의 쓰기 잠금을 먼저 잡으므로 여러 실행기가 동시에 주문해도 섞이지 않습니다.
+    PORTFOLIO_DB    원장 DB 경로 (기본 portfolio.db)
+    PORTFOLIO_JSON  원장이 처음 만들어질 때 초기 잔고를 읽어올 JSON (기본 portfolio.json)
+"""
+import copy
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS account (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS positions (
+    ticker TEXT PRIMARY KEY,
+    quantity INTEGER NOT NULL,
+    purchase_price REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    executed_at TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    action TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    price REAL NOT NULL
+);
+"""
+
+
+class OrderRejected(ValueError):
+    """검증을 통과하지 못한 주문"""
+
+
+class PortfolioLedger:
+    """거래 기록과 보유 현황을 트랜잭션 단위로 관리하는 포트폴리오 저장소"""
+
+    def __init__(self, path: str = None, seed_path: str = None):
+        self.path = path or os.getenv("PORTFOLIO_DB", "portfolio.db")
+        self.seed_path = seed_path or os.getenv("PORTFOLIO_JSON", "portfolio.json")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._snapshot = None
+        self._snapshot_version = None
+        self._seed()
+
+    def _seed(self) -> None:
+        """원장이 비어 있으면 portfolio.json 의 현금/보유 종목으로 초기화합니다."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM account WHERE key = 'cash'").fetchone() is None:
+                    try:
+                        with open(self.seed_path, 'r', encoding='utf-8') as f:
+                            seed = json.load(f)
+                    except FileNotFoundError:
+                        seed = {"cash": 0, "stocks": []}
+                    self._conn.execute("INSERT INTO account (key, value) VALUES ('cash', ?)", (seed.get("cash", 0),))
+                    self._conn.executemany(
+                        "INSERT INTO positions (ticker, quantity, purchase_price) VALUES (?, ?, ?)",
+                        [(s["ticker"], s["quantity"], s["purchase_price"]) for s in seed.get("stocks", [])],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def snapshot(self) -> dict:
+        """{'cash': ..., 'stocks': [...]} 형태의 현재 포트폴리오. 변경이 없으면 캐시된 값을 반환합니다."""
+        with self._lock:
+            version = self._data_version()
+            if self._snapshot is None or version != self._snapshot_version:
+                cash = self._conn.execute("SELECT value FROM account WHERE key = 'cash'").fetchone()[0]
+                rows = self._conn.execute(
+                    "SELECT ticker, quantity, purchase_price FROM positions ORDER BY ticker"
+                ).fetchall()
+                self._snapshot = {
+                    "cash": cash,
+                    "stocks": [{"ticker": t, "quantity": q, "purchase_price": p} for t, q, p in rows],
+                }
+                self._snapshot_version = version
+            return copy.deepcopy(self._snapshot)
+
+    def position(self, ticker: str):
+        """한 종목의 보유 현황 (보유하지 않으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT quantity, purchase_price FROM positions WHERE ticker = ?", (ticker,)
+            ).fetchone()
+        return {"ticker": ticker, "quantity": row[0], "purchase_price": row[1]} if row else None
+
+    @staticmethod
+    def _check(order: dict, cash: float, held: int):
+        """주문 하나를 검증하고 (주문 후 현금, 주문 후 보유 수량)을 반환합니다. 검증 실패 시 OrderRejected."""
+        ticker, action = order["ticker"], str(order["action"]).upper()
+        quantity, price = int(order["quantity"]), float(order["price"])
+
+        if quantity <= 0 or price <= 0:
+            raise OrderRejected(f"수량과 가격은 0보다 커야 합니다. (수량: {quantity}, 가격: {price})")
+
+        if action == 'BUY':
+            cost = quantity * price
+            if cash < cost:
+                raise OrderRejected(f"현금 부족 (필요: {cost:,.0f}원, 보유: {cash:,.0f}원)")
+            return cash - cost, held + quantity
+
+        if action == 'SELL':
+            if held == 0:
+                raise OrderRejected(f"보유하지 않은 종목({ticker})입니다.")
+            if held < quantity:
+                raise OrderRejected(f"보유 수량 부족 ({ticker} - 보유: {held}주, 매도 요청: {quantity}주)")
+            return cash + quantity * price, held - quantity
+
+        raise OrderRejected(f"알 수 없는 동작('{order['action']}')입니다. 'BUY' 또는 'SELL'만 가능합니다.")
+
+    def _apply(self, order: dict, cash: float) -> float:
+        """트랜잭션 안에서 한 주문을 반영하고 주문 후 현금을 반환합니다."""
+        ticker, quantity, price = order["ticker"], int(order["quantity"]), float(order["price"])
+        row = self._conn.execute(
+            "SELECT quantity, purchase_price FROM positions WHERE ticker = ?", (ticker,)
+        ).fetchone()
+        held = row[0] if row else 0
+
+        new_cash, new_held = self._check(order, cash, held)
+
+        if new_held == 0:
+            # 매도 후 수량이 0이 되면 보유 현황에서 제거
+            self._conn.execute("DELETE FROM positions WHERE ticker = ?", (ticker,))
+        elif not row:
+            self._conn.execute(
+                "INSERT INTO positions (ticker, quantity, purchase_price) VALUES (?, ?, ?)",
+                (ticker, new_held, price),
+            )
+        elif new_held > held:
+            # 평균 매수 단가 재계산
+            purchase_price = (row[1] * held + quantity * price) / new_held
+            self._conn.execute(
+                "UPDATE positions SET quantity = ?, purchase_price = ? WHERE ticker = ?",
+                (new_held, purchase_price, ticker),
+            )
+        else:
+            self._conn.execute("UPDATE positions SET quantity = ? WHERE ticker = ?", (new_held, ticker))
+
+        return new_cash
+
+    def validate(self, orders: list[dict]) -> list:
+        """주문을 실행하지 않고 순서대로 검증합니다. 주문별 거부 사유(통과 시 None) 목록을 반환합니다."""
+        snapshot = self.snapshot()
+        cash = snapshot["cash"]
+        holdings = {s["ticker"]: s["quantity"] for s in snapshot["stocks"]}
+
+        errors = []
+        for order in orders:
+            try:
+                cash, holdings[order["ticker"]] = self._check(order, cash, holdings.get(order["ticker"], 0))
+                errors.append(None)
+            except (OrderRejected, KeyError, TypeError, ValueError) as e:
+                errors.append(str(e))
+        return errors
+
+    def execute(self, orders: list[dict]) -> list[dict]:
+        """여러 주문을 하나의 트랜잭션으로 실행합니다.
+
+        주문은 순서대로 검증·반영되며, 하나라도 거부되면 전체를 되돌립니다.
+        반환값은 주문별 결과(status: 'filled' / 'rejected' / 'cancelled', message) 목록입니다.
+        """
+        results = [dict(order, status='cancelled', message='다른 주문 거부로 취소됨') for order in orders]
+        batch_id = uuid.uuid4().hex
+        executed_at = datetime.now().isoformat(timespec='seconds')
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cash = self._conn.execute("SELECT value FROM account WHERE key = 'cash'").fetchone()[0]
+                for i, order in enumerate(orders):
+                    try:
+                        cash = self._apply(order, cash)
+                    except (OrderRejected, KeyError, TypeError, ValueError) as e:
+                        results[i].update(status='rejected', message=str(e))
+                        self._conn.execute("ROLLBACK")
+                        return results
+
+                self._conn.execute("UPDATE account SET value = ? WHERE key = 'cash'", (cash,))
+                self._conn.executemany(
+                    "INSERT INTO trades (batch_id, executed_at, ticker, action, quantity, price) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(batch_id, executed_at, o["ticker"], str(o["action"]).upper(), int(o["quantity"]), float(o["price"]))
+                     for o in orders],
+                )
+                self._conn.execute("COMMIT")
+                # data_version 은 다른 연결의 변경만 반영하므로 자신의 커밋 후에는 직접 무효화
+                self._snapshot = None
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        for result in results:
+            result.update(status='filled', message='체결 완료')
+        return results
+
+    def trades(self, limit: int = 100) -> list[dict]:
+        """최근 거래 기록 (최신순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id, executed_at, ticker, action, quantity, price FROM trades ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        keys = ("batch_id", "executed_at", "ticker", "action", "quantity", "price")
+        return [dict(zip(keys, row)) for row in rows]
+
+
+_default_ledger = None
+
+
+def get_ledger() -> PortfolioLedger:
+    """모든 도구가 공유하는 기본 PortfolioLedger 를 반환합니다."""
+    global _default_ledger
+    if _default_ledger is None:
+        _default_ledger = PortfolioLedger()
+    return _default_ledger
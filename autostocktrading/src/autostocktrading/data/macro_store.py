@@ -0,0 +1,204 @@
+"""거시 지표 시계열 저장소.
+
+config/macro_series.yaml 에 정의된 한국은행 ECOS / FRED 시계열의 전체 이력을 로컬 JSON 으로 보관하고,
+다음 조회부터는 마지막 저장일 이후의 관측치만 받아 이어 붙입니다. (마지막 관측치는 수정치 반영을 위해 다시 받음)
+최근 확인 후 MACRO_REFRESH_HOURS 가 지나지 않은 시계열은 네트워크 요청 없이 저장된 이력을 그대로 사용하며,
+갱신이 필요한 시계열은 모두 동시에 조회합니다.
+    MACRO_REFRESH_HOURS  시계열을 다시 확인하는 간격(시간, 기본 12)
+    MACRO_HISTORY_YEARS  처음 수집할 때 받아올 기간(년, 기본 5)
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import yaml
+
+from ..env import load_env
+from .calendar import current_time
+from .fetcher import FetchExecutor
+from .http_client import get_http_client
+from .storage import cache_dir, read_json, write_json
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "macro_series.yaml")
+
+ECOS_URL = "https://ecos.bok.or.kr/api/StatisticSearch/{key}/json/kr/1/{rows}/{stat_code}/{cycle}/{start}/{end}/{item_code}"
+FRED_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+# ECOS 주기별 날짜 형식 (요청용, 저장용)
+ECOS_TIME_FORMATS = {"D": ("%Y%m%d", "%Y-%m-%d"), "M": ("%Y%m", "%Y-%m")}
+ECOS_MAX_ROWS = 10000
+
+# 추세 요약에 표시할 최근 관측치 수
+RECENT_POINTS = 6
+
+
+def load_series_config(path: str = None) -> dict:
+    with open(path or CONFIG_PATH, 'r', encoding='utf-8') as f:
+        series = yaml.safe_load(f) or {}
+    for series_id, spec in series.items():
+        if spec.get("source") == "ecos" and spec.get("cycle") not in ECOS_TIME_FORMATS:
+            raise ValueError(f"{series_id}: ECOS 주기는 {list(ECOS_TIME_FORMATS)} 중 하나여야 합니다.")
+    return series
+
+
+class MacroStore:
+    """시계열별 전체 이력을 보관하고 새 관측치만 증분 조회하는 거시 지표 저장소"""
+
+    def __init__(self, root: str = None, config_path: str = None, client=None):
+        self.root = root or cache_dir("macro")
+        self.series = load_series_config(config_path)
+        self.client = client
+        self.refresh_seconds = 3600 * float(os.getenv("MACRO_REFRESH_HOURS", "12"))
+        self.history_years = int(os.getenv("MACRO_HISTORY_YEARS", "5"))
+        self._locks = {series_id: threading.Lock() for series_id in self.series}
+        self._executor = None
+
+    def _path(self, series_id: str) -> str:
+        return os.path.join(self.root, f"{series_id}.json")
+
+    def _load(self, series_id: str) -> dict:
+        return read_json(self._path(series_id), {"observations": [], "checked_at": 0})
+
+    def ids(self, group: str = None) -> list[str]:
+        return [series_id for series_id, spec in self.series.items() if group is None or spec.get("group") == group]
+
+    def _fetch_ecos(self, spec: dict, start: datetime) -> list:
+        load_env()
+        api_key = os.getenv("BOK_API_KEY")
+        if not api_key:
+            raise ValueError(".env 파일에 BOK_API_KEY가 설정되어 있지 않습니다")
+
+        request_format, stored_format = ECOS_TIME_FORMATS[spec["cycle"]]
+        url = ECOS_URL.format(key=api_key, rows=ECOS_MAX_ROWS, stat_code=spec["stat_code"], cycle=spec["cycle"],
+                              start=start.strftime(request_format), end=current_time().strftime(request_format),
+                              item_code=spec["item_code"])
+        data = (self.client or get_http_client()).get_json(url)
+
+        if 'StatisticSearch' not in data:
+            result = data.get('RESULT', {})
+            # INFO-200: 해당 기간에 새 데이터가 없음
+            if result.get('CODE') == 'INFO-200':
+                return []
+            raise ValueError(result.get('MESSAGE', '데이터 없음'))
+
+        return [
+            (datetime.strptime(row['TIME'], request_format).strftime(stored_format), float(row['DATA_VALUE']))
+            for row in data['StatisticSearch'].get('row', []) if row.get('DATA_VALUE') not in (None, '')
+        ]
+
+    def _fetch_fred(self, spec: dict, start: datetime) -> list:
+        load_env()
+        api_key = os.getenv("FRED_API_KEY")
+        if not api_key:
+            raise ValueError(".env 파일에 FRED_API_KEY가 설정되어 있지 않습니다")
+
+        params = {
+            'series_id': spec["series_id"],
+            'api_key': api_key,
+            'file_type': 'json',
+            'observation_start': start.strftime("%Y-%m-%d"),
+            'units': spec.get("units", "lin"),
+        }
+        data = (self.client or get_http_client()).get_json(FRED_URL, params=params)
+        # FRED 는 결측치를 '.' 로 표시
+        return [(obs['date'], float(obs['value'])) for obs in data.get('observations', []) if obs['value'] != '.']
+
+    def update(self, series_id: str) -> int:
+        """한 시계열을 갱신하고 새로 추가된 관측치 수를 반환합니다. 최근에 확인했다면 요청하지 않습니다."""
+        spec = self.series[series_id]
+        with self._locks[series_id]:
+            state = self._load(series_id)
+            if time.time() - state["checked_at"] < self.refresh_seconds:
+                return 0
+
+            observations = state["observations"]
+            if observations:
+                start = pd.Timestamp(observations[-1][0]).to_pydatetime()
+            else:
+                start = current_time() - timedelta(days=365 * self.history_years)
+
+            fetch = self._fetch_ecos if spec["source"] == "ecos" else self._fetch_fred
+            merged = dict(map(tuple, observations))
+            merged.update(fetch(spec, start))
+
+            write_json(self._path(series_id), {"observations": sorted(merged.items()), "checked_at": time.time()})
+            return len(merged) - len(observations)
+
+    def refresh(self, group: str = None):
+        """설정된 시계열(group 지정 시 해당 그룹)을 동시에 갱신합니다. 실패한 시계열은 결과의 errors 에 담깁니다."""
+        if self._executor is None:
+            # 재시도는 HttpClient 가 담당
+            self._executor = FetchExecutor(max_workers=max(1, len(self.series)), retries=0)
+        fetched = self._executor.map(self.update, self.ids(group))
+        print(fetched.summary("거시 지표", unit="개 시계열"))
+        return fetched
+
+    def history(self, series_id: str) -> pd.Series:
+        observations = self._load(series_id)["observations"]
+        if not observations:
+            return pd.Series(dtype=float, name=series_id)
+        dates, values = zip(*observations)
+        return pd.Series(values, index=pd.DatetimeIndex(pd.to_datetime(list(dates))), name=series_id)
+
+    def trend(self, series_id: str):
+        """최신값, 기준일, 직전/3개월 전/1년 전 대비 변화, 최근 관측치를 담은 딕셔너리 (이력이 없으면 None)"""
+        observations = self._load(series_id)["observations"]
+        if not observations:
+            return None
+        series = self.history(series_id)
+        latest_date, latest = series.index[-1], series.iloc[-1]
+
+        def change_since(days: int):
+            prior = series[series.index <= latest_date - pd.Timedelta(days=days)]
+            return latest - prior.iloc[-1] if len(prior) else None
+
+        return {
+            "date": observations[-1][0],
+            "value": latest,
+            "previous_change": latest - series.iloc[-2] if len(series) > 1 else None,
+            "change_3m": change_since(91),
+            "change_1y": change_since(365),
+            "recent": list(series.tail(RECENT_POINTS)),
+        }
+
+    def report(self, group: str = None, errors: dict = None) -> str:
+        """그룹의 시계열별 추세를 한 줄씩 요약합니다. 이력이 없는 시계열은 실패 사유를 표시합니다."""
+        errors = errors or {}
+        lines = []
+        for series_id in self.ids(group):
+            spec = self.series[series_id]
+            name, unit = spec.get("name", series_id), spec.get("unit", "")
+            trend = self.trend(series_id)
+            if trend is None:
+                lines.append(f"  - {name}: 조회 실패 ({errors.get(series_id, '데이터 없음')})")
+                continue
+
+            changes = [
+                f"{label} {value:+,.2f}" for label, value in (
+                    ("직전 대비", trend["previous_change"]),
+                    ("3개월 전 대비", trend["change_3m"]),
+                    ("1년 전 대비", trend["change_1y"]),
+                ) if value is not None
+            ]
+            recent = " → ".join(f"{value:,.2f}" for value in trend["recent"])
+            line = f"  - {name}: {trend['value']:,.2f}{unit} (기준일: {trend['date']})"
+            if changes:
+                line += f", {', '.join(changes)}"
+            line += f"\n    최근 추이: {recent}"
+            if series_id in errors:
+                line += f"\n    (최신 갱신 실패, 저장된 이력 기준: {errors[series_id]})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+_default_store = None
+
+
+def get_macro_store() -> MacroStore:
+    """모든 도구가 공유하는 기본 MacroStore 를 반환합니다."""
+    global _default_store
+    if _default_store is None:
+        _default_store = MacroStore()
+    return _default_store
@@ -0,0 +1,200 @@
+"""회사명 → 티커 변환기.
+
+KOSPI / KOSDAQ 상장 종목의 티커 → 종목명 목록을 거래일마다 한 번 만들어 JSON 으로 저장하고,
+메모리에 정규화한 이름 사전과 문자 바이그램 역색인을 만들어 둡니다.
+이름 하나는 다음 순서로 찾습니다.
+    1. 정규화(대소문자, 공백, 문장부호, '(주)' 무시)한 종목명과 정확히 일치
+    2. config/name_aliases.yaml 의 영문 이름 / 약칭
+    3. '우선주', '우', '2우B' 같은 우선주 표기 → 같은 회사의 그 종류 우선주 종목
+       (요청한 종류가 상장되어 있지 않으면 다른 종류로 바꾸지 않고 유사도 매칭으로 넘김)
+    4. 바이그램 Dice 유사도가 가장 높은 종목 (FUZZY_THRESHOLD 이상)
+종목 목록을 받지 못해 빈 사전이 만들어지면 저장하지 않고 이전 사전을 계속 쓰다가
+PARTIAL_RETRY_SECONDS 뒤에 다시 만듭니다.
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+import yaml
+
+from . import krx
+from .calendar import get_calendar
+from .sector_index import PARTIAL_RETRY_SECONDS
+from .snapshot_store import SNAPSHOT_MARKETS
+from .storage import cache_dir, read_json, write_json
+
+ALIASES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "name_aliases.yaml")
+
+# 유사도 매칭으로 인정할 최소 Dice 계수, 차점과 이 차이 안이면 모호한 것으로 표시
+FUZZY_THRESHOLD = 0.5
+AMBIGUITY_MARGIN = 0.05
+
+_NOISE = re.compile(r"\(주\)|㈜|주식회사|[^\w&]")
+# 종목명 끝의 우선주 표기 (우, 우B, 2우B, 3우C ...)
+_PREFERRED_SUFFIX = re.compile(r"^(.+?)(\d?우[bc]?)$")
+# 검색어 끝의 우선주 표현
+_PREFERRED_WORDS = ("우선주", "우선", "preferred", "pref")
+_TICKER = re.compile(r"^\d{6}$")
+
+
+def normalize(name: str) -> str:
+    return _NOISE.sub("", unicodedata.normalize("NFKC", str(name)).lower()).replace("_", "")
+
+
+def _grams(key: str) -> set:
+    return {key[i:i + 2] for i in range(len(key) - 1)} or {key}
+
+
+class NameResolver:
+    """정규화 이름 사전, 별칭, 우선주 표기, 바이그램 유사도로 회사명을 티커로 바꾸는 변환기"""
+
+    def __init__(self, root: str = None, aliases_path: str = None):
+        self.root = root or cache_dir("names")
+        os.makedirs(self.root, exist_ok=True)
+        with open(aliases_path or ALIASES_PATH, 'r', encoding='utf-8') as f:
+            self.aliases = {normalize(alias): str(target) for alias, target in (yaml.safe_load(f) or {}).items()}
+        self.date = None
+        self._retry_date = None
+        self._retry_at = 0.0
+        self.names = {}
+        self._exact = {}
+        self._preferred = {}
+        self._postings = {}
+        self._gram_counts = {}
+        self._lock = threading.Lock()
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.root, f"{date}.json")
+
+    def _build(self, date: str) -> dict:
+        names = {}
+        for market in SNAPSHOT_MARKETS:
+            for ticker in krx.get_market_ticker_list(date, market=market):
+                names[str(ticker)] = krx.get_market_ticker_name(ticker)
+        return names
+
+    def _activate(self, date: str, names: dict) -> None:
+        exact, postings, gram_counts = {}, {}, {}
+        for ticker, name in names.items():
+            key = normalize(name)
+            exact.setdefault(key, ticker)
+            grams = _grams(key)
+            gram_counts[ticker] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(ticker)
+
+        # 같은 회사의 보통주가 상장되어 있을 때만 우선주로 인정 (예: '대우' 로 끝나는 보통주 제외)
+        preferred = {}
+        for key, ticker in exact.items():
+            match = _PREFERRED_SUFFIX.match(key)
+            if match and match.group(1) in exact:
+                preferred.setdefault(match.group(1), {})[match.group(2)] = ticker
+
+        self.date, self.names = date, names
+        self._exact, self._preferred, self._postings, self._gram_counts = exact, preferred, postings, gram_counts
+
+    def load(self, date: str = None) -> "NameResolver":
+        """지정한 거래일(기본: 가장 최근 거래일)의 종목명 사전을 메모리에 올립니다. 없으면 새로 만듭니다."""
+        date = date or get_calendar().last_trading_day()
+        with self._lock:
+            if self.date == date or (self._retry_date == date and time.time() < self._retry_at):
+                return self
+            names = read_json(self._path(date))
+            if names is None:
+                names = self._build(date)
+                if not names:
+                    print(f"{date} 종목명 목록을 받지 못해 이전 목록을 유지하고 {PARTIAL_RETRY_SECONDS}초 뒤에 다시 만듭니다.")
+                    self._retry_date, self._retry_at = date, time.time() + PARTIAL_RETRY_SECONDS
+                    return self
+                write_json(self._path(date), names)
+            self._activate(date, names)
+        return self
+
+    def name_of(self, ticker: str):
+        """티커의 종목명. 없으면 None 입니다."""
+        return self.load().names.get(ticker)
+
+    def _alias(self, key: str):
+        target = self.aliases.get(key)
+        if target is None:
+            return None
+        ticker = target if _TICKER.match(target) else self._exact.get(normalize(target))
+        return ticker if ticker in self.names else None
+
+    def _fuzzy(self, key: str) -> list:
+        grams = _grams(key)
+        shared = Counter(ticker for gram in grams for ticker in self._postings.get(gram, ()))
+        scored = []
+        for ticker, common in shared.items():
+            scored.append((2 * common / (len(grams) + self._gram_counts[ticker]), ticker))
+        # 점수가 같으면 이름이 짧은(검색어에 더 가까운) 종목 우선
+        scored.sort(key=lambda item: (-item[0], len(self.names[item[1]]), item[1]))
+        return scored
+
+    def resolve(self, query: str):
+        """회사명 하나를 {'query', 'ticker', 'name', 'method', 'score', 'alternatives'} 로 변환합니다. 찾지 못하면 None."""
+        self.load()
+        query = str(query).strip()
+        key = normalize(query)
+        if not key:
+            return None
+
+        def found(ticker, method, score=1.0, alternatives=()):
+            return {"query": query, "ticker": ticker, "name": self.names[ticker], "method": method,
+                    "score": round(score, 2), "alternatives": list(alternatives)}
+
+        if _TICKER.match(key) and key in self.names:
+            return found(key, "ticker")
+        if key in self._exact:
+            return found(self._exact[key], "exact")
+
+        alias = self._alias(key)
+        if alias is not None:
+            return found(alias, "alias")
+
+        # '삼성전자 우선주', '삼전우' → 보통주 이름(또는 별칭) + 우선주 종류 (종류를 밝히지 않으면 None)
+        base, kind = None, None
+        for word in _PREFERRED_WORDS:
+            if key.endswith(word) and len(key) > len(word):
+                base = key[:-len(word)]
+                break
+        else:
+            match = _PREFERRED_SUFFIX.match(key)
+            if match:
+                base, kind = match.groups()
+        if base is not None:
+            common = self._exact.get(base) or self._alias(base)
+            kinds = self._preferred.get(normalize(self.names[common])) if common else None
+            if kinds and kind is None:
+                # '우선주' 처럼 종류 없이 요청하면 '우', 우선주가 한 종류뿐이면 그 종목
+                ticker = kinds.get("우") or (next(iter(kinds.values())) if len(kinds) == 1 else None)
+            else:
+                ticker = kinds.get(kind) if kinds else None
+            if ticker is not None:
+                return found(ticker, "preferred")
+
+        scored = self._fuzzy(key)
+        if not scored or scored[0][0] < FUZZY_THRESHOLD:
+            return None
+        best_score, best = scored[0]
+        alternatives = [self.names[t] for score, t in scored[1:4] if best_score - score <= AMBIGUITY_MARGIN]
+        return found(best, "fuzzy", best_score, alternatives)
+
+    def resolve_many(self, queries: list[str]) -> dict:
+        """여러 회사명을 한 번에 변환합니다. {검색어: 결과 또는 None}"""
+        self.load()
+        return {query: self.resolve(query) for query in dict.fromkeys(queries)}
+
+
+_default_resolver = None
+
+
+def get_name_resolver() -> NameResolver:
+    """모든 도구가 공유하는 기본 NameResolver 를 반환합니다."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = NameResolver()
+    return _default_resolver
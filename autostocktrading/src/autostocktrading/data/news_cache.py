@@ -0,0 +1,267 @@
+"""사이클 단위 네이버 뉴스 검색 캐시.
+
+market_trend_analyst, sector_researcher, esg_analyst 가 한 사이클 안에서 같은(또는 띄어쓰기·순서만 다른)
+키워드를 반복 검색하므로, 정규화한 검색어를 캐시 키로 결과를 메모리에 보관하고 재사용합니다.
+API 에는 정규화한 키가 아니라 처음 요청한 검색어를 그대로 보내며, 한 번에 최대 100건을 받아 페이지로 나눠 씁니다.
+여러 검색어는 동시에 조회하며, 기사는 원문 링크 기준으로 중복을 제거합니다.
+사이클마다 reset() 으로 비우고, quota_report() 로 이번 사이클과 오늘 누적 API 호출 수를 보고합니다.
+데몬처럼 프로세스가 계속 떠 있으면 NEWS_REUSE_MINUTES 안에 받은 결과는 다음 사이클에도 재사용하며,
+직전 사이클의 검색어를 queries.json 에 남겨 prefetch() 로 장 시작 전에 미리 받아 둘 수 있습니다.
+받은 기사는 사이클이 끝나도 corpus.jsonl 에 쌓아 두어 ESG 리스크 색인 등 로컬 분석에 사용합니다.
+    NAVER_NEWS_DAILY_LIMIT  네이버 검색 API 일일 호출 한도 (기본 25000)
+    NEWS_CORPUS_DAYS        기사 보관 기간(일, 기본 90)
+    NEWS_REUSE_MINUTES      사이클이 바뀌어도 재사용할 검색 결과의 최대 경과 시간(분, 기본 0: 사이클마다 비움)
+"""
+import contextvars
+import html
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from .. import instrumentation
+from ..env import load_env
+from .http_client import get_http_client, NEWS_TTL
+from .storage import cache_dir, atomic_write, read_json, write_json
+
+NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+NEWS_HOST = urlsplit(NEWS_URL).hostname
+
+# 도구가 보여 주는 페이지당 기사 수
+PAGE_SIZE = 5
+# API 호출 한 번에 받는 기사 수 (네이버 API 의 display 최대값), start 최대값
+FETCH_SIZE = 100
+MAX_START = 1000
+
+_TAG = re.compile(r"<[^>]+>")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    """대소문자, 문장부호, 띄어쓰기, 단어 순서 차이를 없앤 검색어 (같은 검색어는 한 번만 요청)"""
+    query = unicodedata.normalize("NFKC", query).lower()
+    tokens = _PUNCTUATION.sub(" ", query).split()
+    return " ".join(sorted(dict.fromkeys(tokens)))
+
+
+def _clean(text: str) -> str:
+    return html.unescape(_TAG.sub("", text or "")).strip()
+
+
+class NewsCache:
+    """정규화한 검색어·페이지별 검색 결과와 링크별 기사를 한 사이클 동안 보관하는 캐시"""
+
+    def __init__(self, client=None, root: str = None, max_workers: int = 4):
+        self.client = client
+        self.max_workers = max_workers
+        self.root = root or cache_dir("news")
+        os.makedirs(self.root, exist_ok=True)
+        self.quota_path = os.path.join(self.root, "quota.json")
+        self.corpus_path = os.path.join(self.root, "corpus.jsonl")
+        self.queries_path = os.path.join(self.root, "queries.json")
+        self.corpus_days = float(os.getenv("NEWS_CORPUS_DAYS", "90"))
+        self.reuse_seconds = 60 * float(os.getenv("NEWS_REUSE_MINUTES", "0"))
+        self._lock = threading.Lock()
+        self._corpus_lock = threading.Lock()
+        self._pages = {}
+        self._fetched_at = {}
+        self._queries = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """새 사이클을 시작합니다. 호출 집계와 reuse_seconds 보다 오래된 검색 결과를 비웁니다."""
+        with self._lock:
+            if self._pages:
+                write_json(self.queries_path, sorted({self._queries[key] for key, _ in self._pages}))
+            cutoff = time.time() - self.reuse_seconds
+            self._pages = {block: articles for block, articles in self._pages.items()
+                           if self.reuse_seconds > 0 and self._fetched_at[block] >= cutoff}
+            self._fetched_at = {block: self._fetched_at[block] for block in self._pages}
+            self._queries = {key: self._queries[key] for key, _ in self._pages}
+            self._inflight = {}
+            self.requests = 0
+            self.memory_hits = 0
+            self._baseline = self._client().network_calls[NEWS_HOST]
+        self.compact()
+
+    def _client(self):
+        return self.client or get_http_client()
+
+    def _credentials(self) -> dict:
+        load_env()
+        client_id = os.getenv("NAVER_CLIENT_ID")
+        client_secret = os.getenv("NAVER_CLIENT_SECRET")
+        if not client_id or not client_secret:
+            raise ValueError(".env 파일에 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET이 설정되지 않았습니다.")
+        return {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
+
+    def _fetch_block(self, query: str, block: int) -> list[dict]:
+        params = {"query": query, "display": FETCH_SIZE, "start": block * FETCH_SIZE + 1, "sort": "sim"}
+        data = self._client().get_json(NEWS_URL, params=params, headers=self._credentials(), ttl=NEWS_TTL)
+        return [
+            {
+                "title": _clean(item.get("title")),
+                "description": _clean(item.get("description")),
+                "link": item.get("originallink") or item.get("link"),
+                "pub_date": item.get("pubDate"),
+            }
+            for item in data.get("items", [])
+        ]
+
+    def _block(self, key: str, block: int, query: str) -> list[dict]:
+        """한 번의 API 호출로 받는 기사 묶음. 이번 사이클에 이미 받았거나 다른 스레드가 받는 중이면 그 결과를 사용합니다."""
+        with self._lock:
+            self.requests += 1
+            if (key, block) in self._pages:
+                self.memory_hits += 1
+                instrumentation.cache(True)
+                return self._pages[(key, block)]
+            event = self._inflight.get((key, block))
+            owner = event is None
+            if owner:
+                event = self._inflight[(key, block)] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                if (key, block) in self._pages:
+                    self.memory_hits += 1
+                    instrumentation.cache(True)
+                    return self._pages[(key, block)]
+                # 먼저 요청한 스레드가 실패했으면 직접 다시 요청
+                self.requests -= 1
+            return self._block(key, block, query)
+
+        try:
+            articles = self._fetch_block(query, block)
+            with self._lock:
+                self._pages[(key, block)] = articles
+                self._fetched_at[(key, block)] = time.time()
+                self._queries.setdefault(key, query)
+            self._record(articles)
+            return articles
+        finally:
+            with self._lock:
+                self._inflight.pop((key, block), None)
+            event.set()
+
+    def search(self, query: str, pages: int = 1) -> list[dict]:
+        """검색어의 1 ~ pages 페이지(페이지당 PAGE_SIZE 건) 기사를 링크 기준 중복 없이 반환합니다."""
+        key = normalize_query(query)
+        if not key:
+            return []
+        limit = max(1, int(pages)) * PAGE_SIZE
+
+        articles = {}
+        block = 0
+        while len(articles) < limit and block * FETCH_SIZE < MAX_START:
+            fetched = self._block(key, block, query.strip())
+            for article in fetched:
+                articles.setdefault(article["link"], article)
+            if len(fetched) < FETCH_SIZE:
+                break
+            block += 1
+        return list(articles.values())[:limit]
+
+    def search_many(self, queries: list[str], pages: int = 1) -> dict:
+        """여러 검색어를 동시에 검색합니다. {검색어: 기사 목록 또는 예외}"""
+        queries = list(dict.fromkeys(queries))
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(queries))),
+                                thread_name_prefix="news") as pool:
+            futures = {query: pool.submit(contextvars.copy_context().run, self.search, query, pages)
+                       for query in queries}
+            for query, future in futures.items():
+                try:
+                    results[query] = future.result()
+                except Exception as e:
+                    results[query] = e
+        return results
+
+    def prefetch(self, limit: int = 20) -> dict:
+        """직전 사이클에서 쓴 검색어 중 최대 limit 개의 첫 페이지를 미리 받아 둡니다. {검색어: 기사 목록 또는 예외}"""
+        queries = read_json(self.queries_path, [])[:limit]
+        return self.search_many(queries) if queries else {}
+
+    def _record(self, articles: list[dict]) -> None:
+        if not articles:
+            return
+        fetched_at = time.time()
+        lines = "".join(json.dumps({**article, "fetched_at": fetched_at}, ensure_ascii=False) + "\n"
+                        for article in articles)
+        with self._corpus_lock:
+            with open(self.corpus_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def _load_corpus(self, days: float = None) -> list[dict]:
+        cutoff = time.time() - 86400 * (self.corpus_days if days is None else days)
+        articles = {}
+        try:
+            with open(self.corpus_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        for line in lines:
+            try:
+                article = json.loads(line)
+            except json.JSONDecodeError:
+                # 기록 중 중단된 마지막 줄
+                continue
+            if article.get("fetched_at", 0) >= cutoff:
+                articles[article["link"]] = article
+        return list(articles.values())
+
+    def corpus(self, days: float = None) -> list[dict]:
+        """보관 중인 기사를 링크 기준 중복 없이 반환합니다. days 를 지정하면 그 기간 안에 받은 기사만 반환합니다."""
+        with self._corpus_lock:
+            return self._load_corpus(days)
+
+    def compact(self) -> None:
+        """중복 기사와 보관 기간이 지난 기사를 corpus.jsonl 에서 제거합니다."""
+        with self._corpus_lock:
+            if not os.path.exists(self.corpus_path):
+                return
+            articles = self._load_corpus()
+            atomic_write(self.corpus_path, lambda f: f.writelines(
+                json.dumps(article, ensure_ascii=False) + "\n" for article in articles), mode="w")
+
+    @property
+    def api_calls(self) -> int:
+        """이번 사이클에 실제로 네이버 API 로 나간 요청 수 (디스크 캐시 응답 제외)"""
+        return self._client().network_calls[NEWS_HOST] - self._baseline
+
+    def quota_report(self) -> str:
+        """이번 사이클의 호출 수를 오늘 누적 사용량에 더해 기록하고 요약을 반환합니다."""
+        today = datetime.now().strftime("%Y%m%d")
+        with self._lock:
+            calls = self.api_calls
+            usage = read_json(self.quota_path, {})
+            usage = {today: usage.get(today, 0) + calls}
+            write_json(self.quota_path, usage)
+            # 같은 호출을 두 번 더하지 않도록 기준점을 옮김
+            self._baseline += calls
+            requests, hits = self.requests, self.memory_hits
+
+        limit = int(os.getenv("NAVER_NEWS_DAILY_LIMIT", "25000"))
+        return (
+            f"[네이버 뉴스] 이번 사이클 API 호출 {calls}회 (검색 요청 {requests}회 중 메모리 응답 {hits}회), "
+            f"오늘 누적 {usage[today]:,}회 / 한도 {limit:,}회"
+        )
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_news_cache() -> NewsCache:
+    """모든 에이전트가 공유하는 기본 NewsCache 를 반환합니다."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = NewsCache()
+        return _default_cache
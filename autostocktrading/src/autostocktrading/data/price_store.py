@@ -0,0 +1,122 @@
+"""종목별 일봉(OHLCV) 로컬 캐시.
+
+티커마다 Parquet 파일 하나와 '이미 조회한 기간'을 기록한 메타 파일을 두고,
+요청 기간 중 아직 받지 않은 구간만 pykrx 로 추가 조회합니다.
+"""
+import os
+import threading
+
+import pandas as pd
+
+from . import krx
+from .calendar import get_calendar, settled_date, shift_date
+from .storage import cache_dir, atomic_write, read_json, write_json
+
+class PriceStore:
+    """티커 단위로 분할된 증분형 OHLCV 저장소"""
+
+    def __init__(self, root: str = None, calendar=None):
+        self.root = root or cache_dir("ohlcv")
+        self.calendar = calendar
+        os.makedirs(self.root, exist_ok=True)
+        self._frames = {}
+        self._coverage = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _data_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.parquet")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.json")
+
+    def _load(self, ticker: str):
+        if ticker not in self._frames:
+            path = self._data_path(ticker)
+            self._frames[ticker] = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+            self._coverage[ticker] = read_json(self._meta_path(ticker))
+        return self._frames[ticker], self._coverage[ticker]
+
+    def _save(self, ticker: str, frame: pd.DataFrame, coverage: dict) -> None:
+        atomic_write(self._data_path(ticker), lambda f: frame.to_parquet(f))
+        write_json(self._meta_path(ticker), coverage)
+
+    def missing_ranges(self, ticker: str, fromdate: str, todate: str) -> list:
+        """아직 캐시에 없는 (시작일, 종료일) 구간 목록을 반환합니다."""
+        _, coverage = self._load(ticker)
+        if not coverage:
+            return [(fromdate, todate)]
+
+        # 커버리지가 항상 연속 구간으로 유지되도록 기존 구간에 맞닿게 확장합니다.
+        ranges = []
+        if fromdate < coverage["start"]:
+            ranges.append((fromdate, shift_date(coverage["start"], -1)))
+        if todate > coverage["end"]:
+            ranges.append((shift_date(coverage["end"], 1), todate))
+        return ranges
+
+    def get_ohlcv(self, ticker: str, fromdate: str, todate: str) -> pd.DataFrame:
+        """요청 기간의 일봉을 반환합니다. 빠진 구간만 네트워크로 조회합니다."""
+        with self._lock(ticker):
+            frame, coverage = self._load(ticker)
+            ranges = self.missing_ranges(ticker, fromdate, todate)
+
+            if ranges:
+                # 거래일이 없는 구간(주말, 휴장일)은 요청하지 않고, 있는 구간은 첫/마지막 거래일로 좁힘
+                calendar = self.calendar or get_calendar()
+                covered = []
+                for start, end in ranges:
+                    sessions = calendar.sessions(start, end)
+                    if not sessions:
+                        covered.append((start, end))
+                        continue
+                    df = krx.get_market_ohlcv(sessions[0], sessions[-1], ticker)
+                    # 빈 응답은 일시적인 오류일 수 있으므로 커버리지에 넣지 않고 다음 조회 때 다시 요청
+                    if df is None or df.empty:
+                        continue
+                    frame = pd.concat([frame, df]) if not frame.empty else df
+                    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+                    covered.append((start, end))
+
+                # 확정되지 않은 당일 데이터는 다음 조회 때 다시 받도록 커버리지에서 제외
+                settled = settled_date()
+                start, end = (coverage["start"], coverage["end"]) if coverage else (None, None)
+                for range_start, range_end in covered:
+                    range_end = min(range_end, settled)
+                    if range_start > range_end:
+                        continue
+                    # 빠진 구간은 기존 커버리지에 맞닿아 있으므로 합쳐도 연속 구간이 유지됨
+                    start = range_start if start is None else min(start, range_start)
+                    end = range_end if end is None else max(end, range_end)
+                if start is not None and {"start": start, "end": end} != coverage:
+                    coverage = {"start": start, "end": end}
+                    self._save(ticker, frame, coverage)
+
+                self._frames[ticker] = frame
+                self._coverage[ticker] = coverage
+
+        if frame.empty:
+            return frame
+        return frame.loc[pd.Timestamp(fromdate):pd.Timestamp(todate)]
+
+    def get_close(self, ticker: str, fromdate: str, todate: str) -> pd.Series:
+        """요청 기간의 종가 시리즈를 티커 이름으로 반환합니다."""
+        df = self.get_ohlcv(ticker, fromdate, todate)
+        if df.empty:
+            return pd.Series(dtype=float, name=ticker)
+        return df["종가"].rename(ticker)
+
+
+_default_store = None
+
+
+def get_price_store() -> PriceStore:
+    """모든 도구가 공유하는 기본 PriceStore 를 반환합니다."""
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
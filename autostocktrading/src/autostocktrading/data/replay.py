@@ -0,0 +1,324 @@
+"""외부 데이터 기록/재생 계층.
+
+모든 외부 접근(pykrx/KRX, BOK ECOS, FRED, 네이버 검색, 에이전트의 Ollama LLM)은
+AUTOSTOCK_DATA_MODE 에 따라 다음 중 하나로 동작합니다.
+    live    실제 서비스에 요청합니다. (기본)
+    record  실제 서비스에 요청하면서 응답을 픽스처 디렉터리에 기록합니다.
+    replay  픽스처 디렉터리에 기록된 응답만 사용하고 네트워크에 전혀 접속하지 않습니다.
+            기록되지 않은 요청은 FixtureMissing 으로 실패하며, 에이전트는 로컬 LLM 스텁이 응답합니다.
+    AUTOSTOCK_FIXTURE_DIR  픽스처 디렉터리 (기본 fixtures/replay)
+
+record/replay 는 기존 로컬 캐시의 영향을 받지 않도록 실행마다 빈 임시 캐시 디렉터리를 사용합니다.
+replay 는 시계를 기록 시각으로 고정하고 기록 시점의 포트폴리오로 시작하는 임시 원장을 쓰므로,
+같은 픽스처로는 언제 실행해도 같은 요청이 나가고 실제 원장은 바뀌지 않습니다.
+API 키는 픽스처에 남기지 않습니다. (URL 과 파라미터의 키 값은 환경 변수 이름으로 바꿔 저장)
+
+    AUTOSTOCK_DATA_MODE=record python src/main.py --fast   # 한 번 기록
+    AUTOSTOCK_DATA_MODE=replay python src/main.py --fast   # 이후 오프라인으로 반복 실행
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import socket
+import tempfile
+from datetime import datetime
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from . import calendar, krx
+from .http_client import get_http_client
+from .storage import atomic_write, read_json, write_json
+
+MODES = ("live", "record", "replay")
+DEFAULT_FIXTURE_DIR = os.path.join("fixtures", "replay")
+
+# 픽스처에 값 대신 이름으로 기록하는 API 키 환경 변수
+SECRET_ENV = ("BOK_API_KEY", "FRED_API_KEY", "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET")
+
+# 재생 모드에서 외부 전송을 끄는 환경 변수 (crewAI 텔레메트리와 실행 기록 업로드, LiteLLM 모델 가격표 다운로드)
+OFFLINE_ENV = {
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "OTEL_SDK_DISABLED": "true",
+    "CREWAI_TRACING_ENABLED": "false",
+    # 첫 실행 시의 실행 기록 수집과 확인 프롬프트를 건너뜀
+    "CREWAI_TESTING": "true",
+    "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+    # 같은 요청은 항상 같은 결과이므로 속도 제한과 재시도가 필요 없음
+    "KRX_RATE_LIMIT": "0",
+    "KRX_MAX_RETRIES": "0",
+    "HTTP_MAX_RETRIES": "0",
+}
+
+
+class FixtureMissing(LookupError):
+    """재생 모드에서 기록되지 않은 요청"""
+
+
+def data_mode() -> str:
+    mode = os.getenv("AUTOSTOCK_DATA_MODE", "live").strip().lower() or "live"
+    if mode not in MODES:
+        raise ValueError(f"AUTOSTOCK_DATA_MODE 는 {MODES} 중 하나여야 합니다: {mode}")
+    return mode
+
+
+def is_replay() -> bool:
+    return data_mode() == "replay"
+
+
+def redact(text: str) -> str:
+    """text 에 들어 있는 API 키 값을 <환경 변수 이름> 으로 바꿉니다."""
+    for name in SECRET_ENV:
+        value = os.getenv(name)
+        if value:
+            text = text.replace(value, f"<{name}>")
+    return text
+
+
+class FixtureStore:
+    """요청 내용의 해시를 파일 이름으로 응답을 보관하는 픽스처 디렉터리.
+
+    KRX 응답(DataFrame 등)은 pickle, HTTP 와 LLM 응답은 사람이 읽을 수 있는 JSON 으로 저장합니다.
+    """
+
+    PICKLED = {"krx"}
+
+    def __init__(self, root: str = None):
+        self.root = root or os.getenv("AUTOSTOCK_FIXTURE_DIR", DEFAULT_FIXTURE_DIR)
+
+    @staticmethod
+    def key(request) -> str:
+        payload = json.dumps(request, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, kind: str, request) -> str:
+        extension = "pkl" if kind in self.PICKLED else "json"
+        return os.path.join(self.root, kind, f"{self.key(request)}.{extension}")
+
+    def write(self, kind: str, request, value) -> None:
+        path = self._path(kind, request)
+        if kind in self.PICKLED:
+            atomic_write(path, lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            write_json(path, {"request": request, "response": value})
+
+    def read(self, kind: str, request):
+        """기록된 응답. 없으면 FixtureMissing 을 발생시킵니다."""
+        path = self._path(kind, request)
+        try:
+            if kind in self.PICKLED:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            raise FixtureMissing(f"기록되지 않은 {kind} 요청입니다: {request}") from None
+
+    def has(self, kind: str, request) -> bool:
+        return os.path.exists(self._path(kind, request))
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, "manifest.json")
+
+    @property
+    def portfolio_path(self) -> str:
+        return os.path.join(self.root, "portfolio.json")
+
+    def manifest(self) -> dict:
+        manifest = read_json(self.manifest_path)
+        if manifest is None:
+            raise FixtureMissing(f"{self.root} 에 기록된 픽스처가 없습니다. AUTOSTOCK_DATA_MODE=record 로 먼저 기록하세요.")
+        return manifest
+
+
+def _krx_request(name: str, args, kwargs) -> dict:
+    return {"function": name, "args": list(args), "kwargs": kwargs}
+
+
+class RecordingKrx:
+    """실제 pykrx 백엔드를 호출하고 응답을 픽스처로 기록하는 KRX 백엔드"""
+
+    def __init__(self, inner, store: FixtureStore):
+        self.inner = inner
+        self.store = store
+
+    def __getattr__(self, name: str):
+        function = getattr(self.inner, name)
+
+        def call(*args, **kwargs):
+            value = function(*args, **kwargs)
+            self.store.write("krx", _krx_request(name, args, kwargs), value)
+            return value
+        return call
+
+
+class ReplayKrx:
+    """기록된 응답만 돌려주는 KRX 백엔드"""
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.store.read("krx", _krx_request(name, args, kwargs))
+        return call
+
+
+def _http_request(request) -> dict:
+    return {"method": request.method, "url": redact(request.url)}
+
+
+def _response(request, status: int, body: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode("utf-8")
+    response.headers["Content-Type"] = "application/json; charset=utf-8"
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class RecordingTransport(BaseAdapter):
+    """실제로 요청을 보내고 응답 본문을 픽스처로 기록하는 requests 어댑터"""
+
+    def __init__(self, store: FixtureStore, inner: BaseAdapter = None):
+        super().__init__()
+        self.store = store
+        self.inner = inner or HTTPAdapter(pool_connections=8, pool_maxsize=16)
+
+    def send(self, request, **kwargs) -> requests.Response:
+        response = self.inner.send(request, **kwargs)
+        # 응답 본문에 API 키가 되돌아오는 경우에 대비해 본문도 가림
+        self.store.write("http", _http_request(request),
+                         {"status": response.status_code, "body": redact(response.text)})
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayTransport(BaseAdapter):
+    """기록된 응답만 돌려주는 requests 어댑터. 기록되지 않은 요청은 FixtureMissing 으로 실패합니다."""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs) -> requests.Response:
+        recorded = self.store.read("http", _http_request(request))
+        return _response(request, recorded["status"], recorded["body"])
+
+    def close(self) -> None:
+        pass
+
+
+# activate() 가 바꾼 상태 (deactivate() 에서 되돌림)
+_store = None
+_scratch = None
+_saved_env = {}
+_saved_connect = None
+
+
+def recording_store():
+    """기록 모드가 활성화되어 있으면 그 FixtureStore, 아니면 None"""
+    return _store if _store is not None and data_mode() == "record" else None
+
+
+def replay_store():
+    """재생 모드가 활성화되어 있으면 그 FixtureStore, 아니면 None"""
+    return _store if _store is not None and data_mode() == "replay" else None
+
+
+def _setenv(name: str, value: str, override: bool = True) -> None:
+    if name not in _saved_env:
+        _saved_env[name] = os.environ.get(name)
+    if override or not os.environ.get(name):
+        os.environ[name] = value
+
+
+def _block_network() -> None:
+    """루프백과 유닉스 소켓을 제외한 모든 소켓 연결을 막습니다."""
+    global _saved_connect
+    if _saved_connect is not None:
+        return
+    _saved_connect = socket.socket.connect
+
+    def connect(sock, address):
+        host = address[0] if isinstance(address, tuple) else None
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and host not in ("127.0.0.1", "::1", "localhost"):
+            raise FixtureMissing(f"재생 모드에서는 네트워크에 접속할 수 없습니다: {address}")
+        return _saved_connect(sock, address)
+
+    socket.socket.connect = connect
+
+
+def activate(mode: str = None, fixture_dir: str = None):
+    """AUTOSTOCK_DATA_MODE(또는 mode)에 맞게 KRX 백엔드, HTTP 전송, 시계, 캐시 위치를 바꿉니다.
+
+    데이터 저장소와 도구를 만들기 전에, 프로세스 시작 시 한 번 호출합니다. live 이면 아무것도 바꾸지 않습니다.
+    """
+    global _store, _scratch
+    if mode is not None:
+        _setenv("AUTOSTOCK_DATA_MODE", mode)
+    mode = data_mode()
+    if mode == "live":
+        return None
+
+    store = FixtureStore(fixture_dir)
+    recorded_at = datetime.fromisoformat(store.manifest()["recorded_at"]) if mode == "replay" else None
+    os.makedirs(store.root, exist_ok=True)
+    _store = store
+    _scratch = tempfile.mkdtemp(prefix=f"autostock-{mode}-")
+
+    if mode == "record":
+        # 기록 시작 시점의 포트폴리오를 재생의 초기 원장으로 사용
+        from .ledger import get_ledger
+        write_json(_store.portfolio_path, get_ledger().snapshot())
+        write_json(_store.manifest_path, {"recorded_at": calendar.current_time().isoformat(timespec="seconds")})
+        _setenv("AUTOSTOCK_CACHE_DIR", os.path.join(_scratch, "cache"))
+        krx.use_backend(RecordingKrx(krx.backend(), _store))
+        get_http_client().mount(RecordingTransport(_store))
+    else:
+        calendar.freeze_clock(recorded_at)
+        _setenv("AUTOSTOCK_CACHE_DIR", os.path.join(_scratch, "cache"))
+        _setenv("PORTFOLIO_DB", os.path.join(_scratch, "portfolio.db"))
+        _setenv("PORTFOLIO_JSON", _store.portfolio_path)
+        for name, value in OFFLINE_ENV.items():
+            _setenv(name, value)
+        # 키가 없는 환경에서도 도구가 키 확인을 통과하도록 자리표시 값을 넣음 (요청 키에서는 이름으로 가려짐)
+        for name in SECRET_ENV:
+            _setenv(name, f"replay-{name}", override=False)
+        krx.use_backend(ReplayKrx(_store))
+        get_http_client().mount(ReplayTransport(_store))
+        _block_network()
+        print(f"[재생 모드] {_store.root} 의 {recorded_at:%Y-%m-%d %H:%M} 기록으로 오프라인 실행합니다.")
+    return _store
+
+
+def deactivate() -> None:
+    """activate() 가 바꾼 환경 변수, KRX 백엔드, 시계, 소켓 연결을 되돌리고 임시 캐시를 지웁니다."""
+    global _store, _scratch, _saved_connect
+    from . import http_client
+    for name, value in _saved_env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    _saved_env.clear()
+    if _saved_connect is not None:
+        socket.socket.connect = _saved_connect
+        _saved_connect = None
+    calendar.freeze_clock(None)
+    krx.use_backend(None)
+    http_client._default_client = None
+    _store = None
+    if _scratch:
+        shutil.rmtree(_scratch, ignore_errors=True)
+        _scratch = None
@@ -0,0 +1,200 @@
+"""업종 / 지수 구성종목 색인.
+
+KRX 업종분류현황(시장별 한 번의 호출)으로 종목 → (종목명, 시장, 업종, 시가총액)을,
+KOSPI / KOSDAQ / KRX 지수의 구성종목(PDF)으로 종목 → 소속 지수를 만들고,
+업종 → 종목, 지수 → 종목 역색인과 함께 거래일별 JSON 으로 저장합니다.
+종가가 확정된 거래일마다 한 번만 새로 만들며, 이후의 조회는 메모리의 딕셔너리에서 바로 처리합니다.
+일부 지수 조회가 실패해 불완전한 색인은 저장하지 않고 메모리에서만 쓰다가 PARTIAL_RETRY_SECONDS 뒤에 다시 만듭니다.
+config/sector_themes.yaml 의 테마(반도체, 2차전지 등)는 여러 업종/지수를 묶어 한 번에 조회합니다.
+    SECTOR_INDEX_MARKETS  구성종목을 수집할 지수 시장 (쉼표 구분, 기본 KOSPI,KOSDAQ,KRX)
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+
+import pandas as pd
+import yaml
+
+from . import krx
+from .calendar import get_calendar
+from .fetcher import get_fetch_executor
+from .snapshot_store import SNAPSHOT_MARKETS
+from .storage import cache_dir, read_json, write_json
+
+THEMES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "sector_themes.yaml")
+
+# 불완전한 색인을 다시 만들기까지의 시간(초)
+PARTIAL_RETRY_SECONDS = 300
+
+_SEPARATORS = re.compile(r"[\s·ㆍ・./\-_]+")
+
+
+def normalize_name(name: str) -> str:
+    """업종/지수/테마 이름 비교용 키 (공백, 가운뎃점, 대소문자 차이 무시)"""
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", str(name))).lower()
+
+
+def load_themes(path: str = None) -> dict:
+    with open(path or THEMES_PATH, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+class SectorIndex:
+    """업종 → 종목, 지수 → 종목, 종목 → (종목명, 시장, 업종, 소속 지수) 색인"""
+
+    def __init__(self, root: str = None, themes_path: str = None):
+        self.root = root or cache_dir("sectors")
+        os.makedirs(self.root, exist_ok=True)
+        self.themes = load_themes(themes_path)
+        self.index_markets = [m.strip() for m in os.getenv("SECTOR_INDEX_MARKETS", "KOSPI,KOSDAQ,KRX").split(",")
+                              if m.strip()]
+        self.date = None
+        self.complete = True
+        self._retry_at = 0.0
+        self.tickers = {}
+        self.sectors = {}
+        self.indices = {}
+        self._theme_keys = {}
+        self._sector_keys = {}
+        self._index_keys = {}
+        self._lock = threading.Lock()
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.root, f"{date}.json")
+
+    def _build(self, date: str) -> dict:
+        tickers = {}
+        for market in SNAPSHOT_MARKETS:
+            classes = krx.get_market_sector_classifications(date, market)
+            if classes is None or classes.empty:
+                continue
+            for ticker, row in classes.iterrows():
+                tickers[str(ticker)] = {
+                    "name": row.get("종목명"),
+                    "market": market,
+                    "sector": row.get("업종명"),
+                    "market_cap": float(row.get("시가총액", 0) or 0),
+                    "indices": [],
+                }
+
+        # 지수별 구성종목 (지수 수가 많으므로 동시에 조회)
+        codes = []
+        complete = True
+        for market in self.index_markets:
+            try:
+                codes += list(krx.get_index_ticker_list(date, market=market))
+            except Exception as e:
+                complete = False
+                print(f"{market} 지수 목록을 가져오지 못했습니다: {e}")
+
+        fetched = get_fetch_executor().map(
+            lambda code: (krx.get_index_ticker_name(code), list(krx.get_index_portfolio_deposit_file(code, date))),
+            codes
+        )
+        print(fetched.summary("업종/지수 색인", unit="개 지수"))
+
+        indices = {}
+        for _, (name, members) in fetched.ordered():
+            members = [str(ticker) for ticker in members]
+            indices[name] = members
+            for ticker in members:
+                if ticker in tickers:
+                    tickers[ticker]["indices"].append(name)
+
+        sectors = {}
+        for ticker, info in sorted(tickers.items(), key=lambda item: -item[1]["market_cap"]):
+            if info["sector"]:
+                sectors.setdefault(info["sector"], []).append(ticker)
+        complete = complete and not fetched.errors and bool(tickers)
+        return {"date": date, "tickers": tickers, "sectors": sectors, "indices": indices, "complete": complete}
+
+    def _activate(self, data: dict) -> None:
+        self.date = data["date"]
+        self.tickers = data["tickers"]
+        self.sectors = data["sectors"]
+        self.indices = data["indices"]
+        self._sector_keys = {normalize_name(name): name for name in self.sectors}
+        self._index_keys = {normalize_name(name): name for name in self.indices}
+        self._theme_keys = {}
+        for theme, spec in self.themes.items():
+            for alias in [theme, *((spec or {}).get("aliases") or [])]:
+                self._theme_keys.setdefault(normalize_name(alias), theme)
+
+    def load(self, date: str = None) -> "SectorIndex":
+        """지정한 거래일(기본: 종가가 확정된 최근 거래일)의 색인을 메모리에 올립니다. 없으면 새로 만듭니다."""
+        date = date or get_calendar().last_trading_day(settled=True)
+        with self._lock:
+            if self.date == date and (self.complete or time.time() < self._retry_at):
+                return self
+            data = read_json(self._path(date))
+            if data is None:
+                data = self._build(date)
+                if data.pop("complete"):
+                    write_json(self._path(date), data)
+                else:
+                    print(f"{date} 업종/지수 색인이 불완전해 저장하지 않고 {PARTIAL_RETRY_SECONDS}초 뒤에 다시 만듭니다.")
+                    self._activate(data)
+                    self.complete, self._retry_at = False, time.time() + PARTIAL_RETRY_SECONDS
+                    return self
+            self._activate(data)
+            self.complete = True
+        return self
+
+    def info(self, ticker: str):
+        """종목의 종목명, 시장, 업종, 시가총액, 소속 지수. 없으면 None 입니다."""
+        return self.load().tickers.get(ticker)
+
+    def sector_of(self, tickers=None) -> pd.Series:
+        """티커 → 업종 Series (FactorEngine 의 업종 중립 정규화용)"""
+        self.load()
+        tickers = self.tickers if tickers is None else tickers
+        return pd.Series({t: self.tickers[t]["sector"] for t in tickers if t in self.tickers}, dtype=object)
+
+    def resolve(self, name: str) -> dict:
+        """테마/업종/지수 이름을 {'theme', 'sectors', 'indices'} 로 해석합니다. 찾지 못하면 빈 목록입니다."""
+        self.load()
+        key = normalize_name(name)
+        theme = self._theme_keys.get(key)
+        if theme is not None:
+            spec = self.themes[theme] or {}
+            sectors = [self._sector_keys[k] for k in map(normalize_name, spec.get("sectors") or [])
+                       if k in self._sector_keys]
+            indices = [self._index_keys[k] for k in map(normalize_name, spec.get("indices") or [])
+                       if k in self._index_keys]
+            return {"theme": theme, "sectors": list(dict.fromkeys(sectors)), "indices": list(dict.fromkeys(indices))}
+
+        return {
+            "theme": None,
+            "sectors": [self._sector_keys[key]] if key in self._sector_keys else [],
+            "indices": [self._index_keys[key]] if key in self._index_keys else [],
+        }
+
+    def members(self, name: str, market: str = None) -> list[str]:
+        """테마/업종/지수에 속한 종목을 시가총액 내림차순으로 반환합니다. market 을 지정하면 그 시장 종목만 반환합니다."""
+        resolved = self.resolve(name)
+        tickers = set()
+        for sector in resolved["sectors"]:
+            tickers.update(self.sectors[sector])
+        for index_name in resolved["indices"]:
+            tickers.update(t for t in self.indices[index_name] if t in self.tickers)
+        if market:
+            tickers = {t for t in tickers if self.tickers[t]["market"] == market}
+        return sorted(tickers, key=lambda t: -self.tickers[t]["market_cap"])
+
+    def available(self) -> dict:
+        """조회할 수 있는 테마, 업종, 지수 이름"""
+        self.load()
+        return {"themes": list(self.themes), "sectors": list(self.sectors), "indices": list(self.indices)}
+
+
+_default_index = None
+
+
+def get_sector_index() -> SectorIndex:
+    """모든 도구가 공유하는 기본 SectorIndex 를 반환합니다."""
+    global _default_index
+    if _default_index is None:
+        _default_index = SectorIndex()
+    return _default_index
@@ -0,0 +1,117 @@
+"""시장 전체 일별 스냅샷 저장소.
+
+하루치 KOSPI/KOSDAQ 전 종목의 시세, 시가총액, 펀더멘탈(PER/PBR/EPS/BPS/DIV/DPS)을
+시장별 한 번의 호출로 받아 Parquet 으로 저장하고, 종목 조회는 메모리 인덱스에서 처리합니다.
+"""
+import os
+import threading
+
+import pandas as pd
+
+from . import krx
+from .calendar import get_calendar, settled_date
+from .storage import cache_dir, atomic_write
+
+SNAPSHOT_MARKETS = ("KOSPI", "KOSDAQ")
+FUNDAMENTAL_COLUMNS = ["BPS", "PER", "PBR", "EPS", "DIV", "DPS"]
+
+
+class MarketSnapshotStore:
+    """날짜별 전 종목 스냅샷을 디스크와 메모리에 보관하는 저장소"""
+
+    def __init__(self, root: str = None):
+        self.root = root or cache_dir("snapshots")
+        os.makedirs(self.root, exist_ok=True)
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.root, f"{date}.parquet")
+
+    def _fetch(self, date: str) -> pd.DataFrame:
+        frames = []
+        for market in SNAPSHOT_MARKETS:
+            ohlcv = krx.get_market_ohlcv(date, market=market)
+            if ohlcv is None or ohlcv.empty:
+                continue
+            cap = krx.get_market_cap(date, market=market)[["시가총액", "상장주식수"]]
+            fundamental = krx.get_market_fundamental(date, market=market)
+
+            df = ohlcv.join(cap, how="left").join(fundamental[FUNDAMENTAL_COLUMNS], how="left")
+            df.insert(0, "market", market)
+            frames.append(df)
+
+        if not frames:
+            return pd.DataFrame()
+
+        snapshot = pd.concat(frames)
+        snapshot.index = snapshot.index.astype(str)
+        snapshot.index.name = "티커"
+        return snapshot
+
+    def load(self, date: str) -> pd.DataFrame:
+        """지정한 거래일의 스냅샷을 반환합니다."""
+        with self._lock:
+            if date in self._snapshots:
+                return self._snapshots[date]
+
+            path = self._path(date)
+            if os.path.exists(path):
+                snapshot = pd.read_parquet(path)
+            else:
+                snapshot = self._fetch_and_store(date)
+
+            self._snapshots[date] = snapshot
+            return snapshot
+
+    def _fetch_and_store(self, date: str) -> pd.DataFrame:
+        snapshot = self._fetch(date)
+        # 장 마감 전 데이터는 바뀔 수 있으므로 확정된 날짜만 디스크에 기록
+        if date <= settled_date() and not snapshot.empty:
+            atomic_write(self._path(date), lambda f: snapshot.to_parquet(f))
+        return snapshot
+
+    def load_columns(self, date: str, columns: list[str]) -> pd.DataFrame:
+        """지정한 거래일 스냅샷의 일부 컬럼만 읽습니다.
+        메모리에 보관하지 않으므로 수년치 스냅샷을 훑는 백테스트 데이터 적재에 사용합니다."""
+        with self._lock:
+            if date in self._snapshots:
+                snapshot = self._snapshots[date]
+                return snapshot[columns] if not snapshot.empty else snapshot
+        path = self._path(date)
+        if os.path.exists(path):
+            return pd.read_parquet(path, columns=columns)
+        snapshot = self._fetch_and_store(date)
+        return snapshot[columns] if not snapshot.empty else snapshot
+
+    def latest(self, asof: str = None):
+        """asof 이전의 가장 최근 거래일(기본: 종가가 확정된 최근 거래일)의 (날짜, 스냅샷)을 반환합니다."""
+        date = get_calendar().last_trading_day(asof, settled=True)
+        if date is None:
+            return None, pd.DataFrame()
+        return date, self.load(date)
+
+    def lookup(self, ticker: str, date: str = None):
+        """한 종목의 스냅샷 행을 딕셔너리로 반환합니다. 없으면 None 입니다."""
+        _, snapshot = self.latest(date)
+        if ticker not in snapshot.index:
+            return None
+        return snapshot.loc[ticker].to_dict()
+
+    def lookup_many(self, tickers: list[str], date: str = None) -> pd.DataFrame:
+        """여러 종목의 스냅샷을 요청 순서대로 반환합니다. 없는 종목은 제외됩니다."""
+        _, snapshot = self.latest(date)
+        if snapshot.empty:
+            return snapshot
+        return snapshot.loc[pd.Index(tickers).intersection(snapshot.index, sort=False)]
+
+
+_default_store = None
+
+
+def get_snapshot_store() -> MarketSnapshotStore:
+    """모든 도구가 공유하는 기본 MarketSnapshotStore 를 반환합니다."""
+    global _default_store
+    if _default_store is None:
+        _default_store = MarketSnapshotStore()
+    return _default_store
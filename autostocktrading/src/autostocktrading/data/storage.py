@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+
+# 모든 로컬 캐시가 저장되는 최상위 디렉터리 (.env 의 AUTOSTOCK_CACHE_DIR 로 변경 가능)
+DEFAULT_CACHE_DIR = ".cache"
+
+
+def cache_dir(*parts: str) -> str:
+    """캐시 디렉터리 아래의 하위 디렉터리를 만들고 그 경로를 반환합니다."""
+    path = os.path.join(os.getenv("AUTOSTOCK_CACHE_DIR", DEFAULT_CACHE_DIR), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(*parts: str) -> str:
+    """캐시 디렉터리 아래의 경로를 만들고, 상위 디렉터리가 없으면 생성합니다."""
+    root = os.getenv("AUTOSTOCK_CACHE_DIR", DEFAULT_CACHE_DIR)
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return path
+
+
+def atomic_write(path: str, write_fn, mode: str = "wb") -> None:
+    """임시 파일에 먼저 쓴 뒤 교체하여, 중단되더라도 깨진 파일이 남지 않도록 합니다."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        encoding = None if "b" in mode else "utf-8"
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            write_fn(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path: str, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def write_json(path: str, data) -> None:
+    atomic_write(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2), mode="w")
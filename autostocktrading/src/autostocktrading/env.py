@@ -0,0 +1,22 @@
+"""`.env` 파일 로드.
+
+API 키(BOK_API_KEY, FRED_API_KEY, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET)와 캐시 위치 같은 설정은 `.env` 에서 읽습니다.
+모듈을 불러올 때가 아니라 진입점(main.py, 크루 생성)과 키를 읽는 곳에서 처음 필요할 때 한 번만 읽으며,
+이미 설정된 환경 변수는 덮어쓰지 않습니다.
+"""
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """`.env` 를 한 번만 읽어 환경 변수로 설정합니다."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
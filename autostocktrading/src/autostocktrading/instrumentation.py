@@ -0,0 +1,325 @@
+"""사이클 계측 (태스크, 에이전트, 도구 호출별 시간과 자원 사용량).
+
+한 사이클 안에서 다음 구간(span)을 열고 닫으며 각 구간의 지표를 모읍니다.
+    task   crewAI 태스크 (이벤트 버스의 태스크 시작/종료 이벤트로 기록, 에이전트별 집계의 기준)
+    tool   CompactOutputTool._run 호출 한 번
+    stage  정량 파이프라인(--fast)의 단계
+구간마다 벽시계 시간, LLM 시간과 도구 시간, 입력/출력 토큰(추정), 외부 요청 수와 응답 바이트,
+캐시 적중/미적중을 기록하며, 안쪽 구간의 지표는 바깥 구간(도구 → 태스크 → 사이클)에도 더해집니다.
+닫힌 구간은 JSONL 트레이스에 한 줄씩 추가되고, 사이클이 끝나면 Prometheus textfile 을 갱신하고
+summary() 로 어느 단계가 사이클 시간을 차지하는지 표로 보여줍니다.
+    INSTRUMENTATION  0 이면 계측하지 않음 (기본 1)
+    TRACE_DIR        트레이스(trace-YYYYMMDD.jsonl)와 autostocktrading.prom 저장 위치 (기본 <캐시>/traces)
+
+KRX 요청은 pykrx 가 직접 보내므로 요청 수만 세고, 바이트는 HttpClient 를 거치는 요청(ECOS, FRED, 네이버)만 셉니다.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from .data.storage import atomic_write, cache_dir
+
+METRICS = ("llm_s", "tool_s", "llm_calls", "tool_calls", "tokens_in", "tokens_out",
+           "requests", "bytes", "cache_hits", "cache_misses")
+
+PROM_FILE = "autostocktrading.prom"
+
+# Prometheus 지표 이름 → (구간 값, 설명)
+PROM_METRICS = {
+    "span_seconds": ("wall_s", "구간 벽시계 시간(초)"),
+    "llm_seconds": ("llm_s", "LLM 호출 시간(초)"),
+    "tool_seconds": ("tool_s", "도구 실행 시간(초)"),
+    "llm_calls": ("llm_calls", "LLM 호출 수"),
+    "tool_calls": ("tool_calls", "도구 호출 수"),
+    "tokens_in": ("tokens_in", "LLM 입력 토큰(추정)"),
+    "tokens_out": ("tokens_out", "LLM 출력 토큰(추정)"),
+    "external_requests": ("requests", "외부 요청 수 (KRX, HTTP)"),
+    "external_bytes": ("bytes", "HTTP 응답 바이트"),
+    "cache_hits": ("cache_hits", "캐시 적중 수"),
+    "cache_misses": ("cache_misses", "캐시 미적중 수"),
+}
+
+
+class Span:
+    """계측 구간 하나. 종류(kind)와 이름, 소속 에이전트/태스크, 누적 지표를 담습니다."""
+
+    def __init__(self, kind: str, name: str, agent: str = None, task: str = None):
+        self.kind = kind
+        self.name = name
+        self.agent = agent
+        self.task = task
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.wall_s = 0.0
+        self.metrics = dict.fromkeys(METRICS, 0)
+        self.error = None
+
+    def close(self, error: str = None) -> None:
+        self.wall_s = time.perf_counter() - self._started
+        self.error = error
+
+    def record(self) -> dict:
+        record = {
+            "kind": self.kind, "name": self.name, "agent": self.agent, "task": self.task,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "wall_s": round(self.wall_s, 4),
+        }
+        record.update({k: round(v, 4) if isinstance(v, float) else v for k, v in self.metrics.items()})
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+# 현재 실행 흐름에서 열려 있는 구간 (바깥 → 안쪽). 스레드 풀로 넘길 때는 contextvars 를 복사해 전달
+_spans = contextvars.ContextVar("autostock_spans", default=())
+
+
+class CycleTrace:
+    """한 사이클의 구간 기록. 닫힌 구간을 JSONL 로 남기고 사이클 종료 시 Prometheus textfile 을 씁니다."""
+
+    def __init__(self, name: str = "cycle", trace_dir: str = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.trace_dir = trace_dir or os.getenv("TRACE_DIR") or cache_dir("traces")
+        os.makedirs(self.trace_dir, exist_ok=True)
+        self.root = Span("cycle", name)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @property
+    def trace_path(self) -> str:
+        return os.path.join(self.trace_dir, f"trace-{datetime.fromtimestamp(self.root.started_at):%Y%m%d}.jsonl")
+
+    @property
+    def prom_path(self) -> str:
+        return os.path.join(self.trace_dir, PROM_FILE)
+
+    def add(self, spans: tuple, metrics: dict) -> None:
+        with self._lock:
+            for span in (self.root,) + spans:
+                for key, value in metrics.items():
+                    span.metrics[key] += value
+
+    def close(self, span: Span, error: str = None) -> None:
+        span.close(error)
+        record = dict(span.record(), cycle=self.id)
+        with self._lock:
+            self.spans.append(span)
+            with open(self.trace_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def finish(self, error: str = None) -> None:
+        self.close(self.root, error)
+        self.write_prometheus()
+
+    def frame(self, kind: str = None) -> pd.DataFrame:
+        """닫힌 구간의 기록 (kind 를 지정하면 해당 종류만)"""
+        with self._lock:
+            records = [span.record() for span in self.spans if kind is None or span.kind == kind]
+        columns = ["kind", "name", "agent", "task", "started_at", "wall_s", *METRICS]
+        return pd.DataFrame(records, columns=columns + (["error"] if any("error" in r for r in records) else []))
+
+    def breakdown(self, by: str = "task") -> pd.DataFrame:
+        """task / agent / tool / stage 별 합계. 에이전트별 합계는 그 에이전트가 수행한 태스크 구간의 합입니다."""
+        kind, key = ("task", "agent") if by == "agent" else (by, "name")
+        frame = self.frame(kind)
+        if frame.empty:
+            return pd.DataFrame()
+        frame["calls"] = 1
+        grouped = frame.groupby(frame[key].fillna("-"), sort=False)[["calls", "wall_s", *METRICS]].sum()
+        return grouped.sort_values("wall_s", ascending=False)
+
+    def write_prometheus(self) -> None:
+        """마지막 사이클의 구간별 지표를 node_exporter textfile 수집기 형식으로 씁니다."""
+        lines = []
+        for metric, (field, description) in PROM_METRICS.items():
+            name = f"autostocktrading_{metric}"
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+            for by in ("task", "agent", "tool", "stage"):
+                breakdown = self.breakdown(by)
+                for label, row in breakdown.iterrows():
+                    lines.append(f'{name}{{kind="{by}",name="{_escape(label)}"}} {float(row[field]):g}')
+            root = self.root.wall_s if field == "wall_s" else self.root.metrics[field]
+            lines.append(f'{name}{{kind="cycle",name="{_escape(self.name)}"}} {float(root):g}')
+        lines += ["# HELP autostocktrading_cycle_timestamp_seconds 마지막 사이클 시작 시각",
+                  "# TYPE autostocktrading_cycle_timestamp_seconds gauge",
+                  f'autostocktrading_cycle_timestamp_seconds{{name="{_escape(self.name)}"}} {self.root.started_at:.0f}']
+        atomic_write(self.prom_path, lambda f: f.write("\n".join(lines) + "\n"), mode="w")
+
+    def summary(self) -> str:
+        """사이클 합계와 태스크/에이전트/도구/단계별 표"""
+        total = self.root.metrics
+        hits, misses = total["cache_hits"], total["cache_misses"]
+        lines = [
+            f"[계측] {self.name} 총 {self.root.wall_s:.2f}초 (LLM {total['llm_s']:.2f}초 {total['llm_calls']}회, "
+            f"도구 {total['tool_s']:.2f}초 {total['tool_calls']}회), 토큰 입력 {total['tokens_in']:,} / "
+            f"출력 {total['tokens_out']:,} (추정), 외부 요청 {total['requests']:,}회 {total['bytes'] / 1024:,.1f}KB, "
+            f"캐시 적중 {hits}/{hits + misses}",
+        ]
+        labels = {"task": "태스크", "agent": "에이전트", "tool": "도구", "stage": "단계"}
+        for by, label in labels.items():
+            breakdown = self.breakdown(by)
+            if breakdown.empty:
+                continue
+            table = breakdown[["calls", "wall_s", "llm_s", "tool_s", "tokens_in", "tokens_out", "requests",
+                               "bytes", "cache_hits"]].copy()
+            table["share"] = table["wall_s"] / max(self.root.wall_s, 1e-9) * 100
+            table["bytes"] = table["bytes"] / 1024
+            table.columns = ["호출", "시간(초)", "LLM(초)", "도구(초)", "입력 토큰", "출력 토큰", "요청", "KB",
+                             "캐시 적중", "비중(%)"]
+            table.index.name = label
+            lines.append(f"  [{label}별]")
+            lines.append(table.round(2).to_string())
+        lines.append(f"  트레이스: {self.trace_path}")
+        return "\n".join(lines)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_cycle = None
+_llm_started = {}
+_installed = False
+_install_lock = threading.Lock()
+
+
+def current_cycle():
+    return _cycle
+
+
+def start_cycle(name: str = "cycle", trace_dir: str = None):
+    """새 사이클 계측을 시작합니다. INSTRUMENTATION=0 이면 None 을 반환하고 아무것도 기록하지 않습니다."""
+    global _cycle
+    if os.getenv("INSTRUMENTATION", "1") == "0":
+        _cycle = None
+        return None
+    install()
+    _cycle = CycleTrace(name, trace_dir)
+    return _cycle
+
+
+def finish_cycle(error: str = None):
+    """사이클 계측을 끝내고 Prometheus textfile 을 갱신한 뒤 그 CycleTrace 를 반환합니다."""
+    global _cycle
+    cycle, _cycle = _cycle, None
+    if cycle is not None:
+        cycle.finish(error)
+    return cycle
+
+
+def add(**metrics) -> None:
+    """현재 열려 있는 모든 구간과 사이클 합계에 지표를 더합니다. 계측 중이 아니면 무시합니다."""
+    cycle = _cycle
+    if cycle is not None:
+        cycle.add(_spans.get(), metrics)
+
+
+def cache(hit: bool) -> None:
+    add(**{"cache_hits" if hit else "cache_misses": 1})
+
+
+def _open(kind: str, name: str, agent: str = None, task: str = None):
+    parents = _spans.get()
+    parent = parents[-1] if parents else None
+    if kind == "task":
+        task = task or name
+    span = Span(kind, name,
+                agent=agent or (parent.agent if parent else None),
+                task=task or (parent.task if parent else None))
+    return span, _spans.set(parents + (span,))
+
+
+@contextlib.contextmanager
+def span(kind: str, name: str, agent: str = None, task: str = None):
+    """kind/name 구간을 엽니다. 도구 구간은 닫힐 때 바깥 구간의 도구 시간과 호출 수에 더해집니다."""
+    cycle = _cycle
+    if cycle is None:
+        yield None
+        return
+    opened, token = _open(kind, name, agent, task)
+    error = None
+    try:
+        yield opened
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        _spans.reset(token)
+        cycle.close(opened, error)
+        if kind == "tool":
+            cycle.add(_spans.get(), {"tool_s": opened.wall_s, "tool_calls": 1})
+
+
+# crewAI 이벤트 버스 처리기 (태스크와 LLM 호출은 crewAI 내부에서 실행되므로 이벤트로 계측)
+
+_task_spans = {}
+
+
+def _on_task_started(source, event) -> None:
+    task = event.task
+    if _cycle is None or task is None:
+        return
+    agent = getattr(getattr(task, "agent", None), "role", None)
+    name = task.name or (task.description or "")[:40]
+    _task_spans[id(task)] = _open("task", name, agent=agent, task=name)
+
+
+def _on_task_finished(source, event) -> None:
+    opened = _task_spans.pop(id(event.task), None)
+    if opened is None or _cycle is None:
+        return
+    task_span, token = opened
+    try:
+        _spans.reset(token)
+    except ValueError:
+        # 다른 컨텍스트에서 끝난 경우 (정상적인 crewAI 실행에서는 같은 스레드)
+        pass
+    _cycle.close(task_span, getattr(event, "error", None))
+
+
+def _tokens(content) -> int:
+    from .tools.output import estimate_tokens
+    if content is None:
+        return 0
+    return estimate_tokens(content if isinstance(content, str) else json.dumps(content, ensure_ascii=False, default=str))
+
+
+def llm_call(messages, response, seconds: float) -> None:
+    """LLM 호출 한 번의 시간과 입력/출력 토큰(추정)을 현재 구간에 더합니다."""
+    add(llm_s=seconds, llm_calls=1, tokens_in=_tokens(messages), tokens_out=_tokens(response))
+
+
+def _on_llm_started(source, event) -> None:
+    if _cycle is not None:
+        _llm_started[threading.get_ident()] = (time.perf_counter(), event.messages)
+
+
+def _on_llm_finished(source, event) -> None:
+    started = _llm_started.pop(threading.get_ident(), None)
+    if started is not None:
+        llm_call(started[1], getattr(event, "response", None), time.perf_counter() - started[0])
+
+
+def install() -> None:
+    """crewAI 이벤트 버스에 태스크와 LLM 호출 처리기를 한 번만 등록합니다."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from crewai.events import (crewai_event_bus, LLMCallCompletedEvent, LLMCallFailedEvent,
+                                   LLMCallStartedEvent, TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent)
+        crewai_event_bus.register_handler(TaskStartedEvent, _on_task_started)
+        crewai_event_bus.register_handler(TaskCompletedEvent, _on_task_finished)
+        crewai_event_bus.register_handler(TaskFailedEvent, _on_task_finished)
+        crewai_event_bus.register_handler(LLMCallStartedEvent, _on_llm_started)
+        crewai_event_bus.register_handler(LLMCallCompletedEvent, _on_llm_finished)
+        crewai_event_bus.register_handler(LLMCallFailedEvent, _on_llm_finished)
+        _installed = True
@@ -0,0 +1,228 @@
+"""LLM 응답 디스크 캐시.
+
+모델 이름, 메시지(이전 도구 실행 결과 포함), 도구 스키마, 중지 단어, 거래일을 해시한 키로
+응답을 SQLite 에 저장합니다. 사이클이 후반 태스크에서 실패해 다시 실행하더라도
+같은 거래일의 같은 프롬프트는 LLM 을 다시 부르지 않고 즉시 응답합니다.
+오래된 응답은 TTL 이 지나면 무시되고, 전체 크기가 상한을 넘으면 가장 오래 쓰지 않은 응답부터 지웁니다.
+    LLM_CACHE         0 이면 캐시를 사용하지 않음 (기본 1)
+    LLM_CACHE_TTL     응답 유효 시간(시간, 기본 24)
+    LLM_CACHE_MAX_MB  캐시 DB 의 최대 크기(MB, 기본 256)
+    OLLAMA_KEEP_ALIVE Ollama 가 마지막 요청 뒤 모델을 메모리에 유지할 시간 (예: 24h, 기본: Ollama 설정 5m)
+
+AUTOSTOCK_DATA_MODE=record 이면 응답을 픽스처로도 기록하고, replay 이면 make_llm() 이
+실제 모델 대신 기록된 응답을 돌려주는 ReplayLLM 스텁을 만듭니다. (data/replay.py 참고)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from crewai import LLM
+
+from . import instrumentation
+from .data import replay
+from .data.calendar import DATE_FORMAT, current_time, get_calendar
+from .data.storage import cache_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    agent TEXT,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class LLMResponseCache:
+    """프롬프트 해시를 키로 LLM 응답을 보관하고, 에이전트별 적중/미적중 횟수를 세는 캐시"""
+
+    def __init__(self, path: str = None, ttl_hours: float = None, max_mb: float = None):
+        self.path = path or cache_path("llm", "responses.db")
+        self.ttl = 3600 * (float(os.getenv("LLM_CACHE_TTL", "24")) if ttl_hours is None else ttl_hours)
+        self.max_bytes = int(1024 * 1024 * (float(os.getenv("LLM_CACHE_MAX_MB", "256")) if max_mb is None else max_mb))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.counters = {}
+
+    @staticmethod
+    def make_key(model: str, messages, tools=None, stop=None, day: str = None) -> str:
+        """요청 내용을 정규화한 JSON 의 SHA-256 해시"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "tools": tools or [], "stop": stop or [], "day": day},
+            ensure_ascii=False, sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, agent: str, outcome: str) -> None:
+        counter = self.counters.setdefault(agent or "unknown", {"hits": 0, "misses": 0})
+        counter[outcome] += 1
+
+    def get(self, key: str, agent: str = None):
+        """유효한 응답이 있으면 반환하고 없으면 None. 적중 여부를 에이전트별로 기록합니다."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self._count(agent, "misses")
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count(agent, "hits")
+            return row[0]
+
+    def put(self, key: str, response: str, model: str, agent: str = None) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, agent, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, agent, response, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """만료된 응답을 지우고, 크기 상한을 넘으면 가장 오래 쓰지 않은 응답부터 지웁니다."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def stats(self) -> dict:
+        """{에이전트: {'hits': ..., 'misses': ...}}"""
+        with self._lock:
+            return {agent: dict(counter) for agent, counter in self.counters.items()}
+
+    def summary(self) -> str:
+        stats = self.stats()
+        if not stats:
+            return "[LLM 캐시] 호출 없음"
+        hits = sum(c["hits"] for c in stats.values())
+        misses = sum(c["misses"] for c in stats.values())
+        lines = [f"[LLM 캐시] 적중 {hits}, 미적중 {misses}"]
+        for agent, counter in stats.items():
+            lines.append(f"  - {agent}: 적중 {counter['hits']}, 미적중 {counter['misses']}")
+        return "\n".join(lines)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.counters = {}
+
+
+def _trading_day() -> str:
+    """캐시 키에 넣을 거래일. 캘린더를 쓸 수 없으면 오늘 날짜를 사용합니다."""
+    try:
+        return get_calendar().last_trading_day() or current_time().strftime(DATE_FORMAT)
+    except Exception:
+        return current_time().strftime(DATE_FORMAT)
+
+
+class CachedLLM(LLM):
+    """LLMResponseCache 를 거쳐 호출하는 crewAI LLM. 도구를 직접 실행하는 함수 호출 요청은 캐시하지 않습니다."""
+
+    def __init__(self, model: str, cache: LLMResponseCache = None, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.cache = cache
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        cache = self.cache or get_llm_cache()
+        # available_functions 가 있으면 LLM 이 도구를 직접 실행하므로 응답을 재사용하면 도구 실행이 빠짐
+        if cache is None or available_functions:
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+
+        agent = getattr(from_agent, "role", None)
+        key = cache.make_key(self.model, messages, tools, self.stop, _trading_day())
+        cached = cache.get(key, agent)
+        instrumentation.cache(cached is not None)
+        if cached is not None:
+            _record(key, cached, agent)
+            return cached
+
+        response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+        if isinstance(response, str) and response:
+            cache.put(key, response, self.model, agent)
+            _record(key, response, agent)
+        return response
+
+
+def _record(key: str, response: str, agent: str = None) -> None:
+    """기록 모드이면 응답을 재생용 픽스처로 남깁니다."""
+    store = replay.recording_store()
+    if store is not None:
+        store.write("llm", {"key": key, "agent": agent}, response)
+
+
+# 기록된 응답이 없는 요청에 ReplayLLM 이 돌려주는 응답 (crewAI 가 최종 답변으로 인식하는 형식)
+REPLAY_FALLBACK = (
+    "Thought: 재생 모드에서 기록된 응답이 없어 분석을 생략합니다.\n"
+    "Final Answer: [재생 모드] 이 요청에 대해 기록된 LLM 응답이 없습니다."
+)
+
+
+class ReplayLLM(LLM):
+    """재생 모드의 로컬 LLM 스텁. 기록된 응답을 돌려주고, 없으면 태스크를 바로 끝내는 고정 응답을 돌려줍니다."""
+
+    def __init__(self, model: str, store: "replay.FixtureStore" = None, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        started = time.perf_counter()
+        store = self.store or replay.replay_store() or replay.FixtureStore()
+        agent = getattr(from_agent, "role", None)
+        key = LLMResponseCache.make_key(self.model, messages, tools, self.stop, _trading_day())
+        try:
+            response = store.read("llm", {"key": key, "agent": agent})
+            self.hits += 1
+        except replay.FixtureMissing:
+            response = REPLAY_FALLBACK
+            self.misses += 1
+        # 실제 모델을 부르지 않아 crewAI 의 LLM 이벤트가 없으므로 직접 계측
+        instrumentation.cache(response is not REPLAY_FALLBACK)
+        instrumentation.llm_call(messages, response, time.perf_counter() - started)
+        return response
+
+
+def make_llm(model: str, **kwargs) -> LLM:
+    """에이전트가 사용할 LLM. 재생 모드이면 ReplayLLM, 아니면 CachedLLM 입니다."""
+    if replay.is_replay():
+        return ReplayLLM(model=model, **kwargs)
+    # 요청마다 keep_alive 를 넘기지 않으면 Ollama 기본값(5분)으로 되돌아가 사이클 사이에 모델이 내려감
+    if model.startswith("ollama/") and os.getenv("OLLAMA_KEEP_ALIVE"):
+        kwargs.setdefault("keep_alive", os.getenv("OLLAMA_KEEP_ALIVE"))
+    return CachedLLM(model=model, **kwargs)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """모든 에이전트가 공유하는 기본 LLMResponseCache. LLM_CACHE=0 이면 None 을 반환합니다."""
+    global _default_cache
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+        return _default_cache
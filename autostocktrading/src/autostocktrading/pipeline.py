@@ -0,0 +1,124 @@
+"""LLM 없이 실행하는 정량 파이프라인 (--fast).
+
+티커 목록 → 가치 평가 → 수급 필터 → 리스크 분석 → 비중 할당 → 매매 계획 단계를
+각 도구의 구조화된 결과(DataFrame / dict)로 바로 이어 실행합니다.
+에이전트가 도구 출력을 텍스트로 옮겨 적는 단계가 없으므로 한 사이클이 수 초 안에 끝나고,
+같은 데이터에 대해서는 항상 같은 주문을 만듭니다.
+시장 트렌드, 섹터, ESG 같은 서술형 분석은 crew.py 의 narrative_crew() 가 따로 담당합니다.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .data.name_resolver import get_name_resolver
+from .data.ledger import get_ledger
+from .tools import get_tool
+
+# 최종 편입 종목 수
+DEFAULT_TOP_N = 10
+
+# 수급 필터에 넘길 후보 수 (최종 편입 종목 수의 배수)
+CANDIDATE_MULTIPLIER = 2
+
+
+class QuantPipeline:
+    """도구들을 구조화된 데이터로 연결해 후보 선정부터 매매 계획까지 결정적으로 계산하는 파이프라인"""
+
+    def __init__(self, market: str = 'KOSPI', top_n: int = DEFAULT_TOP_N, tickers: list[str] = None):
+        self.market = market
+        self.top_n = top_n
+        self.tickers = tickers
+        self.timings = {}
+
+    def _stage(self, name: str, fn, *args):
+        started = time.perf_counter()
+        with instrumentation.span("stage", name):
+            result = fn(*args)
+        self.timings[name] = time.perf_counter() - started
+        print(f"[정량 파이프라인] {name} {self.timings[name]:.2f}초")
+        return result
+
+    @staticmethod
+    def _insider_filter(candidates: list[str], insider: pd.DataFrame) -> list[str]:
+        """기관과 외국인이 모두 순매도한 종목을 제외합니다. 수급 데이터가 없는 종목은 그대로 둡니다."""
+        selling = insider[(insider['inst_net_purchase'] < 0) & (insider['foreign_net_purchase'] < 0)]
+        excluded = set(selling['ticker'])
+        return [ticker for ticker in candidates if ticker not in excluded]
+
+    def run(self, total_capital: float = None) -> dict:
+        """한 사이클을 실행하고 단계별 결과를 딕셔너리로 반환합니다. total_capital 을 생략하면 원장의 현금을 사용합니다."""
+        self.timings = {}
+
+        universe = self.tickers or self._stage("티커 목록", get_tool('TickerListTool').tickers, self.market)
+        valuation = self._stage("가치 평가", get_tool('ValuationTool').evaluate, universe)
+
+        # 가치 평가 상위 종목만 종목별 조회가 필요한 수급 분석으로 넘김
+        candidates = list(valuation['ticker'].head(self.top_n * CANDIDATE_MULTIPLIER))
+        insider = self._stage("수급 분석", get_tool('InsiderAnalysisTool').analyze, candidates)
+        selected = self._insider_filter(candidates, insider)[:self.top_n]
+
+        correlation = self._stage("리스크 분석", get_tool('RiskAnalysisTool').correlation, selected) if selected else pd.DataFrame()
+        allocations = self._stage("비중 할당", get_tool('AllocationTool').allocate, selected) if selected else {}
+
+        if total_capital is None:
+            total_capital = get_ledger().snapshot()['cash']
+        plan, orders = self._stage("매매 계획", get_tool('TradingPlannerTool').plan, allocations, total_capital) \
+            if allocations else ([], [])
+
+        print(f"[정량 파이프라인] 총 {sum(self.timings.values()):.2f}초 "
+              f"(전체 {len(universe)}종목 → 후보 {len(candidates)} → 편입 {len(allocations)})")
+
+        return {
+            'market': self.market,
+            'universe': universe,
+            'valuation': valuation,
+            'candidates': candidates,
+            'insider': insider,
+            'selected': selected,
+            'correlation': correlation,
+            'allocations': allocations,
+            'total_capital': total_capital,
+            'plan': plan,
+            'orders': orders,
+            'timings': dict(self.timings),
+        }
+
+
+def candidate_names(tickers: list[str]) -> str:
+    """서술형 분석 에이전트에 넘길 '티커(종목명)' 목록 문자열"""
+    try:
+        resolver = get_name_resolver().load()
+    except Exception:
+        return ", ".join(tickers)
+    return ", ".join(f"{ticker}({resolver.names[ticker]})" if ticker in resolver.names else ticker
+                     for ticker in tickers)
+
+
+def format_report(result: dict) -> str:
+    """파이프라인 결과를 trading_plan.md 에 저장할 보고서로 정리합니다."""
+    lines = [f"# 정량 파이프라인 매매 계획 ({result['market']})", ""]
+
+    valuation = result['valuation']
+    columns = [c for c in valuation.columns if not c.endswith('_score')]
+    lines += ["## 가치 평가 상위 종목", valuation[columns].head(len(result['candidates'])).to_string(index=False), ""]
+
+    insider = result['insider']
+    if not insider.empty:
+        lines += ["## 수급 분석 (최근 한 달 누적, 억 원)",
+                  insider.set_index('ticker').div(1_000_000_00).round(1).to_string(), ""]
+
+    correlation = result['correlation']
+    if len(correlation) > 1:
+        # 대각선 위쪽(종목 쌍)만 요약
+        pairs = correlation.values[np.triu_indices(len(correlation), k=1)]
+        lines += ["## 리스크 분석",
+                  f"종목 간 평균 상관계수: {np.nanmean(pairs):.2f}, 최대: {np.nanmax(pairs):.2f}", ""]
+
+    if result['plan']:
+        lines += [f"## 매매 계획 (총 자본 {result['total_capital']:,.0f}원)", pd.DataFrame(result['plan']).to_string(), ""]
+    else:
+        lines += ["매매 계획을 수립할 종목이 없습니다.", ""]
+
+    return "\n".join(lines)
@@ -0,0 +1,68 @@
+"""에이전트 도구 모음.
+
+도구 모듈은 crewAI, pandas 와 각 데이터 저장소를 불러오므로 패키지를 불러올 때 함께 가져오지 않고,
+도구 클래스를 처음 사용할 때 해당 모듈만 가져옵니다.
+
+    from autostocktrading.tools import ValuationTool    # 이 시점에 financial_tools 를 가져옴
+    get_tool("ValuationTool")                            # 프로세스에서 공유하는 인스턴스
+
+도구는 상태를 데이터 저장소(싱글턴)에 두므로 인스턴스 하나를 모든 에이전트와 사이클이 함께 씁니다.
+"""
+import importlib
+import threading
+
+# 도구 클래스 이름 → 정의된 모듈
+TOOL_MODULES = {
+    "KREconomicIndicatorTool": "economic_tools",
+    "USEconomicIndicatorTool": "economic_tools",
+    "StockFundamentalTool": "financial_tools",
+    "ValuationTool": "financial_tools",
+    "FactorRankingTool": "financial_tools",
+    "TickerListTool": "market_data_tools",
+    "SectorMembersTool": "market_data_tools",
+    "TickerResolverTool": "market_data_tools",
+    "InsiderAnalysisTool": "market_data_tools",
+    "RiskAnalysisTool": "portfolio_tools",
+    "AllocationTool": "portfolio_tools",
+    "NaverNewsSearchTool": "search_tools",
+    "ESGRiskScreenTool": "search_tools",
+    "TradingPlannerTool": "trading_tools",
+    "PortfolioReaderTool": "trading_tools",
+    "TradeExecutorTool": "trading_tools",
+    "BatchTradeExecutorTool": "trading_tools",
+}
+
+__all__ = list(TOOL_MODULES) + ["get_tool", "reset_tools"]
+
+_instances = {}
+_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    if name not in TOOL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{TOOL_MODULES[name]}", __name__)
+    return getattr(module, name)
+
+
+def __dir__():
+    return sorted(list(globals()) + list(TOOL_MODULES))
+
+
+def get_tool(name: str):
+    """이름에 해당하는 도구 인스턴스를 반환합니다. 처음 요청될 때 모듈을 가져와 한 번만 만듭니다."""
+    tool = _instances.get(name)
+    if tool is None:
+        if name not in TOOL_MODULES:
+            raise ValueError(f"알 수 없는 도구입니다: {name}")
+        with _lock:
+            tool = _instances.get(name)
+            if tool is None:
+                tool = _instances[name] = __getattr__(name)()
+    return tool
+
+
+def reset_tools() -> None:
+    """공유 도구 인스턴스를 비웁니다. 출력 형식 같은 환경 변수를 바꾼 뒤 새 인스턴스가 필요할 때 사용합니다."""
+    with _lock:
+        _instances.clear()
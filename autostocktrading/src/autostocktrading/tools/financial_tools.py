@@ -1,31 +1,46 @@
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Optional, Type
 from pydantic import BaseModel, Field
-from pykrx import stock
 from datetime import datetime, timedelta
 import pandas as pd
 import math
 
+from ..analysis.factor_engine import FactorEngine
+from ..data.sector_index import get_sector_index
+from ..data.snapshot_store import get_snapshot_store, FUNDAMENTAL_COLUMNS
+from .output import CompactOutputTool
+
+def _score(fundamentals: pd.DataFrame, top_n: int = None) -> pd.DataFrame:
+    """설정된 팩터로 종목을 점수화합니다. 업종 중립 설정이면 업종 색인의 업종 안에서 정규화합니다."""
+    engine = FactorEngine()
+    groups = None
+    if engine.sector_neutral and not fundamentals.empty:
+        try:
+            groups = get_sector_index().sector_of(fundamentals.index)
+        except Exception as e:
+            print(f"업종 정보를 가져오지 못해 시장 전체 기준으로 정규화합니다: {e}")
+    ranked = engine.score(fundamentals, groups)
+    return ranked if top_n is None else ranked.head(top_n)
+
 class StockFundamentalToolInput(BaseModel):
     """Input Schema for TickerListTool"""
     ticker: str = Field(..., description="종목 티커")
 
-class StockFundamentalTool(BaseTool):
+class StockFundamentalTool(CompactOutputTool):
     name: str = "StockFundamentalTool"
     description: str = "특정 종목(티커)의 기본 재무 정보를 조회하는 도구입니다. PER, PBR, EPS, BPS, DIV, DPS 정보를 딕셔너리 형태로 반환합니다."
 
     args_schema: Type[BaseModel] = StockFundamentalToolInput
 
     def _run(self, ticker: str)-> dict:
-        today = datetime.now().strftime("%Y%m%d")
-
         try:
-            df = stock.get_market_fundamental(today, ticker=ticker)
+            # 시장 전체 스냅샷에서 조회 (종목마다 API 를 호출하지 않음)
+            row = get_snapshot_store().lookup(ticker)
 
-            if df.empty:
+            if row is None:
                 return {"error": f"{ticker}에 대한 재무 정보를 찾을 수 없습니다."}
 
-            fundamentals = df.iloc[-1].to_dict()
+            fundamentals = {column: row[column] for column in FUNDAMENTAL_COLUMNS}
             return fundamentals
 
         except Exception as e:
@@ -36,56 +51,67 @@ class ValuationToolInput(BaseTool):
     """종목 가치 평가를 위한 스키마"""
     tickers: list[str] = Field(..., description="가치 평가를 수행할 종목 티커 리스트")
 
-class ValuationTool(BaseTool):
+class ValuationTool(CompactOutputTool):
     name: str = "Stock Valuation Tool"
-    description: str = "주어진 종목 리스트에 대해 PER, PBR, ROE, 배당수익률을 기반으로 멀티 팩터 가치 평가를 수행하고 순위를 매깁니다."
+    description: str = "주어진 종목 리스트에 대해 PER, PBR, ROE, 배당수익률 등 설정된 팩터를 기반으로 멀티 팩터 가치 평가를 수행하고 순위를 매깁니다."
     args_schema: Type[BaseModel] = ValuationToolInput
 
-    def _run(self, tickers: list[str]) -> str:
-        # 실제로는 복잡한 계산이 필요하지만, 테스트를 위해 간단한 텍스트를 반환합니다.
-        today = datetime.now().strftime("%Y%m%d")
-
-        all_fundamentals = []
-        for ticker in tickers:
-            try:
-                # pykrx를 이용해 개별 종목의 펀더멘탈 데이터 조회
-                f = stock.get_market_fundamental(today, ticker=ticker)
-
-                # 계산에 필요한 값들이 0이 아닌 경우에만 데이터 추가
-                if f['BPS'].iloc[0] > 0 and f['PER'].iloc[0] > 0 and f['PBR'].iloc[0] > 0:
-                    fund_dict = f.to_dict('records')[0]
-                    fund_dict['ticker'] = ticker
-
-                    # ROE 계산 (EPS / BPS) * 100
-                    fund_dict['ROE'] = (fund_dict['EPS'] / fund_dict['BPS']) * 100 if fund_dict['BPS'] > 0 else 0
-                    all_fundamentals.append(fund_dict)
-
-            except Exception as e:
-                # 데이터를 가져오지 못한 경우 무시하고 계속 진행
-                print(f"티커 {ticker}의 데이터를 가져오는데 실패했습니다.: {e}")
-                continue
-
-        if not all_fundamentals:
-            return "유효한 펀더멘탈 데이터를 가진 종목이 없습니다."
+    def evaluate(self, tickers: list[str]) -> pd.DataFrame:
+        """종목별 팩터 값과 종합 점수(score), 종합 순위(total_rank, 1 이 최상위)를 순위순으로 담은 DataFrame 을 반환합니다."""
+        # 시장 전체 스냅샷에서 요청 종목의 펀더멘탈을 한 번에 조회
+        fundamentals = get_snapshot_store().lookup_many(tickers)
 
-        # 데이터 프레임으로 변환
-        df = pd.DataFrame(all_fundamentals)
+        missing = [ticker for ticker in tickers if ticker not in fundamentals.index]
+        if missing:
+            print(f"티커 {missing}의 데이터를 찾을 수 없습니다.")
 
-        # 순위 계산: PER, PBR은 낮을수록 순위가 높고(오름차순), DIV, ROE는 높을수록 순위가 높음
-        # rank(ascending=True)가 낮은 값에 높은 순위(1위)를 부여함
-        per_rank = df['PER'].rank(ascending=True)
-        pbr_rank = df['PBR'].rank(ascending=True)
-        div_rank = df['DIV'].rank(ascending=False)
-        roe_rank = df['ROE'].rank(ascending=False)
+        # config/factors.yaml 의 팩터(기본: PER, PBR 은 낮을수록, DIV, ROE 는 높을수록 좋음)로 한 번에 점수화
+        return _score(fundamentals)
 
-        # 각 팩터의 순위를 합산하여 종합 순위 계산
-        df['total_rank'] = per_rank + pbr_rank + div_rank + roe_rank
+    def _run(self, tickers: list[str]) -> str:
+        try:
+            final_df = self.evaluate(tickers)
+        except Exception as e:
+            return f"펀더멘탈 데이터를 가져오는데 실패했습니다.: {e}"
 
-        # 종합 순위를 기준으로 오름차순 정렬 (숫자가 낮을수록 좋은 것)
-        result_df = df.sort_values(by='total_rank', ascending=True)
+        if final_df.empty:
+            return "유효한 펀더멘탈 데이터를 가진 종목이 없습니다."
+
+        # 결과를 문자열로 변환하여 반환 (정규화 점수 컬럼은 생략)
+        columns = [c for c in final_df.columns if not c.endswith('_score')]
+        return f"멀티 팩터 가치 평가 결과: \n{self.table(final_df[columns])}"
+
+
+class FactorRankingToolInput(BaseModel):
+    market: str = Field("KOSPI", description="순위를 매길 시장 (KOSPI, KOSDAQ)")
+    top_n: int = Field(20, description="반환할 상위 종목 수")
+    tickers: Optional[list[str]] = Field(None, description="이 종목들 안에서만 순위를 매길 때 지정 (예: 섹터 종목 목록)")
+
+class FactorRankingTool(CompactOutputTool):
+    name: str = "Factor Ranking Tool"
+    description: str = (
+        "시장 전체(또는 지정한 종목 목록) 종목을 PER, PBR, 배당수익률, ROE 등 멀티 팩터로 한 번에 점수화하여 "
+        "상위 N개 종목과 재무 지표를 반환합니다. 종목별로 재무 정보를 조회할 필요가 없습니다."
+    )
+    args_schema: Type[BaseModel] = FactorRankingToolInput
+
+    def rank(self, market: str = "KOSPI", top_n: int = 20, tickers: list[str] = None) -> pd.DataFrame:
+        """시장 스냅샷 전체를 한 번에 점수화한 상위 top_n 종목"""
+        date, snapshot = get_snapshot_store().latest()
+        snapshot = snapshot[snapshot['market'] == market] if not snapshot.empty else snapshot
+        if tickers:
+            snapshot = snapshot.loc[pd.Index(tickers).intersection(snapshot.index, sort=False)]
+        return _score(snapshot, top_n)
+
+    def _run(self, market: str = "KOSPI", top_n: int = 20, tickers: Optional[list[str]] = None) -> str:
+        try:
+            ranking = self.rank(market, top_n, tickers)
+        except Exception as e:
+            return f"멀티 팩터 순위 계산 중 오류가 발생했습니다.: {e}"
 
-        # 최종 결과에서 필요한 컬럼만 선택
-        final_df = result_df[['ticker', 'PER', 'PBR', 'DIV', 'ROE', 'total_rank']]
+        if ranking.empty:
+            return "순위를 매길 유효한 펀더멘탈 데이터를 가진 종목이 없습니다."
 
-        # 결과를 문자열로 변환하여 반환
-        return f"멀티 팩터 가치 평가 결과: \n{final_df.to_string()}"
\ No newline at end of file
+        # 정규화 점수 컬럼은 생략하고 원값과 종합 점수만 전달
+        columns = [c for c in ranking.columns if not c.endswith('_score')]
+        return f"{market} 멀티 팩터 상위 {len(ranking)}개 종목: \n{self.table(ranking[columns])}"
@@ -1,59 +1,161 @@
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Optional, Type
 from pydantic import BaseModel, Field
-from pykrx import stock
 from datetime import datetime, timedelta
 import pandas as pd
 import math
 
+from ..data import krx
+from ..data.calendar import get_calendar
+from ..data.fetcher import get_fetch_executor
+from ..data.name_resolver import get_name_resolver
+from ..data.sector_index import get_sector_index
+from .output import CompactOutputTool
+
 class TickerListToolInput(BaseModel):
     """Input Schema for TickerListTool"""
     market: str = Field(description="지정된 시장 이름(KOSPI, KOSDAQ)")
 
-class TickerListTool(BaseTool):
+class TickerListTool(CompactOutputTool):
     name: str = "TickerListTool"
     description: str = "지정한 시장(KOSPI, KOSDAQ)의 모든 종목 티커 목록을 조회하는 도구입니다."
     args_schema: Type[BaseModel] = TickerListToolInput
 
-    def _run(self, market: str) -> list:
-        today = datetime.now().strftime("%Y%m%d")
+    def tickers(self, market: str) -> list[str]:
+        """시장의 전체 티커 목록. 휴장일에는 목록이 비어 있으므로 가장 최근 거래일 기준으로 조회합니다."""
+        return krx.get_market_ticker_list(get_calendar().last_trading_day(), market=market)
 
+    def _run(self, market: str) -> list:
         try:
             if isinstance(market, dict):
                 market_name = market.get('description', '')
                 if market_name in ['KOSPI', 'KOSDAQ']:
-                    return stock.get_market_ticker_list(today, market=market_name)
+                    return self.tickers(market_name)
 
             if isinstance(market, str) and market in ['KOSPI', 'KOSDAQ']:
-                return stock.get_market_ticker_list(today, market=market)
+                return self.tickers(market)
 
             return ["오류: market 인자는 'KOSPI' 또는 'KOSDAQ' 문자열이어야 합니다."]
 
         except Exception as e:
             return [f"{market} 시장의 티커 목록을 가져오는데 실패했습니다: {e}"]
 
+class SectorMembersToolInput(BaseModel):
+    theme: str = Field(..., description="테마 또는 업종 이름 (예: 반도체, 2차전지, 바이오, 금융, 전기전자)")
+    market: Optional[str] = Field(None, description="시장을 제한할 때 지정 (KOSPI, KOSDAQ)")
+    limit: int = Field(30, description="반환할 최대 종목 수 (시가총액 상위 순)")
+
+class SectorMembersTool(CompactOutputTool):
+    name: str = "Sector Members Tool"
+    description: str = (
+        "테마나 업종 이름으로 해당 업종/지수에 속한 종목의 티커, 종목명, 업종, 시가총액을 시가총액 순으로 반환합니다. "
+        "전체 티커 목록을 훑지 않고 섹터 종목을 바로 찾을 때 사용합니다."
+    )
+    args_schema: Type[BaseModel] = SectorMembersToolInput
+
+    def members(self, theme: str, market: str = None, limit: int = 30) -> pd.DataFrame:
+        """테마/업종 소속 종목 (ticker, name, market, sector, market_cap_100m_krw), 시가총액 순"""
+        sector_index = get_sector_index()
+        tickers = sector_index.members(theme, market)[:limit]
+        return pd.DataFrame(
+            [{
+                'ticker': ticker,
+                'name': sector_index.tickers[ticker]['name'],
+                'market': sector_index.tickers[ticker]['market'],
+                'sector': sector_index.tickers[ticker]['sector'],
+                'market_cap_100m_krw': sector_index.tickers[ticker]['market_cap'] / 1_000_000_00,
+            } for ticker in tickers],
+            columns=['ticker', 'name', 'market', 'sector', 'market_cap_100m_krw']
+        )
+
+    def _run(self, theme: str, market: Optional[str] = None, limit: int = 30) -> str:
+        try:
+            sector_index = get_sector_index()
+            resolved = sector_index.resolve(theme)
+            table = self.members(theme, market, limit)
+        except Exception as e:
+            return f"업종 색인 조회 중 오류가 발생했습니다.: {e}"
+
+        if table.empty:
+            available = sector_index.available()
+            return (
+                f"'{theme}'에 해당하는 테마/업종을 찾지 못했습니다.\n"
+                f"테마: {', '.join(available['themes'])}\n"
+                f"업종: {', '.join(available['sectors'])}"
+            )
+
+        total = len(sector_index.members(theme, market))
+        source = ", ".join(resolved['sectors'] + resolved['indices'])
+        return (
+            f"'{resolved['theme'] or theme}' 소속 종목 {total}개 중 시가총액 상위 {len(table)}개 "
+            f"(기준일 {sector_index.date}, 업종/지수: {source}): \n{self.table(table)}"
+        )
+
+class TickerResolverToolInput(BaseModel):
+    names: list[str] = Field(..., description="티커로 바꿀 회사명 목록 (한글/영문 이름, 약칭, '삼성전자우' 같은 우선주 표기 가능)")
+
+class TickerResolverTool(CompactOutputTool):
+    name: str = "Ticker Resolver Tool"
+    description: str = (
+        "뉴스나 보고서에 나온 회사명 여러 개를 한 번에 6자리 종목 티커로 변환합니다. "
+        "영문 이름, 약칭, 우선주 표기, 띄어쓰기나 오타가 조금 다른 이름도 찾아줍니다."
+    )
+    args_schema: Type[BaseModel] = TickerResolverToolInput
+
+    def resolve(self, names: list[str]) -> pd.DataFrame:
+        """회사명별 (query, ticker, name, method, score) 표. 찾지 못한 이름은 ticker 가 비어 있습니다."""
+        resolved = get_name_resolver().resolve_many(names)
+        return pd.DataFrame(
+            [match or {"query": query} for query, match in resolved.items()],
+            columns=['query', 'ticker', 'name', 'method', 'score', 'alternatives']
+        )
+
+    def _run(self, names: list[str]) -> str:
+        try:
+            table = self.resolve(names)
+        except Exception as e:
+            return f"종목명 변환 중 오류가 발생했습니다.: {e}"
+
+        found = table[table['ticker'].notna()].copy()
+        lines = [f"회사명 → 티커 변환 결과 ({len(found)}/{len(table)}개 찾음)"]
+        if not found.empty:
+            # 유사도로 찾은 이름 중 비슷한 후보가 있으면 함께 표시
+            found['alternatives'] = found['alternatives'].map(lambda names: "/".join(names) if names else "")
+            lines.append(self.table(found))
+        missing = table.loc[table['ticker'].isna(), 'query'].tolist()
+        if missing:
+            lines.append(f"찾지 못한 이름: {', '.join(missing)}")
+        return "\n".join(lines)
+
+# 수급 분석 기간 (거래일 수, 약 한 달)
+INSIDER_LOOKBACK_SESSIONS = 20
+
 class InsiderAnalysisToolInput(BaseTool):
     tickers: list[str] = Field(..., description="수급 분석을 수행할 종목 티커 리스트")
 
-class InsiderAnalysisTool(BaseTool):
+class InsiderAnalysisTool(CompactOutputTool):
     name: str = "Insider Trading Analysis Tool"
     description: str = "주어진 종목 리스트에 대해 최근 한 달간의 기관 및 외국인 투자자의 순매수 동향을 분석합니2다."
     args_schema: Type[BaseModel] = InsiderAnalysisToolInput
 
-    def _run(self, tickers: list[str]) -> str:
-        # 분석 기간 설정 (최근 한 달)
-        today = datetime.now()
-        start_date = today - timedelta(days=30)
-
-        today_str = today.strftime("%Y%m%d")
-        start_date_str = start_date.strftime("%Y%m%d")
+    def analyze(self, tickers: list[str]) -> pd.DataFrame:
+        """종목별 최근 한 달 누적 기관(inst_net_purchase)/외국인(foreign_net_purchase) 순매수 금액을 반환합니다."""
+        # 분석 기간 설정 (최근 한 달 분량의 거래일)
+        calendar = get_calendar()
+        today_str = calendar.last_trading_day()
+        start_date_str = calendar.trading_days_back(INSIDER_LOOKBACK_SESSIONS)
+
+        # pykrx를 이용해 투자자별 거래대금 데이터를 종목별로 병렬 조회
+        fetched = get_fetch_executor().map(
+            lambda ticker: krx.get_market_trading_value_by_date(start_date_str, today_str, ticker), tickers
+        )
+        print(fetched.summary(self.name))
+        for ticker, e in fetched.errors.items():
+            print(f"티커 {ticker}의 수급 데이터를 가져오는데 실패했습니다.: {e}")
 
         results = []
-        for ticker in tickers:
+        for ticker, df in fetched.ordered():
             try:
-                # pykrx를 이용해 투자자별 거래대금 데이터 조회
-                df = stock.get_market_trading_value_by_date(start_date_str, today_str, ticker)
-
                 # '기관계'와 '외국인'의 순매수 금액 합계 계산
                 # 순매수 = 매수 - 매도. pykrx 데이터는 이미 순매수 금액을 제공합니다.
                 inst_net_purchase = df['기관계'].sum()
@@ -70,9 +172,21 @@ class InsiderAnalysisTool(BaseTool):
                 print(f"티커 {ticker}의 수급 데이터를 가져오는데 실패했습니다.: {e}")
                 continue
 
+        return pd.DataFrame(results, columns=['ticker', 'inst_net_purchase', 'foreign_net_purchase'])
+
+    def _run(self, tickers: list[str]) -> str:
+        analysis = self.analyze(tickers)
+        results = analysis.to_dict('records')
+
         if not results:
             return "유효한 수급 데이터를 가진 종목이 없습니다."
 
+        if self.output_format != 'text':
+            # 금액 단위를 '억 원' 으로 변환한 표 (양수: 순매수, 음수: 순매도)
+            table = analysis.set_index('ticker').div(1_000_000_00).rename(
+                columns={'inst_net_purchase': 'inst_100m_krw', 'foreign_net_purchase': 'foreign_100m_krw'})
+            return f"기관 및 외국인 수급 분석 결과 (최근 한 달 누적 순매수, 억 원): \n{self.table(table, index=True)}"
+
         # 결과 요약 문자열 생성
         summary_lines = ["기관 및 외국민 수급 분석 결과 (최근 한 달 누적):"]
 
@@ -0,0 +1,157 @@
+"""도구 출력 직렬화와 출력 토큰 집계.
+
+도구 결과는 그대로 로컬 모델의 컨텍스트에 들어가므로, 표를 패딩 없는 CSV 나 JSON 으로 간결하게 만들고
+소수 자릿수를 줄이며, 종목 수의 제곱으로 커지는 상관관계 행렬은 종목 쌍(상삼각) 목록이나
+상·하위 k 쌍 요약으로 바꿉니다. 모든 도구 호출은 출력 토큰 수(추정)를 기록합니다.
+    TOOL_OUTPUT_FORMAT     text: 기존 표 형식, csv: 간결한 CSV (기본), json: 간결한 JSON
+    TOOL_OUTPUT_PRECISION  소수 자릿수 (기본 2)
+    TOOL_MATRIX_TOP_K      행렬을 요약할 때 보여줄 상위/하위 쌍 수 (기본 10, 0 이면 상삼각 전체)
+"""
+import functools
+import json
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from crewai.tools import BaseTool
+from pydantic import Field, field_validator
+
+from .. import instrumentation
+
+FORMATS = ("text", "csv", "json")
+
+
+def estimate_tokens(text: str) -> int:
+    """출력 토큰 수 추정치. 영문/숫자는 4자당 1토큰, 한글 등 그 밖의 문자는 1자당 1토큰으로 계산합니다."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def format_table(df: pd.DataFrame, fmt: str = "csv", precision: int = 2, index: bool = False) -> str:
+    """DataFrame 을 지정한 형식의 문자열로 변환합니다. 실수 값은 precision 자리로 반올림합니다."""
+    df = df.round(precision)
+    # 반올림으로 생긴 -0.0 을 0.0 으로
+    floats = df.select_dtypes("float").columns
+    df[floats] = df[floats] + 0.0
+    if index:
+        df = df.reset_index()
+    if fmt == "text":
+        return df.to_string(index=False)
+    if fmt == "json":
+        rows = json.loads(df.to_json(orient="values", force_ascii=False, double_precision=min(precision, 15)))
+        return json.dumps({"columns": [str(c) for c in df.columns], "rows": rows},
+                          ensure_ascii=False, separators=(",", ":"))
+    return df.to_csv(index=False, lineterminator="\n").rstrip("\n")
+
+
+def format_data(data, fmt: str = "csv") -> str:
+    """딕셔너리/리스트를 문자열로 변환합니다. text 는 들여쓴 JSON, 나머지는 공백 없는 JSON 입니다."""
+    if fmt == "text":
+        return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def matrix_pairs(matrix: pd.DataFrame, value: str = "value") -> pd.DataFrame:
+    """대칭 행렬의 상삼각(대각선 제외) 종목 쌍을 값의 내림차순으로 나열합니다."""
+    rows, cols = np.triu_indices(len(matrix), k=1)
+    pairs = pd.DataFrame({
+        "a": matrix.index[rows],
+        "b": matrix.columns[cols],
+        value: matrix.values[rows, cols],
+    })
+    return pairs.dropna().sort_values(value, ascending=False, kind="stable").reset_index(drop=True)
+
+
+def format_matrix(matrix: pd.DataFrame, fmt: str = "csv", precision: int = 2, top_k: int = 10,
+                  value: str = "value") -> str:
+    """대칭 행렬을 문자열로 변환합니다.
+
+    text 는 전체 행렬, csv/json 은 상삼각 종목 쌍 목록입니다.
+    쌍이 2·top_k 개보다 많으면 평균과 함께 상위/하위 top_k 쌍만 보여줍니다.
+    """
+    if fmt == "text":
+        return matrix.round(precision).to_string()
+
+    pairs = matrix_pairs(matrix, value)
+    if not top_k or len(pairs) <= 2 * top_k:
+        return format_table(pairs, fmt, precision)
+
+    mean = pairs[value].mean()
+    return (
+        f"종목 {len(matrix)}개, 종목 쌍 {len(pairs)}개, 평균 {mean:.{precision}f}\n"
+        f"상위 {top_k}쌍:\n{format_table(pairs.head(top_k), fmt, precision)}\n"
+        f"하위 {top_k}쌍:\n{format_table(pairs.tail(top_k).iloc[::-1], fmt, precision)}"
+    )
+
+
+_usage = {}
+_usage_lock = threading.Lock()
+
+
+def record_output(tool_name: str, text: str) -> int:
+    tokens = estimate_tokens(text)
+    with _usage_lock:
+        calls, total = _usage.get(tool_name, (0, 0))
+        _usage[tool_name] = (calls + 1, total + tokens)
+    return tokens
+
+
+def usage_summary() -> str:
+    """이번 사이클의 도구별 호출 수와 출력 토큰 합계"""
+    with _usage_lock:
+        usage = dict(_usage)
+    if not usage:
+        return "[도구 출력] 호출 없음"
+    lines = [f"[도구 출력] 합계 {sum(t for _, t in usage.values()):,} 토큰 (추정)"]
+    for name, (calls, tokens) in sorted(usage.items(), key=lambda item: -item[1][1]):
+        lines.append(f"  - {name}: {calls}회, {tokens:,} 토큰")
+    return "\n".join(lines)
+
+
+def reset_usage() -> None:
+    with _usage_lock:
+        _usage.clear()
+
+
+class CompactOutputTool(BaseTool):
+    """출력 형식/소수 자릿수/행렬 요약을 선택할 수 있고, 호출마다 출력 토큰 수를 기록하는 도구의 기반 클래스"""
+
+    output_format: str = Field(default_factory=lambda: os.getenv("TOOL_OUTPUT_FORMAT", "csv"))
+    precision: int = Field(default_factory=lambda: int(os.getenv("TOOL_OUTPUT_PRECISION", "2")))
+    matrix_top_k: int = Field(default_factory=lambda: int(os.getenv("TOOL_MATRIX_TOP_K", "10")))
+
+    @field_validator("output_format")
+    @classmethod
+    def _check_format(cls, value: str) -> str:
+        value = value.lower()
+        if value not in FORMATS:
+            raise ValueError(f"출력 형식은 {FORMATS} 중 하나여야 합니다: {value}")
+        return value
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 하위 클래스의 _run 을 감싸 출력 토큰 수와 계측 구간을 기록 (에이전트는 run 대신 _run 을 직접 호출)
+        run = cls.__dict__.get("_run")
+        if run is not None and not getattr(run, "_records_output", False):
+            @functools.wraps(run)
+            def _run(self, *args, **kwargs):
+                with instrumentation.span("tool", self.name):
+                    result = run(self, *args, **kwargs)
+                text = result if isinstance(result, str) else str(result)
+                tokens = record_output(self.name, text)
+                print(f"[{self.name}] 출력 {tokens:,} 토큰 (추정, {self.output_format})")
+                return result
+
+            _run._records_output = True
+            cls._run = _run
+
+    def table(self, df: pd.DataFrame, index: bool = False) -> str:
+        return format_table(df, self.output_format, self.precision, index=index)
+
+    def matrix(self, matrix: pd.DataFrame, value: str = "value") -> str:
+        return format_matrix(matrix, self.output_format, self.precision, self.matrix_top_k, value=value)
+
+    def data(self, data) -> str:
+        return format_data(data, self.output_format)
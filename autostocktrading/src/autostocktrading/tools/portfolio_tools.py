@@ -1,54 +1,58 @@
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-from pykrx import stock
 from datetime import datetime, timedelta
 import pandas as pd
 import math
 
+from ..analysis.price_panel import load_price_panel
+from ..analysis.rolling_stats import get_rolling_stats
+from ..data.calendar import get_calendar
+from .output import CompactOutputTool
+
+# 변동성/상관관계 분석 기간 (거래일 수, 약 3개월)
+LOOKBACK_SESSIONS = 60
+
+
+def _load_panel(tickers: list[str], label: str):
+    """최근 LOOKBACK_SESSIONS 거래일의 종가 패널 (종가가 확정된 거래일까지, 데이터가 없는 종목 제외)"""
+    calendar = get_calendar()
+    today_str = calendar.last_trading_day(settled=True)
+    start_date_str = calendar.trading_days_back(LOOKBACK_SESSIONS, settled=True)
+
+    # 날짜 × 종목 종가 패널 (같은 사이클에서는 리스크 분석과 비중 할당이 공유)
+    price_panel = load_price_panel(tickers, start_date_str, today_str, label=label)
+
+    # 모든 데이터가 비어있는 종목 제거 (예: 거래정지 종목)
+    return price_panel.dropna_tickers()
+
+
 class RiskAnalysisToolInput(BaseTool):
     tickers: list[str] = Field(..., description="리스크 분석을 수행할 종목 티커 리스트")
 
 
-class RiskAnalysisTool(BaseTool):
+class RiskAnalysisTool(CompactOutputTool):
     name: str = "Risk Analysis Tool"
     description: str = "주어진 종목 리스트의 과거 주가 데이터를 기반으로 일일 수익률의 상관관계 매트릭스를 생성하여 포트폴리오의 분산 투자 리스크를 분석합니다. "
     args_schema: Type[BaseModel] = RiskAnalysisToolInput
 
-    def _run(self, tickers: list[str]) -> str:
-        # 분석 기간 설정 (최근 3개월)
-        today = datetime.now()
-        start_date = today - timedelta(days=90)
+    def correlation(self, tickers: list[str]) -> pd.DataFrame:
+        """일일 수익률의 롤링 상관관계 매트릭스. 유효한 주가 데이터가 없으면 빈 DataFrame 을 반환합니다."""
+        price_panel = _load_panel(tickers, self.name)
+        if price_panel.empty:
+            return pd.DataFrame()
 
-        today_str = today.strftime("%Y%m%d")
-        start_date_str = start_date.strftime("%Y%m%d")
+        # 저장된 누적값에 새 거래일만 반영
+        return get_rolling_stats(price_panel).correlation()
 
+    def _run(self, tickers: list[str]) -> str:
         try:
-            # 각 티커의 종가 데이터를 모을 데이터 프레임 초기화
-            close_prices_df = pd.DataFrame()
-
-            for ticker in tickers:
-                # OHLCV 데이터 조회
-                df = stock.get_market_ohlcv(start_date_str, today_str, ticker)
-
-                # 종가 데이터만 추출하여 시리즈에 티커 이름 할당
-                close_series = df['종가'].rename(ticker)
-
-                # 데이터 프레임에 병합
-                close_prices_df = pd.concat([close_prices_df, close_series], axis=1)
+            # 최근 3개월 분량의 거래일에 대한 상관관계 매트릭스
+            correlation_matrix = self.correlation(tickers)
 
-            # 모든 데이터가 비어있는 열 제거 (예: 거래정지 종목)
-            close_prices_df.dropna(axis=1, how='all', inplace=True)
-
-            if close_prices_df.empty:
+            if correlation_matrix.empty:
                 return "유효한 주가 데이터를 가진 종목이 없습니다."
 
-            # 일일 수익률 계산
-            daily_returns = close_prices_df.pct_change().dropna()
-
-            # 상관관계 매트릭스 계산
-            correlation_matrix = daily_returns.corr()
-
             # 결과 해석 추가
             interpretation = (
                 "\n\n[해석 가이드]\n"
@@ -58,7 +62,7 @@ class RiskAnalysisTool(BaseTool):
                 "  (일반적으로 포트폴리오 내 모든 종목 간 상관계수 평균이 낮을수록 좋습니다.)"
             )
 
-            return f"포트폴리오 리스크 분석 (상관관계 매트릭스): \n{correlation_matrix.to_string()}\n{interpretation}"
+            return f"포트폴리오 리스크 분석 (상관관계 매트릭스): \n{self.matrix(correlation_matrix, value='corr')}\n{interpretation}"
 
 
         except Exception as e:
@@ -68,56 +72,43 @@ class RiskAnalysisTool(BaseTool):
 class AllocationToolInput(BaseTool):
     tickers: list[str] = Field(..., description="비중을 할당할 종목 티커 리스트")
 
-class AllocationTool(BaseTool):
+class AllocationTool(CompactOutputTool):
     name: str = "Portfolio Allocation Tool"
     description: str = "주어진 종목 리스트에 대해 '역변동성 가중치' 전략을 사용하여 각 종목의 최적 투자 비중을 결정합니다."
     args_schema: Type[BaseTool] = AllocationToolInput
 
-    def _run(self, tickers: list[str]) -> str:
-        # 분석 기간 설정 (최근 3개월)
-        today = datetime.now()
-        start_date = today - timedelta(days=90)
+    def allocate(self, tickers: list[str]) -> dict:
+        """종목별 역변동성 비중(%)을 담은 딕셔너리. 유효한 주가 데이터가 없으면 빈 딕셔너리를 반환합니다."""
+        price_panel = _load_panel(tickers, self.name)
+        if price_panel.empty:
+            return {}
 
-        today_str = today.strftime("%Y%m%d")
-        start_date_str = start_date.strftime("%Y%m%d")
+        # 각 종목의 롤링 변동성(일일 수익률의 표준편차) 계산 (저장된 누적값에 새 거래일만 반영)
+        volatilities = get_rolling_stats(price_panel).volatility()
 
-        try:
-            # 각 티커의 종가 데이터를 모을 데이터 프레임 초기화
-            close_prices_df = pd.DataFrame()
+        # 변동성의 역수 계산
+        inverse_volatilities = 1 / volatilities
 
-            for ticker in tickers:
-                # OHLCV 데이터 조회
-                df = stock.get_market_ohlcv(start_date_str, today_str, ticker)
+        # 역변동성의 총합 계산
+        total_inverse_volatilities = inverse_volatilities.sum()
 
-                # 종가 데이터만 추출하여 시리즈에 티커 이름 할당
-                close_series = df['종가'].rename(ticker)
+        # 각 종목의 가중치(비중) 계산
+        weights = inverse_volatilities / total_inverse_volatilities
 
-                # 데이터 프레임에 병합
-                close_prices_df = pd.concat([close_prices_df, close_series], axis=1)
+        # 결과를 퍼센트(%)로 변환하여 딕셔너리로 반환
+        return (weights * 100).round(2).to_dict()
 
-            # 모든 데이터가 비어있는 열 제거 (예: 거래정지 종목)
-            close_prices_df.dropna(axis=1, how='all', inplace=True)
+    def _run(self, tickers: list[str]) -> str:
+        try:
+            # 최근 3개월 분량의 거래일에 대한 역변동성 비중
+            allocation_dict = self.allocate(tickers)
 
-            if close_prices_df.empty:
+            if not allocation_dict:
                 return "비중을 계산할 유효한 주가 데이터를 가진 종목이 없습니다."
 
-            # 일일 수익률 계산
-            daily_returns = close_prices_df.pct_change().dropna()
-
-            # 각 종목의 변동성(일일 수익률의 표준편차) 계산
-            volatilities = daily_returns.std()
-
-            # 변동성의 역수 계산
-            inverse_volatilities = 1 / volatilities
-
-            # 역변동성의 총합 계산
-            total_inverse_volatilities = inverse_volatilities.sum()
-
-            # 각 종목의 가중치(비중) 계산
-            weights = inverse_volatilities / total_inverse_volatilities
-
-            # 결과를 퍼센트(%)로 변환하여 딕셔너리로 저장
-            allocation_dict = (weights * 100).round(2).to_dict()
+            if self.output_format != 'text':
+                table = pd.DataFrame({'ticker': list(allocation_dict), 'weight_pct': list(allocation_dict.values())})
+                return f"역변동성 전략 기반 포트폴리오 비중 할당 결과: \n{self.table(table)}"
 
             summary_lines = ["역변동성 전략 기반 포트폴리오 비중 할당 결과:"]
             for ticker, weight in allocation_dict.items():
@@ -1,58 +1,107 @@
-import os
-import requests
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from typing import Type
-from dotenv import load_dotenv
+from typing import Optional, Type
 
-load_dotenv()
+from ..analysis.esg_index import ESGRiskScreen
+from ..data.name_resolver import get_name_resolver
+from ..data.news_cache import get_news_cache, PAGE_SIZE
+from .output import CompactOutputTool
 
 class NaverNewsSearchToolInput(BaseModel):
-    query: str = Field(..., description="검색할 키워드 또는 문장")
+    query: str = Field("", description="검색할 키워드 또는 문장")
+    queries: Optional[list[str]] = Field(None, description="여러 키워드를 한 번에 검색할 때 사용하는 검색어 목록")
+    pages: int = Field(1, description=f"검색어마다 가져올 페이지 수 (페이지당 {PAGE_SIZE}건, 더 많은 기사가 필요할 때만 늘리세요)")
 
-class NaverNewsSearchTool(BaseTool):
+class NaverNewsSearchTool(CompactOutputTool):
     name: str = "Naver News Search Tool"
-    description: str = "네이버 뉴스 API를 사용하여 특정 키워드에 대한 최신 뉴스 기사를 검색합니다."
+    description: str = (
+        "네이버 뉴스 API를 사용하여 특정 키워드에 대한 최신 뉴스 기사를 검색합니다. "
+        "여러 키워드는 queries 로 한 번에 검색할 수 있으며, 이미 다른 검색어에서 나온 기사는 다시 표시하지 않습니다."
+    )
     args_schema: Type[BaseModel] = NaverNewsSearchToolInput
 
-    def _run(self, query: str) -> str:
-        client_id = os.getenv("NAVER_CLIENT_ID")
-        client_secret = os.getenv("NAVER_CLIENT_SECRET")
+    def _run(self, query: str = "", queries: Optional[list[str]] = None, pages: int = 1) -> str:
+        queries = [q for q in [query, *(queries or [])] if q and q.strip()]
+        if not queries:
+            return "오류: 검색할 키워드를 입력해주세요."
 
-        if not client_id or not client_secret:
-            return "오류: .env 파일에 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET이 설정되지 않았습니다."
+        try:
+            results = get_news_cache().search_many(queries, pages=pages)
+        except Exception as e:
+            return f"네이버 뉴스 API 요청 중 오류가 발생했습니다: {e}"
 
-        url = "https://openapi.naver.com/v1/search/news.json"
-        headers = {
-            "X-Naver-Client-Id": client_id,
-            "X-Naver-Client-Secret": client_secret,
-        }
+        # 결과를 LLM이 이해하기 쉬운 문자열로 가공 (여러 검색어에 걸친 같은 기사는 한 번만 표시)
+        shown = set()
+        sections = []
+        for q, articles in results.items():
+            if isinstance(articles, Exception):
+                body = f"네이버 뉴스 API 요청 중 오류가 발생했습니다: {articles}"
+            elif not articles:
+                body = "검색된 뉴스 기사가 없습니다."
+            else:
+                new = [article for article in articles if article["link"] not in shown]
+                shown.update(article["link"] for article in new)
+                body = "".join(
+                    f"- 제목: {article['title']}\n"
+                    f"  - 요약: {article['description']}\n"
+                    f"  - 링크: {article['link']}\n\n"
+                    for article in new
+                )
+                if len(new) < len(articles):
+                    body += f"(위 검색 결과와 겹치는 기사 {len(articles) - len(new)}건 생략)\n"
+            sections.append(body if len(results) == 1 else f"[{q}]\n{body}")
 
-        params = {
-            "query": query,
-            "display": 5,
-            "sort": "sim",
-        }
+        return "\n".join(sections)
 
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
 
-            search_results = response.json()
+class ESGRiskScreenToolInput(BaseModel):
+    tickers: list[str] = Field(..., description="ESG 리스크를 점검할 종목 티커 리스트")
+
+class ESGRiskScreenTool(CompactOutputTool):
+    name: str = "ESG Risk Screen Tool"
+    description: str = (
+        "후보 종목 전체의 최신 뉴스를 한 번에 모아, 환경/노동·안전/지배구조 리스크 용어로 종목별 ESG 리스크 점수를 매기고 "
+        "리스크가 의심되는 종목을 플래그합니다. 플래그된 종목만 뉴스 검색으로 심층 조사하면 됩니다."
+    )
+    args_schema: Type[BaseModel] = ESGRiskScreenToolInput
 
-            if not search_results.get('items'):
-                return "검색된 뉴스 기사가 없습니다."
+    # 종목마다 가져올 뉴스 페이지 수
+    news_pages: int = 2
 
-            # 결과를 LLM이 이해하기 쉬운 문자열로 가공
-            result_str = ""
-            for item in search_results['items']:
-                title = item['title'].replace('<b>', '').replace('</b>', '')
-                description = item['description'].replace('<b>', '').replace('</b>', '')
-                result_str += f"- 제목: {title}\n"
-                result_str += f"  - 요약: {description}\n"
-                result_str += f"  - 링크: {item['link']}\n\n"
+    def screen(self, tickers: list[str], screener: ESGRiskScreen = None):
+        """종목별 ESG 리스크 점수표(점수순)와 뉴스 갱신에 실패한 종목의 오류를 반환합니다."""
+        resolver = get_name_resolver()
+        names = {ticker: resolver.name_of(ticker) for ticker in tickers}
 
-            return result_str
+        # 후보 종목 뉴스를 동시에 받아 코퍼스에 쌓은 뒤, 보관 중인 기사 전체로 점수 계산
+        news_cache = get_news_cache()
+        queries = {name: ticker for ticker, name in names.items() if name}
+        fetched = news_cache.search_many(list(queries), pages=self.news_pages) if queries else {}
+        errors = {queries[name]: result for name, result in fetched.items() if isinstance(result, Exception)}
 
+        return (screener or ESGRiskScreen()).screen(names, news_cache.corpus()), errors
+
+    def _run(self, tickers: list[str]) -> str:
+        try:
+            screen = ESGRiskScreen()
+            table, errors = self.screen(tickers, screen)
         except Exception as e:
-            return f"네이버 뉴스 API 요청 중 오류가 발생했습니다: {e}"
\ No newline at end of file
+            return f"ESG 리스크 점검 중 오류가 발생했습니다: {e}"
+
+        flagged = table[table['flagged']]
+        lines = [f"ESG 리스크 점검 결과 (후보 {len(table)}개 중 플래그 {len(flagged)}개, 기준 점수 {screen.threshold:g})"]
+        for row in flagged.itertuples():
+            categories = ", ".join(f"{screen.category_name(c)} {getattr(row, c):.1f}" for c in screen.categories)
+            lines.append(f"- [플래그] {row.name}({row.ticker}): 점수 {row.score:.1f} ({categories}), "
+                         f"관련 기사 {row.risk_articles}/{row.articles}건, 주요 용어: {row.terms}")
+            lines.extend(f"    · {headline}" for headline in row.headlines)
+
+        clear = table[~table['flagged']]
+        if len(clear):
+            lines.append("- 이상 없음: " + ", ".join(
+                f"{row.name or row.ticker}({row.ticker}, 점수 {row.score:.1f}, 기사 {row.articles}건)"
+                for row in clear.itertuples()))
+        if errors:
+            lines.append("- 뉴스 갱신 실패 (보관된 기사 기준으로 점검): " +
+                         ", ".join(f"{ticker}({error})" for ticker, error in errors.items()))
+        return "\n".join(lines)
@@ -1,39 +1,65 @@
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-from pykrx import stock
 from datetime import datetime, timedelta
 import pandas as pd
 import math
 import json
 
+from ..data.calendar import get_calendar
+from ..data.fetcher import get_fetch_executor
+from ..data.ledger import get_ledger
+from ..data.price_store import get_price_store
+from .output import CompactOutputTool
+
+# 간결한 출력 형식에서 쓰는 매매 계획서 컬럼 이름
+PLAN_COLUMNS = {
+    "종목 티커": "ticker",
+    "계산 기준가": "price_krw",
+    "매수 수량": "quantity",
+    "예상 주문 금액": "cost_krw",
+    "포트폴리오 비중": "weight_pct",
+}
+
 class TradingPlannerToolInput(BaseTool):
     portfolio_allocations: dict = Field(..., description="종목 티커와 할당된 비중(%)을 담은 딕셔너리")
     total_capital: int = Field(..., description="투입할 총 자본(원)")
 
-class TradingPlannerTool(BaseTool):
+class TradingPlannerTool(CompactOutputTool):
     name: str = "Trader Execution Planner Tool"
     description: str = "제공된 포트폴리오 비중과 총 자본에 따라, 각 종목의 현재가를 기준으로 매수할 주식 수량을 계산하여 최종 매매 계획을 수립합니다."
     args_schema: Type[BaseTool] = TradingPlannerToolInput
 
-    def _run(self, portfolio_allocations: dict, total_capital: int) -> str:
-
+    def plan(self, portfolio_allocations: dict, total_capital: float):
+        """비중(%)과 총 자본으로 (종목별 계획서 행 목록, BatchTradeExecutorTool 용 주문 목록)을 계산합니다."""
         trade_plan = []
-        today_str = datetime.now().strftime("%Y%m%d")
+        orders = []
+        # 장중이면 당일, 주말/휴장일이면 직전 거래일
+        calendar = get_calendar()
+        session_str = calendar.last_trading_day()
+        # 거래정지 종목이나 장중 아직 당일 일봉이 없는 종목은 직전 거래일 종가 사용
+        fromdate = calendar.trading_days_back(1)
+        price_store = get_price_store()
+
+        def last_close(ticker):
+            df = price_store.get_ohlcv(ticker, fromdate, session_str)
+            if df.empty:
+                raise ValueError(f"{fromdate}~{session_str} 종가가 없습니다.")
+            return df['종가'].iloc[-1]
+
+        # 현재 (또는 가장 최근) 주가를 종목별로 병렬 조회
+        fetched = get_fetch_executor().map(last_close, list(portfolio_allocations))
+        print(fetched.summary(self.name))
 
         for ticker, weight in portfolio_allocations.items():
             try:
+                if ticker in fetched.errors:
+                    raise fetched.errors[ticker]
+
                 # 할당된 금액 계산
                 allocated_capital = total_capital * (weight / 100)
 
-                # 현재 (또는 가장 최근) 주가 조회
-                current_price_df = stock.get_market_ohlcv(today_str, today_str, ticker)
-                if current_price_df.empty:
-                    # 당일 데이터가 없으면 전일 종가 조회
-                    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
-                    current_price_df = stock.get_market_ohlcv(yesterday, yesterday, ticker)
-
-                current_price = current_price_df['종가'].iloc[-1]
+                current_price = fetched.results[ticker]
 
                 if current_price == 0:
                     continue
@@ -53,31 +79,49 @@ class TradingPlannerTool(BaseTool):
                     "포트폴리오 비중": f"{weight:.2f}%"
                 })
 
+                # BatchTradeExecutorTool 에 그대로 넘길 수 있는 구조화된 주문
+                if shares_to_buy > 0:
+                    orders.append({
+                        "ticker": ticker,
+                        "action": "BUY",
+                        "quantity": int(shares_to_buy),
+                        "price": float(current_price)
+                    })
+
             except Exception as e:
                 print(f"티커 {ticker}의 매매 계획 수립 중 오류 발생: {e}")
                 continue
 
+        return trade_plan, orders
+
+    def _run(self, portfolio_allocations: dict, total_capital: int) -> str:
+        trade_plan, orders = self.plan(portfolio_allocations, total_capital)
+
         if not trade_plan:
             return "매매 계획을 수립할 종목이 없습니다."
 
         # 결과를 데이터 프레임으로 변환하여 보기 좋게 출력
         plan_df = pd.DataFrame(trade_plan)
-
-        return f"최종 매매 실행 계획서: \n{plan_df.to_string()}"
-
-class PortfolioReaderTool(BaseTool):
+        if self.output_format != 'text':
+            # 단위 문자열을 뗀 숫자 표 (원, 주, %)
+            plan_df = plan_df.drop(columns=['주문 방식']).rename(columns=PLAN_COLUMNS)
+            for column in ['price_krw', 'quantity', 'cost_krw', 'weight_pct']:
+                plan_df[column] = pd.to_numeric(plan_df[column].str.replace(r'[^0-9.\-]', '', regex=True))
+
+        return (
+            f"최종 매매 실행 계획서 (시장가 매수): \n{self.table(plan_df)}\n\n"
+            f"주문 목록(JSON): {json.dumps(orders, ensure_ascii=False)}"
+        )
+
+class PortfolioReaderTool(CompactOutputTool):
     name: str = "Portfolio Reader Tool"
-    description: str = "현재 보유 금액과 주식 포트폴리오 상태를 JSON 파일에서 읽어옵니다."
+    description: str = "현재 보유 금액과 주식 포트폴리오 상태를 포트폴리오 원장에서 읽어옵니다."
 
     def _run(self) -> str:
         try:
-            with open('portfolio_json', 'r', encoding='utf-8') as f:
-                portfolio = json.load(f)
-
-            return f"현재 포트폴리오 상태: {json.dumps(portfolio, indent=2, ensure_ascii=False)}"
+            portfolio = get_ledger().snapshot()
 
-        except FileNotFoundError:
-            return "오류: portfolio.json 파일을 찾을 수 없습니다."
+            return f"현재 포트폴리오 상태: {self.data(portfolio)}"
 
         except Exception as e:
             return f"포트폴리오 조회 중 오류 발생: {e}"
@@ -88,74 +132,76 @@ class TradeExecutorToolInput(BaseModel):
     action: str = Field(..., description="수행할 동작 ('BUY' 또는 'SELL')")
     price: float = Field(..., description="매매가 체결된 주당 가격")
 
-class TradeExecutorTool(BaseTool):
+class TradeExecutorTool(CompactOutputTool):
     name: str = "Trade Executor Tool"
-    description: str = "계획에 따라 실제 주식 매수 또는 매도 주문을 실행하고, 그 결과를 portfolio.json 파일에 기록합니다."
+    description: str = "계획에 따라 실제 주식 매수 또는 매도 주문을 실행하고, 그 결과를 포트폴리오 원장에 기록합니다."
     args_schema: Type[BaseModel] = TradeExecutorToolInput
 
     def _run(self, ticker: str, quantity: int, action: str, price: float) -> str:
         # 이 도구는 실제 증권사 API와 연동되어야 하지만,
-        # 여기서는 모의 거래로 portfolio.json 파일을 업데이트하는 역할만 합니다.
+        # 여기서는 모의 거래로 포트폴리오 원장을 업데이트하는 역할만 합니다.
+        try:
+            order = {'ticker': ticker, 'quantity': quantity, 'action': action, 'price': price}
+            result = get_ledger().execute([order])[0]
+
+            if result['status'] != 'filled':
+                return f"주문 실패: {result['message']}"
+
+            return f"주문 성공: {ticker} {quantity}주 {action} 완료. 현재 포트폴리오가 업데이트되었습니다."
+
+        except Exception as e:
+            return f"거래 실행 중 오류 발생: {e}"
+
+
+class BatchOrderInput(BaseModel):
+    ticker: str = Field(..., description="매매할 종목의 티커")
+    quantity: int = Field(..., description="매매할 주식의 수량")
+    action: str = Field(..., description="수행할 동작 ('BUY' 또는 'SELL')")
+    price: float = Field(..., description="주당 체결 가격")
+
+class BatchTradeExecutorToolInput(BaseModel):
+    orders: list[BatchOrderInput] = Field(..., description="Trader Execution Planner Tool 이 출력한 '주문 목록(JSON)' 전체")
+
+class BatchTradeExecutorTool(CompactOutputTool):
+    name: str = "Batch Trade Executor Tool"
+    description: str = (
+        "매매 계획의 모든 주문을 한 번에 실행합니다. 현금과 보유 수량을 먼저 전체 검증한 뒤 "
+        "하나의 트랜잭션으로 포트폴리오 원장에 반영하고, 주문별 결과 표를 반환합니다. "
+        "하나라도 검증에 실패하면 어떤 주문도 실행하지 않습니다."
+    )
+    args_schema: Type[BaseModel] = BatchTradeExecutorToolInput
+
+    def _run(self, orders: list) -> str:
         try:
-            with open('portfolio_json', 'r', encoding='utf-8') as f:
-                portfolio = json.load(f)
-
-                if action.upper() == 'BUY':
-                    cost = quantity * price
-                    if portfolio['cash'] < cost:
-                        return f"주문 실패: 현금 부족 (필요: {cost:,.0f}원, 보유: {portfolio['cash']:,.0f}원"
-
-                    portfolio['cash'] -= cost
-
-                    # 이미 보유한 종목인지 확인
-                    found = False
-                    for stock in portfolio['stocks']:
-                        if stock['ticker'] == ticker:
-                            # 평균 매수 단가 재계산
-                            total_cost = (stock['purchase_price'] * stock['quantity']) + cost
-                            total_quantity = stock['quantity'] + quantity
-                            stock['purchase_price'] = total_cost / total_quantity
-                            stock['quantity'] = total_quantity
-                            found = True
-                            break
-                    if not found:
-                        portfolio['stocks'].append({
-                            'ticker': ticker,
-                            'quantity': quantity,
-                            'purchase_price': price
-                        })
-
-                elif action.upper() == 'SELL':
-                    income = quantity * price
-
-                    stock_to_sell = None
-                    for stock in portfolio['stocks']:
-                        if stock['ticker'] == ticker:
-                            stock_to_sell = stock
-                            break
-
-                    if not stock_to_sell:
-                        return f"주문 실패: 보유하지 않은 종목({ticker})입니다."
-
-                    if stock_to_sell['quantity'] < quantity:
-                        return f"주문 실패: 보유 수량 부족 ({ticker} - 보유: {stock_to_sell['quantity']}주, 매도 요청: {quantity}주)"
-
-                    # 보유 수량을 줄이고 현금을 늘립니다.
-                    stock_to_sell['quantity'] -= quantity
-                    portfolio['cash'] += income
-
-                    # 만약 매도 후 수량이 0이 되면 포트폴리오에서 해당 종목을 제거합니다.
-                    if stock_to_sell['quantity'] == 0:
-                        portfolio['stocks'] = [s for s in portfolio['stocks'] if s['ticker'] != ticker]
-
-                else:
-                    return f"주문 실패: 알 수 없는 동작('{action}')입니다. 'BUY' 또는 'SELL'만 가능합니다."
-
-                # 파일의 맨 앞으로 이동하여 덮어쓰기
-                f.seek(0)
-                json.dump(portfolio, f, indent=2, ensure_ascii=False)
-                f.truncate()
-                return f"주문 성공: {ticker} {quantity}주 {action} 완료. 현재 포트폴리오가 업데이트되었습니다."
+            orders = [o.model_dump() if isinstance(o, BaseModel) else dict(o) for o in orders]
+            if not orders:
+                return "실행할 주문이 없습니다."
+
+            # 매도 대금으로 매수할 수 있도록 매도 주문을 먼저 처리하고, 결과는 입력 순서로 되돌림
+            sequence = sorted(range(len(orders)), key=lambda i: str(orders[i].get('action', '')).upper() != 'SELL')
+            queued = [orders[i] for i in sequence]
+
+            ledger = get_ledger()
+            errors = ledger.validate(queued)
+
+            if any(errors):
+                executed = [
+                    dict(order, status='rejected' if error else 'not executed', message=error or '다른 주문 검증 실패로 실행하지 않음')
+                    for order, error in zip(queued, errors)
+                ]
+                header = "일괄 주문 실패: 검증을 통과하지 못한 주문이 있어 어떤 주문도 실행하지 않았습니다."
+            else:
+                executed = ledger.execute(queued)
+                filled = all(r['status'] == 'filled' for r in executed)
+                header = "일괄 주문 성공: 모든 주문이 체결되어 포트폴리오가 업데이트되었습니다." if filled \
+                    else "일괄 주문 실패: 실행 중 거부된 주문이 있어 전체 주문을 되돌렸습니다."
+
+            results = [None] * len(orders)
+            for i, result in zip(sequence, executed):
+                results[i] = result
+            result_df = pd.DataFrame(results)[['ticker', 'action', 'quantity', 'price', 'status', 'message']]
+            cash = ledger.snapshot()['cash']
+            return f"{header}\n{self.table(result_df)}\n\n주문 후 현금: {cash:,.0f}원"
 
         except Exception as e:
-            return f"거래 실행 중 오류 발생: {e}"
\ No newline at end of file
+            return f"일괄 거래 실행 중 오류 발생: {e}"
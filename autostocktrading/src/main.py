@@ -1,45 +1,196 @@
 #!/usr/bin/env python
+import argparse
+import functools
+import os
 import sys
 import time
 import warnings
 
-from apscheduler.schedulers.blocking import BlockingScheduler
-
-from autostocktrading.crew import Autostocktrading
+# crewAI(크루, LLM 캐시, 도구)는 불러오는 데 수 초가 걸리므로 실제로 쓰는 함수 안에서 가져옴
+from autostocktrading import instrumentation
+from autostocktrading.data import replay
+from autostocktrading.data.news_cache import get_news_cache
+from autostocktrading.env import load_env
+from autostocktrading.pipeline import QuantPipeline, DEFAULT_TOP_N, candidate_names, format_report
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-def run_trading_cycle():
+def print_llm_cache_summary():
+    """에이전트별 LLM 응답 캐시 적중/미적중 횟수를 출력하고 다음 사이클을 위해 초기화합니다."""
+    from autostocktrading.llm_cache import get_llm_cache
+    cache = get_llm_cache()
+    if cache is not None:
+        print(cache.summary())
+        cache.reset_stats()
+
+def print_news_quota():
+    """이번 사이클의 네이버 뉴스 API 호출 수와 오늘 누적 사용량을 출력합니다."""
+    print(get_news_cache().quota_report())
+
+def print_tool_output_summary():
+    """도구별 출력 토큰 합계를 출력하고 다음 사이클을 위해 초기화합니다."""
+    from autostocktrading.tools.output import usage_summary, reset_usage
+    print(usage_summary())
+    reset_usage()
+
+def print_instrumentation_summary(error: str = None):
+    """사이클 계측을 끝내고 태스크/에이전트/도구별 시간과 자원 사용량 표를 출력합니다."""
+    cycle = instrumentation.finish_cycle(error)
+    if cycle is not None:
+        print(cycle.summary())
+
+def clear_price_panels():
+    """이번 사이클에서 도구들이 공유한 가격 패널을 비워 다음 사이클이 최신 종가로 다시 만들게 합니다."""
+    from autostocktrading.analysis.price_panel import clear_panel_cache
+    clear_panel_cache()
+
+def run_trading_cycle(max_parallel: int = 1):
     """
     1회 투자 분석 및 실행 사이클을 수행합니다.
+    max_parallel 이 2 이상이면 서로 의존하지 않는 태스크를 동시에 실행합니다.
     """
+    from autostocktrading.crew import Autostocktrading
+
     print("=" * 80)
     print(f"[{time.strftime('%Y-%m%d %H:%M:%S')}] 새로운 투자 사이클을 시작합니다...")
+    # 뉴스 검색 결과는 사이클 안에서만 공유
+    get_news_cache().reset()
+    instrumentation.start_cycle("trading_cycle")
 
     inputs = {
         'market': 'KOSPI'
     }
 
+    error = None
     try:
-        Autostocktrading().crew().kickoff(inputs=inputs)
+        Autostocktrading().crew(max_parallel=max_parallel).kickoff(inputs=inputs)
         print("투자 사이클을 성공적으로 완료했습니다.")
     except Exception as e:
+        error = str(e)
         print(f"투자 사이클 실행 중 오류가 발생했습니다: {e}")
+    print_llm_cache_summary()
+    print_news_quota()
+    print_tool_output_summary()
+    print_instrumentation_summary(error)
+    clear_price_panels()
     print("=" * 80)
 
-if __name__ == '__main__':
-    # 1회만 실행
-    run_trading_cycle()
+def run_fast_cycle(market: str = 'KOSPI', top_n: int = DEFAULT_TOP_N, execute: bool = True, narrative: bool = True):
+    """
+    LLM 없이 정량 파이프라인으로 1회 투자 사이클을 수행합니다.
+    서술형 분석(시장 트렌드, 섹터, ESG)만 LLM 에이전트가 담당하며, narrative=False 이면 생략합니다.
+    """
+    from autostocktrading.crew import Autostocktrading
+    from autostocktrading.tools import get_tool
+
+    print("=" * 80)
+    print(f"[{time.strftime('%Y-%m%d %H:%M:%S')}] 새로운 투자 사이클을 시작합니다... (정량 파이프라인)")
+    # 뉴스 검색 결과는 사이클 안에서만 공유
+    get_news_cache().reset()
+    instrumentation.start_cycle("fast_cycle")
+
+    error = None
+    try:
+        result = QuantPipeline(market=market, top_n=top_n).run()
+
+        report = format_report(result)
+        with open('trading_plan.md', 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(report)
+
+        if execute and result['orders']:
+            print(get_tool('BatchTradeExecutorTool')._run(result['orders']))
+
+        if narrative and result['selected']:
+            inputs = {'market': market, 'candidates': candidate_names(result['selected'])}
+            Autostocktrading().narrative_crew().kickoff(inputs=inputs)
 
+        print("투자 사이클을 성공적으로 완료했습니다.")
+    except Exception as e:
+        error = str(e)
+        print(f"투자 사이클 실행 중 오류가 발생했습니다: {e}")
+    print_llm_cache_summary()
+    print_news_quota()
+    print_tool_output_summary()
+    print_instrumentation_summary(error)
+    clear_price_panels()
+    print("=" * 80)
+
+def run_intraday_check(market: str = 'KOSPI', top_n: int = DEFAULT_TOP_N, path: str = 'intraday_plan.md'):
     """
-    # 스케줄러로 매일 실행
-    scheduler = BlockingScheduler()
-    # 매일 오전 9시 5분에 run_trading_cycle 함수를 실행하도록 스케줄링
-    scheduler.add_job(run_trading_cycle, 'cron', hour=9, minute=5)
+    장중 재점검: 주문 없이 정량 파이프라인으로 매매 계획만 다시 계산해 path 에 기록합니다.
+    아침 크루가 쓴 trading_plan.md 는 건드리지 않으며, 진행 중인 사이클의 뉴스 캐시와 계측도 초기화하지 않습니다.
+    """
+    print(f"[{time.strftime('%Y-%m%d %H:%M:%S')}] 장중 재점검 (주문 없음)")
+    try:
+        report = format_report(QuantPipeline(market=market, top_n=top_n).run())
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(report)
+    except Exception as e:
+        print(f"장중 재점검 중 오류가 발생했습니다: {e}")
+        raise
+
+def run_backtest(fromdate: str, todate: str, market: str = 'KOSPI', top_n: int = DEFAULT_TOP_N, rebalance: str = 'M'):
+    """저장된 일별 시장 스냅샷으로 정량 파이프라인의 팩터 순위 → 역변동성 비중 → 매매 계획 단계를 백테스트합니다."""
+    from autostocktrading.analysis.backtest import Backtester, load_backtest_data
 
-    print("자동 투자 시스템이 시작되었습니다. 매일 오전 9시 5분에 자동으로 실행됩니다.")
+    print("=" * 80)
+    print(f"[백테스트] {market} {fromdate} ~ {todate}, 상위 {top_n}종목, 리밸런싱 {rebalance}")
     try:
-        scheduler.start()
-    except (KeyboardInterrupt, SystemExit):
-        pass
-    """
\ No newline at end of file
+        started = time.perf_counter()
+        data = load_backtest_data(fromdate, todate, market=market)
+        loaded = time.perf_counter()
+        result = Backtester(top_n=top_n, rebalance=rebalance).run(data)
+        print(f"[백테스트] 데이터 적재 {loaded - started:.2f}초, 계산 {time.perf_counter() - loaded:.2f}초 "
+              f"({len(data)}거래일 × {len(data.tickers)}종목)")
+        for name, value in result.stats().items():
+            print(f"  - {name}: {value:,.4f}")
+    except Exception as e:
+        print(f"백테스트 실행 중 오류가 발생했습니다: {e}")
+    print("=" * 80)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AutoStockTrading 투자 사이클")
+    parser.add_argument('--fast', action='store_true', help="LLM 없이 정량 파이프라인으로 실행")
+    parser.add_argument('--no-llm', action='store_true', help="--fast 에서 서술형 분석(트렌드/섹터/ESG)도 생략")
+    parser.add_argument('--dry-run', action='store_true', help="--fast 에서 매매 계획만 세우고 주문은 실행하지 않음")
+    parser.add_argument('--market', default='KOSPI', choices=['KOSPI', 'KOSDAQ'])
+    parser.add_argument('--top-n', type=int, default=DEFAULT_TOP_N, help="--fast 에서 편입할 종목 수")
+    parser.add_argument('--backtest', nargs=2, metavar=('FROM', 'TO'),
+                        help="FROM ~ TO(YYYYMMDD) 기간의 저장된 스냅샷으로 백테스트만 실행")
+    parser.add_argument('--rebalance', default='M', help="--backtest 리밸런싱 주기 (D/W/M/Q 또는 거래일 수)")
+    parser.add_argument('--data-mode', choices=replay.MODES, default=None,
+                        help="외부 데이터 접근 방식 (기본: AUTOSTOCK_DATA_MODE 또는 live). replay 는 기록된 픽스처로 오프라인 실행")
+    parser.add_argument('--daemon', action='store_true',
+                        help="프로세스를 유지하며 config/schedule.yaml 일정대로 장 시작 전 준비, 메인 사이클(--fast 이면 정량 파이프라인), "
+                             "장중 재점검, 상태 점검을 반복 실행")
+    parser.add_argument('--parallel', type=int, default=int(os.getenv('CREW_MAX_PARALLEL', '1')),
+                        help="전체 크루 실행 시 동시에 실행할 태스크 수 (기본 1: 순차 실행)")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    # .env 의 API 키와 캐시 위치를 먼저 읽음
+    load_env()
+    # 데이터 저장소와 도구가 만들어지기 전에 기록/재생 계층을 설정
+    replay.activate(args.data_mode)
+
+    if args.daemon:
+        from autostocktrading.daemon import TradingDaemon
+
+        if args.fast:
+            main_cycle = functools.partial(run_fast_cycle, market=args.market, top_n=args.top_n,
+                                           execute=not args.dry_run, narrative=not args.no_llm)
+        else:
+            main_cycle = functools.partial(run_trading_cycle, max_parallel=args.parallel)
+        # 장중 재점검은 주문 없이 매매 계획만 intraday_plan.md 에 다시 계산
+        intraday = functools.partial(run_intraday_check, market=args.market, top_n=args.top_n)
+        TradingDaemon({"main": main_cycle, "intraday": intraday}, market=args.market, top_n=args.top_n).start()
+    # 1회만 실행
+    elif args.backtest:
+        run_backtest(*args.backtest, market=args.market, top_n=args.top_n, rebalance=args.rebalance)
+    elif args.fast:
+        run_fast_cycle(market=args.market, top_n=args.top_n, execute=not args.dry_run, narrative=not args.no_llm)
+    else:
+        run_trading_cycle(max_parallel=args.parallel)
@@ -0,0 +1,20 @@
+import pytest
+
+from autostocktrading import tools
+from autostocktrading.analysis.price_panel import clear_panel_cache
+from fixtures import loaded_singletons
+
+
+@pytest.fixture
+def fresh_singletons(monkeypatch):
+    """공용 인스턴스와 가격 패널 캐시를 비우고, 테스트 중 다시 비울 수 있는 함수(새 프로세스 가정)를 넘깁니다."""
+    def fresh():
+        for module, name in loaded_singletons():
+            monkeypatch.setattr(module, name, None)
+        clear_panel_cache()
+        tools.reset_tools()
+
+    fresh()
+    yield fresh
+    clear_panel_cache()
+    tools.reset_tools()
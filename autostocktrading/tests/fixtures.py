@@ -0,0 +1,126 @@
+"""테스트와 벤치마크가 함께 쓰는 KRX 픽스처 백엔드와 공용 인스턴스 목록. (테스트는 fixtures, 벤치마크는 tests.fixtures 로 불러옴)
+
+pykrx.stock 과 같은 함수 이름, 같은 컬럼 이름의 DataFrame 을 돌려주는 결정적 시장 데이터입니다.
+같은 티커와 날짜에는 항상 같은 값을 돌려주므로 버전 간 벤치마크 결과를 그대로 비교할 수 있고,
+엔드포인트별 호출 수(calls)를 세어 네트워크 호출 수를 측정합니다.
+latency 를 지정하면 호출마다 그만큼 대기하여 실제 KRX 응답 지연을 흉내 냅니다.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# 새 프로세스처럼 비워야 하는 공용 인스턴스 (모듈 이름, 변수 이름)
+SINGLETONS = [
+    ("autostocktrading.data.calendar", "_default_calendar"),
+    ("autostocktrading.data.price_store", "_default_store"),
+    ("autostocktrading.data.snapshot_store", "_default_store"),
+    ("autostocktrading.data.ledger", "_default_ledger"),
+    ("autostocktrading.data.fetcher", "_rate_limiter"),
+    ("autostocktrading.data.http_client", "_default_client"),
+    ("autostocktrading.data.news_cache", "_default_cache"),
+    ("autostocktrading.data.name_resolver", "_default_resolver"),
+    ("autostocktrading.data.sector_index", "_default_index"),
+    ("autostocktrading.data.macro_store", "_default_store"),
+    ("autostocktrading.llm_cache", "_default_cache"),
+]
+
+
+def loaded_singletons() -> list:
+    """SINGLETONS 중 이미 불러온 모듈의 (모듈, 변수 이름). 아직 불러오지 않은 모듈은 처음 불러올 때 비어 있음"""
+    return [(sys.modules[module], name) for module, name in SINGLETONS if module in sys.modules]
+
+
+class FixtureKrx:
+    """KOSPI 에 tickers 개 종목이 상장된 결정적 시장 (krx.use_backend() 로 주입)"""
+
+    def __init__(self, tickers: int = 1000, latency: float = 0.0):
+        self.tickers = [f"{100000 + i * 10:06d}" for i in range(tickers)]
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        k = np.arange(tickers)
+        self._base = 5000.0 + (k * 7919) % 200000
+        self._period = 3.0 + k % 11
+        self._phase = k * 0.37
+        self._index = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    def _hit(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset_calls(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _closes(self, dates: pd.DatetimeIndex, cols) -> np.ndarray:
+        """(날짜 × 종목) 종가. 종목마다 주기와 위상이 다른 파동에 작은 고주파 성분을 더한 값"""
+        t = np.asarray(dates.map(pd.Timestamp.toordinal), dtype=np.float64)[:, None]
+        wave = 0.1 * np.sin(t / self._period[cols] + self._phase[cols]) + 0.02 * np.sin(t * 1.7 + self._phase[cols])
+        return np.round(self._base[cols] * np.exp(wave))
+
+    def get_previous_business_days(self, fromdate, todate):
+        self._hit("get_previous_business_days")
+        return list(pd.bdate_range(fromdate, todate))
+
+    def get_market_ticker_list(self, date=None, market="KOSPI"):
+        self._hit("get_market_ticker_list")
+        return list(self.tickers) if market == "KOSPI" else []
+
+    def get_market_ticker_name(self, ticker):
+        return f"종목{ticker}"
+
+    def get_market_ohlcv(self, *args, market=None):
+        self._hit("get_market_ohlcv")
+        if market is not None:
+            # 시장 전체 하루치 스냅샷
+            if market != "KOSPI":
+                return pd.DataFrame()
+            close = self._closes(pd.DatetimeIndex([pd.Timestamp(args[0])]), slice(None))[0]
+            return pd.DataFrame({"시가": close, "고가": close, "저가": close, "종가": close,
+                                 "거래량": 1000, "거래대금": close * 1000, "등락률": 0.0},
+                                index=pd.Index(self.tickers, name="티커"))
+        fromdate, todate, ticker = args
+        dates = pd.bdate_range(fromdate, todate, name="날짜")
+        close = self._closes(dates, [self._index[ticker]])[:, 0]
+        return pd.DataFrame({"시가": close, "고가": close, "저가": close, "종가": close, "거래량": 1000},
+                            index=dates)
+
+    def get_market_cap(self, date, market="KOSPI"):
+        self._hit("get_market_cap")
+        shares = 1e6 + np.arange(len(self.tickers)) * 1e4
+        close = self._closes(pd.DatetimeIndex([pd.Timestamp(date)]), slice(None))[0]
+        return pd.DataFrame({"시가총액": close * shares, "거래량": 1000, "거래대금": close * 1000,
+                             "상장주식수": shares}, index=pd.Index(self.tickers, name="티커"))
+
+    def get_market_fundamental(self, date, market="KOSPI"):
+        self._hit("get_market_fundamental")
+        k = np.arange(len(self.tickers))
+        bps = 10000.0 + (k * 613) % 40000
+        eps = np.where(k % 9 == 0, -500.0, 500.0 + (k * 271) % 5000)
+        close = self._closes(pd.DatetimeIndex([pd.Timestamp(date)]), slice(None))[0]
+        return pd.DataFrame({
+            "BPS": bps, "PER": np.where(eps > 0, close / eps, 0.0), "PBR": close / bps, "EPS": eps,
+            "DIV": (k % 50) / 10.0, "DPS": (k % 50) * 10.0,
+        }, index=pd.Index(self.tickers, name="티커"))
+
+    def get_market_trading_value_by_date(self, fromdate, todate, ticker):
+        self._hit("get_market_trading_value_by_date")
+        dates = pd.bdate_range(fromdate, todate, name="날짜")
+        k = self._index[ticker]
+        t = np.asarray(dates.map(pd.Timestamp.toordinal), dtype=np.float64)
+        return pd.DataFrame({
+            "기관계": 1e8 * np.sin(t / 5 + k),
+            "기타법인": 0.0,
+            "개인": -2e8 * np.sin(t / 5 + k),
+            "외국인": 1e8 * np.cos(t / 7 + k),
+        }, index=dates)
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autostocktrading.analysis.backtest import (
+    Backtester, BacktestData, load_backtest_data, performance, rebalance_indices, sweep
+)
+from autostocktrading.data import krx
+
+FACTORS = {"normalization": "percentile", "factors": {"PER": {"weight": 1, "direction": "low"}}}
+NO_COSTS = {"fee_rate": 0, "tax_rate": 0, "slippage": 0}
+
+
+def _data(closes: dict, per: dict, start="2024-01-02") -> BacktestData:
+    dates = pd.bdate_range(start, periods=len(next(iter(closes.values()))))
+    frame = pd.DataFrame(closes, index=dates)
+    per = pd.DataFrame(per, index=dates).reindex(columns=frame.columns)
+    return BacktestData(frame, {"PER": per.values})
+
+
+def _random_data(days=300, tickers=12, seed=1) -> BacktestData:
+    rng = np.random.default_rng(seed)
+    names = [f"{i:06d}" for i in range(tickers)]
+    vol = np.linspace(0.005, 0.03, tickers)
+    closes = 10000 * np.exp(np.cumsum(rng.normal(0.0003, vol, (days, tickers)), axis=0))
+    per = 5 + 20 * rng.random((days, tickers))
+    return _data(dict(zip(names, closes.T)), dict(zip(names, per.T)))
+
+
+def test_rebalance_schedule():
+    sessions = [d.strftime("%Y%m%d") for d in pd.bdate_range("2024-01-29", "2024-03-05")]
+    months = [sessions[i] for i in rebalance_indices(sessions, "M")]
+    assert months == ["20240129", "20240201", "20240301"]
+    assert list(rebalance_indices(sessions, 10)) == [0, 10, 20]
+    assert rebalance_indices(sessions, "W")[:2].tolist() == [0, 5]
+    with pytest.raises(ValueError):
+        rebalance_indices(sessions, "Y")
+
+
+def test_single_stock_matches_buy_and_hold_share_rounding():
+    closes = {"A": [990.0, 1010.0, 1000.0, 1100.0, 1210.0, 1000.0]}
+    data = _data(closes, {"A": [10.0] * 6})
+    result = Backtester(top_n=1, rebalance=2, lookback=5, initial_capital=10_500, signal_lag=0,
+                        factor_config=FACTORS, **NO_COSTS).run(data)
+
+    # 첫날은 변동성을 계산할 수익률이 없어 현금 보유, 셋째 날 1,000원에 10주 매수 후 500원은 현금
+    # 다섯째 날 리밸런싱에서도 목표 수량이 10주로 같아 거래 없음
+    assert result.trades.to_dict("records") == [{"date": "20240104", "ticker": "A", "shares": 10, "price": 1000.0}]
+    assert result.equity.tolist() == [10_500, 10_500, 10_500, 11_500, 12_600, 10_500]
+    assert performance(result.equity)["max_drawdown"] == pytest.approx(10_500 / 12_600 - 1)
+
+
+def test_uses_lagged_ranking_inverse_vol_weights_and_costs():
+    # B 는 PER 이 가장 낮지만 마지막 날에만 낮아짐 → signal_lag=1 이면 아직 편입되지 않음
+    closes = {"A": [100.0, 101, 100, 101, 100, 101], "B": [100.0, 102, 100, 102, 100, 102],
+              "C": [100.0, 104, 100, 104, 100, 104]}
+    per = {"A": [5.0] * 6, "B": [9.0] * 5 + [1.0], "C": [6.0] * 6}
+    data = _data(closes, per)
+    tester = Backtester(top_n=2, rebalance=5, lookback=5, initial_capital=1_000_000, signal_lag=1,
+                        factor_config=FACTORS, **NO_COSTS)
+    result = tester.run(data)
+
+    held = result.trades[result.trades["date"] == "20240109"].set_index("ticker")["shares"]
+    assert set(held.index) == {"A", "C"}
+    # 변동성이 낮은 A 에 더 많은 금액
+    assert held["A"] * 100 > held["C"] * 100 * 3
+
+    costly = Backtester(top_n=2, rebalance=5, lookback=5, initial_capital=1_000_000, signal_lag=1,
+                        factor_config=FACTORS).run(data)
+    assert costly.stats()["costs"] > 0
+    assert costly.equity.iloc[-1] < result.equity.iloc[-1]
+    assert (costly.rebalances["cash"] >= 0).all()
+
+
+def test_sweep_runs_parameter_grid_in_processes():
+    data = _random_data()
+    grid = {"top_n": [3, 6], "rebalance": ["M", 20], "factor_config": [FACTORS]}
+    parallel = sweep(data, grid, max_workers=2)
+    serial = sweep(data, grid, max_workers=1)
+
+    assert len(parallel) == 4 and "error" not in parallel.columns
+    assert parallel["sharpe"].is_monotonic_decreasing
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+class FakeSnapshots:
+    def __init__(self, kosdaq_only=()):
+        self.calls = 0
+        # KOSPI 종목 없이 KOSDAQ 종목만 있는 날짜
+        self.kosdaq_only = set(kosdaq_only)
+
+    def get_previous_business_days(self, fromdate, todate):
+        return list(pd.bdate_range(fromdate, todate))
+
+    def get_market_ohlcv(self, date, market):
+        self.calls += 1
+        if date in self.kosdaq_only:
+            if market != "KOSDAQ":
+                return pd.DataFrame()
+            return pd.DataFrame({"종가": [500.0]}, index=pd.Index(["900010"], name="티커"))
+        if market != "KOSPI":
+            return pd.DataFrame()
+        day = pd.Timestamp(date).day
+        return pd.DataFrame({"종가": [1000.0 + day, 2000.0 - day]}, index=pd.Index(["000010", "000020"], name="티커"))
+
+    def get_market_cap(self, date, market):
+        return pd.DataFrame({"시가총액": 1e12, "상장주식수": 1e8}, index=pd.Index(["000010", "000020"]))
+
+    def get_market_fundamental(self, date, market):
+        return pd.DataFrame({"BPS": 1000.0, "PER": [5.0, 8.0], "PBR": 1.0, "EPS": 100.0, "DIV": 2.0, "DPS": 10.0},
+                            index=pd.Index(["000010", "000020"]))
+
+
+def test_loads_panels_from_snapshot_store(tmp_path, monkeypatch, fresh_singletons):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    fake = FakeSnapshots()
+    krx.use_backend(fake)
+    try:
+        data = load_backtest_data("20240102", "20240105")
+        calls = fake.calls
+        again = load_backtest_data("20240102", "20240105")
+    finally:
+        krx.use_backend(None)
+
+    assert data.sessions == ["20240102", "20240103", "20240104", "20240105"]
+    assert data.closes["000010"].tolist() == [1002.0, 1003.0, 1004.0, 1005.0]
+    assert data.snapshot(0).loc["000020", "PER"] == 8.0
+    # 확정된 날짜의 스냅샷은 디스크에서 다시 읽음
+    assert fake.calls == calls
+    pd.testing.assert_frame_equal(again.closes, data.closes)
+
+
+def test_days_without_market_rows_drop_out_of_every_panel(tmp_path, monkeypatch, fresh_singletons):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    krx.use_backend(FakeSnapshots(kosdaq_only={"20240103"}))
+    try:
+        data = load_backtest_data("20240102", "20240105")
+    finally:
+        krx.use_backend(None)
+
+    # 20240103 스냅샷은 KOSDAQ 종목만 있어 KOSPI 백테스트에서는 날짜째로 빠짐
+    assert data.sessions == ["20240102", "20240104", "20240105"]
+    assert data.closes["000010"].tolist() == [1002.0, 1004.0, 1005.0]
+    assert data.fields["PER"].shape == data.closes.shape
+    assert list(data.closes.columns) == ["000010", "000020"]
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from benchmarks.bench_tools import compare, run_benchmarks, save
+
+
+def test_benchmark_reports_latency_memory_and_network_calls(tmp_path):
+    report = run_benchmarks(sizes=[5, 10], tools=["ValuationTool", "RiskAnalysisTool"])
+    results = {(r["tool"], r["tickers"]): r for r in report["results"]}
+
+    assert set(results) == {("ValuationTool", 5), ("ValuationTool", 10), ("RiskAnalysisTool", 5), ("RiskAnalysisTool", 10)}
+    # 가치 평가는 종목 수와 무관하게 시장 스냅샷만, 리스크 분석은 종목마다 일봉을 한 번씩 조회
+    assert results["ValuationTool", 5]["network_calls"] == results["ValuationTool", 10]["network_calls"]
+    assert results["RiskAnalysisTool", 10]["calls_by_endpoint"]["get_market_ohlcv"] == 10
+    # 두 번째 호출은 로컬 캐시에서 처리
+    assert all(r["warm_network_calls"] == 0 for r in report["results"])
+    assert all(r["peak_mb"] > 0 and r["cold_s"] > 0 for r in report["results"])
+
+    path = save(report, str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["results"] == report["results"]
+
+
+def test_compare_flags_slower_or_chattier_tools():
+    row = {"tool": "AllocationTool", "tickers": 100, "cold_s": 1.0, "warm_s": 0.01, "peak_mb": 10.0,
+           "network_calls": 102, "warm_network_calls": 0}
+    baseline = {"results": [row]}
+
+    assert compare({"results": [dict(row, cold_s=1.1, warm_s=0.012)]}, baseline) == []
+    regressions = compare({"results": [dict(row, cold_s=1.5, warm_network_calls=100)]}, baseline)
+    assert regressions == ["AllocationTool 100종목 cold_s: 1.0 → 1.5",
+                           "AllocationTool 100종목 warm_network_calls: 0 → 100"]
+
+
+def test_unknown_tool_is_rejected():
+    with pytest.raises(ValueError, match="NoSuchTool"):
+        run_benchmarks(sizes=[5], tools=["NoSuchTool"])
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from autostocktrading.data import krx
+from autostocktrading.data.calendar import TradingCalendar
+
+
+class FakeStock:
+    """2024-01-01 과 2024-02-09~12(설 연휴)를 휴장일로 하는 영업일 조회"""
+
+    HOLIDAYS = {"20240101", "20240209", "20240212"}
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_previous_business_days(self, fromdate, todate):
+        self.calls += 1
+        return [d for d in pd.bdate_range(fromdate, todate) if d.strftime("%Y%m%d") not in self.HOLIDAYS]
+
+
+def test_calendar_resolves_sessions_and_caches(tmp_path):
+    fake = FakeStock()
+    krx.use_backend(fake)
+    try:
+        calendar = TradingCalendar(path=str(tmp_path / "calendar.json"))
+        assert calendar.last_trading_day("20240212") == "20240208"
+        assert calendar.sessions("20240101", "20240105") == ["20240102", "20240103", "20240104", "20240105"]
+        assert calendar.trading_days_back(2, asof="20240213") == "20240207"
+        assert not calendar.is_session("20240210")
+
+        # 다른 프로세스에서도 이미 받은 구간은 다시 요청하지 않음
+        calls = fake.calls
+        reloaded = TradingCalendar(path=str(tmp_path / "calendar.json"))
+        assert reloaded.sessions("20240102", "20240208")[-1] == "20240208"
+        assert fake.calls == calls
+    finally:
+        krx.use_backend(None)
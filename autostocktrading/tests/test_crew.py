@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+from crewai import LLM, Agent, Task
+
+from autostocktrading.crew import DagCrew
+from autostocktrading.data.replay import OFFLINE_ENV
+
+
+class StubLLM(LLM):
+    """받은 프롬프트를 기록하고 태스크 설명을 그대로 최종 답으로 돌려주는 LLM 스텁"""
+
+    def __init__(self, log: list, **kwargs):
+        super().__init__(model="stub/dag", **kwargs)
+        self.log = log
+        self.lock = threading.Lock()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        with self.lock:
+            self.log.append((from_task.name, prompt))
+        return f"Thought: 바로 답합니다.\nFinal Answer: {from_task.name} 결과"
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name, value in OFFLINE_ENV.items():
+        monkeypatch.setenv(name, value)
+
+
+def test_two_branch_dag_runs_in_dependency_order_and_passes_context(offline):
+    log = []
+
+    def stub_agent(role):
+        return Agent(role=role, goal=f"{role} 수행", backstory="테스트용 에이전트", llm=StubLLM(log), verbose=False)
+
+    def stub_task(name, context=None):
+        return Task(name=name, description=f"{name} 태스크", expected_output=f"{name} 결과",
+                    agent=stub_agent(name), context=context)
+
+    # valuation 뒤에 esg 와 insider 가 서로 의존하지 않는 두 갈래로 진행되고 allocation 에서 합쳐짐
+    valuation = stub_task("valuation")
+    esg = stub_task("esg", context=[valuation])
+    insider = stub_task("insider", context=[valuation])
+    allocation = stub_task("allocation", context=[esg, insider])
+    tasks = [valuation, esg, insider, allocation]
+
+    crew = DagCrew(agents=[task.agent for task in tasks], tasks=tasks, max_parallel=2, verbose=False)
+    output = crew.kickoff()
+
+    order = [name for name, _ in log]
+    assert order[0] == "valuation" and order[-1] == "allocation"
+    assert set(order[1:3]) == {"esg", "insider"}
+
+    prompts = dict(log)
+    # 각 태스크는 context 로 지정한 선행 태스크의 결과만 받음
+    assert "valuation 결과" in prompts["esg"] and "insider 결과" not in prompts["esg"]
+    assert "valuation 결과" in prompts["insider"] and "esg 결과" not in prompts["insider"]
+    assert "esg 결과" in prompts["allocation"] and "insider 결과" in prompts["allocation"]
+    assert "valuation 결과" not in prompts["allocation"]
+
+    # 결과는 tasks.yaml 순서로 모임
+    assert [task.raw for task in output.tasks_output] == [f"{task.name} 결과" for task in tasks]
+    assert output.raw == "allocation 결과"
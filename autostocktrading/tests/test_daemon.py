@@ -0,0 +1,141 @@
+import json
+import threading
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from autostocktrading import instrumentation
+from autostocktrading.analysis import price_panel
+from autostocktrading.daemon import load_schedule, TradingDaemon
+from autostocktrading.data import calendar, http_client, krx, news_cache, snapshot_store
+from autostocktrading.data.http_client import HttpClient, StubTransport
+from autostocktrading.pipeline import QuantPipeline
+from fixtures import FixtureKrx
+
+OLLAMA = "http://localhost:11434"
+
+@pytest.fixture
+def market(tmp_path, monkeypatch, fresh_singletons):
+    """FixtureKrx 시장과 로컬 Ollama 응답을 흉내 내는 HTTP 스텁"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("PORTFOLIO_DB", str(tmp_path / "portfolio.db"))
+    monkeypatch.setenv("PORTFOLIO_JSON", str(tmp_path / "seed.json"))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    for name in ("BOK_API_KEY", "FRED_API_KEY", "AUTOSTOCK_DATA_MODE"):
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / "seed.json").write_text(json.dumps({"cash": 50_000_000, "stocks": []}))
+
+    transport = StubTransport().add(f"{OLLAMA}/api/generate", {"done": True}) \
+        .add(f"{OLLAMA}/api/tags", {"models": [{"name": "exaone-deep:latest"}]})
+    monkeypatch.setattr(http_client, "_default_client", HttpClient(transport=transport, root=str(tmp_path / "http")))
+    krx.use_backend(FixtureKrx(tickers=20))
+    yield transport
+    krx.use_backend(None)
+
+
+def test_main_job_warms_caches_once_and_loads_model(market, capsys):
+    ran = []
+
+    def intraday():
+        QuantPipeline(top_n=3).run()
+        ran.append("intraday")
+
+    daemon = TradingDaemon({"main": lambda: ran.append("main"), "intraday": intraday}, config=load_schedule(), top_n=3)
+
+    assert daemon.run_job("main")
+    # 오늘 준비가 없었으므로 메인 사이클 전에 먼저 준비
+    assert ran == ["main"] and daemon.warm_day is not None
+    assert f"{OLLAMA}/api/generate" in market.calls
+    assert snapshot_store.get_snapshot_store()._snapshots
+
+    # 같은 날의 다음 작업은 준비를 반복하지 않고, 장중 재점검은 준비된 스냅샷과 일봉을 재사용해
+    # 장중에 바뀌는 티커 목록과 수급만 다시 조회
+    backend = krx.backend()
+    backend.reset_calls()
+    assert daemon.run_job("intraday") and daemon.run_job("main")
+    assert set(backend.calls) == {"get_market_ticker_list", "get_market_trading_value_by_date"}
+    assert ran == ["main", "intraday", "main"]
+    assert daemon.status["main"]["runs"] == 2 and daemon.status["main"]["last_error"] is None
+    assert "[데몬] 장 시작 전 준비" in capsys.readouterr().out
+
+
+def test_intraday_check_keeps_morning_plan_and_shared_state(market, tmp_path):
+    import main
+
+    (tmp_path / "trading_plan.md").write_text("아침 계획", encoding="utf-8")
+    news = news_cache.get_news_cache()
+    news._pages[("반도체", 0)] = []
+    cycle = instrumentation.start_cycle("trading_cycle", trace_dir=str(tmp_path / "traces"))
+    try:
+        main.run_intraday_check(top_n=3)
+        assert (tmp_path / "trading_plan.md").read_text(encoding="utf-8") == "아침 계획"
+        assert (tmp_path / "intraday_plan.md").read_text(encoding="utf-8")
+        assert instrumentation.current_cycle() is cycle
+        assert ("반도체", 0) in news_cache.get_news_cache()._pages
+    finally:
+        instrumentation.finish_cycle()
+
+
+def test_cycle_clears_shared_price_panels(market):
+    import main
+
+    price_panel._panel_cache[("100000",), "20240102", "20240103"] = price_panel.PricePanel([], [], [])
+    main.run_fast_cycle(top_n=3, execute=False, narrative=False)
+    assert not price_panel._panel_cache
+
+
+def test_overlapping_jobs_are_skipped(market):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_cycle():
+        started.set()
+        release.wait(5)
+
+    daemon = TradingDaemon({"main": slow_cycle, "intraday": lambda: None}, config=load_schedule())
+    daemon.warm_day = calendar.current_time().strftime(calendar.DATE_FORMAT)
+    worker = threading.Thread(target=daemon.run_job, args=("main",))
+    worker.start()
+    assert started.wait(5)
+
+    assert daemon.run_job("intraday") is False
+    # 상태 점검은 실행 중인 작업과 동시에 실행됨
+    assert daemon.run_job("health") and daemon.health["running"] == "main"
+    release.set()
+    worker.join(5)
+    assert daemon.status["intraday"] == {"runs": 0, "skipped": 1, "failures": 0}
+    assert daemon.status["main"]["runs"] == 1
+
+
+def test_health_reports_failures_and_writes_status(market, tmp_path):
+    daemon = TradingDaemon({"main": lambda: 1 / 0, "intraday": lambda: None}, config=load_schedule())
+    daemon.warm_day = calendar.current_time().strftime(calendar.DATE_FORMAT)
+
+    health = daemon.check_health()
+    assert health["healthy"] and health["checks"]["ledger"]["detail"] == "현금 50,000,000원"
+
+    assert daemon.run_job("main") is False
+    market.routes.clear()
+    market.add(f"{OLLAMA}/api/tags", {"models": [{"name": "llama3:8b"}]})
+    health = daemon.check_health()
+    assert not health["healthy"]
+    assert not health["checks"]["llm"]["ok"] and not health["checks"]["jobs"]["ok"]
+    assert "division by zero" in health["jobs"]["main"]["last_error"]
+
+    with open(tmp_path / "cache" / "daemon" / "health.json", encoding="utf-8") as f:
+        assert json.load(f)["checks"]["llm"]["detail"] == "Ollama 에 exaone-deep 모델이 없습니다."
+
+
+def test_schedule_registers_single_instance_jobs():
+    config = load_schedule()
+    daemon = TradingDaemon({"main": lambda: None, "intraday": lambda: None}, config=config)
+    scheduler = BackgroundScheduler(timezone=config["timezone"])
+    daemon.schedule(scheduler)
+
+    jobs = {job.id: job for job in scheduler.get_jobs()}
+    assert set(jobs) == {"prefetch", "main", "intraday", "health"}
+    assert all(job.max_instances == 1 and job.coalesce for job in jobs.values())
+    assert str(jobs["main"].trigger) == "cron[day_of_week='mon-fri', hour='9', minute='5']"
+
+    with pytest.raises(ValueError, match="intraday"):
+        TradingDaemon({"main": lambda: None}, config=config)
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from autostocktrading.dag import DagExecutor
+
+# valuation 이후 esg 와 insider → risk 가 동시에 진행될 수 있는 그래프
+GRAPH = {
+    "valuation": [],
+    "esg": ["valuation"],
+    "insider": ["valuation"],
+    "risk": ["insider"],
+    "allocation": ["valuation", "esg", "insider", "risk"],
+}
+DURATIONS = {"valuation": 0.05, "esg": 0.3, "insider": 0.1, "risk": 0.1, "allocation": 0.05}
+
+
+def _runner(log):
+    lock = threading.Lock()
+    active = [0]
+
+    def run(node):
+        with lock:
+            active[0] += 1
+            log.append(("start", node, active[0]))
+        time.sleep(DURATIONS[node])
+        with lock:
+            active[0] -= 1
+            log.append(("end", node, active[0]))
+        return node.upper()
+
+    return run
+
+
+def test_independent_nodes_run_concurrently_and_respect_dependencies():
+    log = []
+    result = DagExecutor(GRAPH, max_parallel=3).run(_runner(log))
+
+    assert result.results == {node: node.upper() for node in GRAPH}
+    assert max(active for _, _, active in log) == 2
+
+    events = [(kind, node) for kind, node, _ in log]
+    for node, deps in GRAPH.items():
+        for dep in deps:
+            assert events.index(("end", dep)) < events.index(("start", node))
+
+    # 임계 경로는 가장 오래 걸리는 esg 를 지나는 사슬
+    length, path = result.critical_path()
+    assert path == ["valuation", "esg", "allocation"]
+    assert result.elapsed < result.serial_time
+    assert length == pytest.approx(result.elapsed, abs=0.1)
+
+
+def test_max_parallel_one_runs_serially():
+    log = []
+    result = DagExecutor(GRAPH, max_parallel=1).run(_runner(log))
+    assert max(active for _, _, active in log) == 1
+    assert len(result.results) == len(GRAPH)
+
+
+def test_failed_node_skips_dependents():
+    def run(node):
+        if node == "insider":
+            raise RuntimeError("수급 조회 실패")
+        return node
+
+    result = DagExecutor(GRAPH, max_parallel=2).run(run)
+    assert set(result.results) == {"valuation", "esg"}
+    assert isinstance(result.errors["insider"], RuntimeError)
+    assert sorted(result.skipped) == ["allocation", "risk"]
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        DagExecutor({"a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError):
+        DagExecutor({"a": ["missing"]})
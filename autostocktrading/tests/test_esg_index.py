@@ -0,0 +1,107 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from autostocktrading.analysis.esg_index import ESGRiskScreen, NewsIndex
+from autostocktrading.data import calendar, http_client, krx, name_resolver, news_cache
+from autostocktrading.data.http_client import HttpClient, StubTransport
+from autostocktrading.data.name_resolver import NameResolver
+from autostocktrading.data.news_cache import NewsCache, NEWS_URL
+from autostocktrading.tools.search_tools import ESGRiskScreenTool
+
+LEXICON = {
+    "threshold": 3,
+    "half_life_days": 30,
+    "categories": {
+        "environment": {"name": "환경", "terms": {"폐수": 2}},
+        "governance": {"name": "지배구조", "terms": {"횡령": 3, "일감 몰아주기": 2}},
+    },
+}
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _article(title, days_ago=0, link=None):
+    return {"title": title, "description": "", "link": link or title,
+            "pub_date": format_datetime(NOW - timedelta(days=days_ago))}
+
+
+def test_index_matches_terms_regardless_of_spacing():
+    index = NewsIndex([_article("가나전자 일감몰아주기 의혹"), _article("가나 전자, 신제품 출시"), _article("다라화학")])
+    assert index.lookup("가나전자") == {0, 1}
+    assert index.lookup("일감 몰아주기") == {0}
+    assert index.lookup("횡령") == set()
+
+
+def test_screen_scores_all_candidates_in_one_pass():
+    articles = [
+        _article("가나전자 대표 횡령 혐의"),
+        _article("가나전자 공장 폐수 유출", days_ago=30),   # 반감기만큼 지나 절반만 반영
+        _article("다라화학 실적 개선"),
+        _article("마바산업 폐수 논란"),
+    ]
+    table = ESGRiskScreen(LEXICON).screen({"A": "가나전자", "B": "다라화학", "C": "마바산업"},
+                                          articles, now=NOW.timestamp())
+
+    assert list(table["ticker"]) == ["A", "C", "B"]
+    first = table.iloc[0]
+    assert first["score"] == pytest.approx(4.0)
+    assert first["governance"] == pytest.approx(3.0) and first["environment"] == pytest.approx(1.0)
+    assert bool(first["flagged"]) and first["headlines"][0] == "가나전자 대표 횡령 혐의"
+    assert list(table["flagged"]) == [True, False, False]
+    assert table.set_index("ticker").loc["B", "articles"] == 1
+
+
+class FakeNames:
+    NAMES = {"000010": "가나전자", "000020": "다라화학"}
+
+    def get_previous_business_days(self, fromdate, todate):
+        return list(pd.bdate_range(fromdate, todate))
+
+    def get_market_ticker_list(self, date, market):
+        return list(self.NAMES) if market == "KOSPI" else []
+
+    def get_market_ticker_name(self, ticker):
+        return self.NAMES[ticker]
+
+
+def test_tool_refreshes_candidate_news_and_reports_flags(tmp_path, monkeypatch):
+    monkeypatch.setenv("NAVER_CLIENT_ID", "id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "secret")
+    now = format_datetime(datetime.now(timezone.utc))
+    items = [{"title": "가나전자 <b>횡령</b>·배임 혐의 압수수색", "description": "", "pubDate": now,
+              "originallink": "https://press.example/1"}]
+    transport = StubTransport().add(NEWS_URL + "?query=%EA%B0%80", {"items": items}).add(NEWS_URL, {"items": []})
+    monkeypatch.setattr(http_client, "_default_client",
+                        HttpClient(transport=transport, root=str(tmp_path / "http"), backoff=0))
+    monkeypatch.setattr(news_cache, "_default_cache", NewsCache(root=str(tmp_path / "news")))
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(calendar, "_default_calendar", None)
+    monkeypatch.setattr(name_resolver, "_default_resolver", NameResolver(root=str(tmp_path / "names")))
+    krx.use_backend(FakeNames())
+    try:
+        report = ESGRiskScreenTool()._run(["000010", "000020"])
+    finally:
+        krx.use_backend(None)
+
+    assert "플래그 1개" in report
+    assert "[플래그] 가나전자(000010)" in report and "횡령(1)" in report
+    assert "이상 없음: 다라화학(000020" in report
+    # 받은 기사는 코퍼스에 남아 다음 점검에 재사용
+    assert len(news_cache._default_cache.corpus()) == 1
+
+
+def test_corpus_keeps_latest_copy_within_retention(tmp_path):
+    cache = NewsCache(client=HttpClient(transport=StubTransport(), root=str(tmp_path / "http")),
+                      root=str(tmp_path / "news"))
+    cache._record([{"title": "a", "link": "1"}, {"title": "b", "link": "2"}])
+    cache._record([{"title": "a2", "link": "1"}])
+    assert sorted(a["title"] for a in cache.corpus()) == ["a2", "b"]
+
+    cache.corpus_days = 0
+    time.sleep(0.01)
+    cache.compact()
+    assert cache.corpus() == []
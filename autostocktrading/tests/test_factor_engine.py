@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autostocktrading.analysis.factor_engine import FactorEngine, load_factor_config
+
+CONFIG = {
+    "normalization": "percentile",
+    "winsorize": 0,
+    "require_positive": ["BPS", "PER", "PBR"],
+    "factors": {
+        "PER": {"weight": 1, "direction": "low"},
+        "PBR": {"weight": 1, "direction": "low"},
+        "DIV": {"weight": 1, "direction": "high"},
+        "ROE": {"weight": 1, "direction": "high"},
+    },
+}
+
+
+def _snapshot(n, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = [f"{i:06d}" for i in range(n)]
+    eps = rng.normal(1000, 800, n)
+    bps = rng.uniform(5000, 50000, n)
+    close = rng.uniform(5000, 200000, n)
+    return pd.DataFrame({
+        "market": "KOSPI", "종가": close, "시가총액": close * rng.uniform(1e6, 1e8, n),
+        "BPS": bps, "EPS": eps, "PER": close / eps, "PBR": close / bps, "DIV": rng.uniform(0, 6, n),
+    }, index=pd.Index(tickers, name="티커"))
+
+
+def test_default_config_matches_rank_sum_ordering():
+    snapshot = _snapshot(200)
+    ranked = FactorEngine(CONFIG).score(snapshot)
+
+    # 기존 ValuationTool 의 순위 합산 방식과 같은 순서
+    df = snapshot[(snapshot["BPS"] > 0) & (snapshot["PER"] > 0) & (snapshot["PBR"] > 0)].copy()
+    df["ROE"] = df["EPS"] / df["BPS"] * 100
+    rank_sum = (df["PER"].rank() + df["PBR"].rank() + df["DIV"].rank(ascending=False)
+                + df["ROE"].rank(ascending=False))
+    assert set(ranked["ticker"]) == set(df.index)
+    assert rank_sum.loc[ranked["ticker"]].round(6).is_monotonic_increasing
+    assert list(ranked["total_rank"]) == list(range(1, len(df) + 1))
+    assert (snapshot.loc[ranked["ticker"], "PER"] > 0).all()
+
+
+def test_zscore_winsorize_and_sector_neutral():
+    snapshot = _snapshot(6)
+    snapshot["PER"] = [5.0, 6.0, 7.0, 50.0, 60.0, 1000.0]
+    config = {**CONFIG, "factors": {"PER": {"weight": 1, "direction": "low"}}, "require_positive": []}
+
+    z = FactorEngine({**config, "normalization": "zscore"}).score(snapshot)
+    winsorized = FactorEngine({**config, "normalization": "zscore", "winsorize": 0.2}).score(snapshot)
+    assert z["PER_score"].min() < winsorized["PER_score"].min()   # 극단값의 영향이 줄어듦
+
+    # 업종 안에서 정규화하면 업종마다 최상위 종목이 같은 점수
+    sectors = pd.Series(["은행"] * 3 + ["바이오"] * 3, index=snapshot.index)
+    neutral = FactorEngine({**config, "sector_neutral": True}).score(snapshot, groups=sectors)
+    assert neutral.set_index("ticker").loc[["000000", "000003"], "score"].tolist() == [1.0, 1.0]
+
+
+def test_scores_full_universe_quickly():
+    snapshot = _snapshot(2500)
+    engine = FactorEngine(load_factor_config())
+    engine.score(snapshot)
+
+    started = time.perf_counter()
+    top = engine.top(snapshot, 20)
+    assert time.perf_counter() - started < 0.5
+    assert len(top) == 20 and top["score"].is_monotonic_decreasing
+
+
+@pytest.mark.parametrize("config", [
+    {**CONFIG, "winsorize": 0.05},
+    {**CONFIG, "normalization": "zscore", "factors": {**CONFIG["factors"], "SIZE": {"weight": 2}}},
+])
+def test_panel_scores_match_per_date_scores(config):
+    engine = FactorEngine(config)
+    snapshots = [_snapshot(300, seed) for seed in range(3)]
+    snapshots[1].loc["000005", "BPS"] = -1.0   # 자본잠식 종목은 그날만 제외
+    columns = ["종가", "시가총액", "BPS", "EPS", "PER", "PBR", "DIV"]
+    panel = engine.score_panel({c: np.vstack([s[c].to_numpy() for s in snapshots]) for c in columns})
+
+    for row, snapshot in zip(panel, snapshots):
+        expected = engine.score(snapshot).set_index("ticker")["score"]
+        actual = pd.Series(row, index=snapshot.index).dropna()
+        assert list(actual.sort_index().index) == sorted(expected.index)
+        assert actual[expected.index].to_numpy() == pytest.approx(expected.to_numpy(), abs=1e-9)
+
+
+def test_invalid_config():
+    with pytest.raises(KeyError):
+        FactorEngine({**CONFIG, "factors": {"MOMENTUM": {}}}).score(_snapshot(5))
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+import requests
+
+from autostocktrading.data import fetcher
+from autostocktrading.data.fetcher import FetchExecutor, TokenBucket, is_transient
+
+
+class FakeClock:
+    """time 모듈 대신 쓰는 시계. sleep 은 기다리지 않고 시간만 앞으로 돌립니다."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(fetcher, "time", clock)
+    return clock
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def test_token_bucket_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    # 토큰이 바닥나면 한 개가 채워지는 0.5초를 기다림
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+    # 오래 쉬어도 용량 이상으로 쌓이지 않음
+    clock.now += 60
+    for _ in range(3):
+        bucket.acquire()
+    assert len(clock.sleeps) == 2
+
+    TokenBucket(rate=0).acquire()
+    assert len(clock.sleeps) == 2
+
+
+def test_transient_errors():
+    assert is_transient(requests.ConnectionError()) and is_transient(requests.Timeout())
+    assert is_transient(_http_error(503)) and is_transient(_http_error(429))
+    assert not is_transient(_http_error(404))
+    assert not is_transient(ValueError("잘못된 티커")) and not is_transient(KeyError("종가"))
+
+
+def test_transient_failures_are_retried_with_backoff(clock):
+    attempts = []
+
+    def flaky(item):
+        attempts.append(item)
+        if len(attempts) < 3:
+            raise requests.ConnectionError("연결 끊김")
+        return item * 2
+
+    result = FetchExecutor(max_workers=1, retries=2, backoff=0.5).map(flaky, [21])
+    assert result.results == {21: 42} and not result.errors
+    assert len(attempts) == 3
+    # 0.5초, 1초 (지터 10% 이내)
+    assert clock.sleeps[0] == pytest.approx(0.5, rel=0.1) and clock.sleeps[1] == pytest.approx(1.0, rel=0.1)
+
+    # 재시도 횟수를 다 쓰면 마지막 오류를 보고
+    attempts.clear()
+    result = FetchExecutor(max_workers=1, retries=1, backoff=0.5).map(flaky, [1])
+    assert isinstance(result.errors[1], requests.ConnectionError) and len(attempts) == 2
+
+
+def test_permanent_failures_are_not_retried(clock):
+    attempts = []
+
+    def broken(item):
+        attempts.append(item)
+        raise KeyError("종가")
+
+    result = FetchExecutor(max_workers=1, retries=3, backoff=0.5).map(broken, ["005930"])
+    assert attempts == ["005930"] and clock.sleeps == []
+    assert isinstance(result.errors["005930"], KeyError)
+
+
+def test_partial_failures_keep_successful_results(clock):
+    def fetch(ticker):
+        if ticker.startswith("9"):
+            raise ValueError(f"상장 폐지: {ticker}")
+        return len(ticker)
+
+    items = ["005930", "900001", "000660", "005930", "900002"]
+    result = FetchExecutor(max_workers=3, retries=2, backoff=0).map(fetch, items)
+
+    # 중복 요청은 한 번만 조회하고, 성공한 값은 요청 순서대로
+    assert result.items == ["005930", "900001", "000660", "900002"]
+    assert result.ordered() == [("005930", 6), ("000660", 6)]
+    assert set(result.errors) == {"900001", "900002"}
+    assert str(result.errors["900001"]) == "상장 폐지: 900001"
+    assert "(성공 2, 실패 2)" in result.summary()
@@ -0,0 +1,58 @@
+import pytest
+import requests
+
+from autostocktrading.data import http_client, news_cache
+from autostocktrading.data.http_client import HttpClient, StubTransport, NEWS_TTL
+from autostocktrading.tools.search_tools import NaverNewsSearchTool
+
+NEWS = {"items": [{"title": "<b>반도체</b> 수출 증가", "description": "요약", "link": "https://news.example/1"}]}
+
+
+def _client(tmp_path, transport, **kwargs):
+    return HttpClient(transport=transport, root=str(tmp_path), backoff=0, **kwargs)
+
+
+def test_responses_are_cached_for_ttl(tmp_path):
+    transport = StubTransport().add("https://api.example/news", NEWS)
+    client = _client(tmp_path, transport)
+
+    assert client.get_json("https://api.example/news", params={"query": "반도체"}, ttl=60) == NEWS
+    assert client.get_json("https://api.example/news", params={"query": "반도체"}, ttl=60) == NEWS
+    assert len(transport.calls) == 1
+
+    # 디스크 캐시는 새 클라이언트(새 프로세스)에서도 유효
+    assert _client(tmp_path, transport).get_json("https://api.example/news", params={"query": "반도체"}, ttl=60) == NEWS
+    assert len(transport.calls) == 1
+
+    # 다른 파라미터나 ttl=0 은 새로 요청
+    client.get_json("https://api.example/news", params={"query": "2차전지"}, ttl=60)
+    client.get_json("https://api.example/news", params={"query": "반도체"})
+    assert len(transport.calls) == 3
+
+
+def test_retries_server_errors_then_raises(tmp_path):
+    transport = StubTransport().add("https://api.example/", {}, status=503).add("https://api.example/", {"ok": 1})
+    assert _client(tmp_path, transport, retries=2).get_json("https://api.example/x") == {"ok": 1}
+    assert len(transport.calls) == 2
+
+    failing = StubTransport().add("https://api.example/", {}, status=500)
+    with pytest.raises(requests.HTTPError):
+        _client(tmp_path, failing, retries=1).get_json("https://api.example/x")
+    assert len(failing.calls) == 2
+
+    with pytest.raises(requests.ConnectionError):
+        _client(tmp_path, StubTransport(), retries=0).get_json("https://unknown.example/")
+
+
+def test_tools_use_shared_client(tmp_path, monkeypatch):
+    transport = StubTransport().add("https://openapi.naver.com/v1/search/news.json", NEWS)
+    monkeypatch.setattr(http_client, "_default_client", _client(tmp_path, transport))
+    monkeypatch.setattr(news_cache, "_default_cache", news_cache.NewsCache(root=str(tmp_path / "news")))
+    monkeypatch.setenv("NAVER_CLIENT_ID", "id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "secret")
+
+    news = NaverNewsSearchTool()._run("반도체")
+    assert "반도체 수출 증가" in news and "<b>" not in news
+    assert NaverNewsSearchTool()._run("반도체") == news
+    assert len(transport.calls) == 1
+    assert NEWS_TTL < http_client.MACRO_TTL
@@ -0,0 +1,93 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from crewai.events import crewai_event_bus, LLMCallCompletedEvent, LLMCallStartedEvent, TaskFailedEvent, \
+    TaskStartedEvent
+from crewai.events.types.llm_events import LLMCallType
+
+from autostocktrading import instrumentation
+from autostocktrading.data.fetcher import FetchExecutor
+from autostocktrading.data.http_client import HttpClient, StubTransport
+from autostocktrading.tools.output import CompactOutputTool
+
+NEWS = {"items": [{"title": "반도체 수출 증가"}]}
+
+
+class FetchingTool(CompactOutputTool):
+    name: str = "Fetching Tool"
+    description: str = "여러 종목을 동시에 조회하고 뉴스 API 를 부르는 테스트 도구"
+    client: object = None
+
+    def _run(self, tickers: list) -> str:
+        FetchExecutor(max_workers=2, retries=0).map(lambda ticker: instrumentation.add(requests=1), tickers)
+        self.client.get_json("https://api.example/news", ttl=60)
+        self.client.get_json("https://api.example/news", ttl=60)
+        return f"{len(tickers)}종목"
+
+
+@pytest.fixture
+def cycle(tmp_path, monkeypatch):
+    monkeypatch.delenv("INSTRUMENTATION", raising=False)
+    trace = instrumentation.start_cycle("test_cycle", trace_dir=str(tmp_path))
+    yield trace
+    instrumentation.finish_cycle()
+
+
+def test_tool_metrics_roll_up_into_task_and_cycle(cycle, tmp_path):
+    client = HttpClient(transport=StubTransport().add("https://api.example/news", NEWS), root=str(tmp_path / "http"))
+    tool = FetchingTool(client=client)
+
+    with instrumentation.span("task", "valuation_analysis_task", agent="Valuation Analyst"):
+        assert tool._run(["000010", "000020", "000030"]) == "3종목"
+    instrumentation.finish_cycle()
+
+    tool_span, task_span = cycle.spans[0], cycle.spans[1]
+    assert (tool_span.kind, tool_span.agent, tool_span.task) == ("tool", "Valuation Analyst", "valuation_analysis_task")
+    # 스레드 풀 안의 요청도 도구 구간으로 집계되고, 응답 바이트와 캐시 적중이 기록됨
+    assert tool_span.metrics["requests"] == 4
+    assert tool_span.metrics["bytes"] == len(json.dumps(NEWS, ensure_ascii=False).encode("utf-8"))
+    assert (tool_span.metrics["cache_hits"], tool_span.metrics["cache_misses"]) == (1, 1)
+    assert task_span.metrics["tool_calls"] == 1 and task_span.metrics["tool_s"] == pytest.approx(tool_span.wall_s)
+    assert task_span.metrics["requests"] == cycle.root.metrics["requests"] == 4
+
+    records = [json.loads(line) for line in open(cycle.trace_path, encoding="utf-8")]
+    assert [r["kind"] for r in records] == ["tool", "task", "cycle"]
+    assert {r["cycle"] for r in records} == {cycle.id}
+
+    prom = open(cycle.prom_path, encoding="utf-8").read()
+    assert 'autostocktrading_external_requests{kind="tool",name="Fetching Tool"} 4' in prom
+    assert 'autostocktrading_tool_calls{kind="agent",name="Valuation Analyst"} 1' in prom
+    assert "# TYPE autostocktrading_span_seconds gauge" in prom
+
+    summary = cycle.summary()
+    assert "[태스크별]" in summary and "[에이전트별]" in summary and "Fetching Tool" in summary
+
+
+def test_crewai_events_open_task_spans_and_time_llm_calls(cycle):
+    task = SimpleNamespace(name="trend_analysis_task", description="시장 분석", agent=SimpleNamespace(role="Analyst"))
+    messages = [{"role": "user", "content": "시장 동향을 분석하라."}]
+
+    crewai_event_bus.emit(None, TaskStartedEvent(context=None, task=task))
+    crewai_event_bus.emit(None, LLMCallStartedEvent(messages=messages, model="ollama/exaone-deep"))
+    crewai_event_bus.emit(None, LLMCallCompletedEvent(messages=messages, response="Final Answer: 상승",
+                                                      call_type=LLMCallType.LLM_CALL))
+    with instrumentation.span("tool", "Naver News Search Tool"):
+        pass
+    crewai_event_bus.emit(None, TaskFailedEvent(error="시간 초과", task=task))
+
+    task_span = next(span for span in cycle.spans if span.kind == "task")
+    assert (task_span.name, task_span.agent, task_span.error) == ("trend_analysis_task", "Analyst", "시간 초과")
+    assert task_span.metrics["llm_calls"] == 1 and task_span.metrics["tokens_out"] > 0
+    assert task_span.metrics["tool_calls"] == 1
+    assert next(span for span in cycle.spans if span.kind == "tool").agent == "Analyst"
+
+
+def test_disabled_instrumentation_records_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv("INSTRUMENTATION", "0")
+    assert instrumentation.start_cycle(trace_dir=str(tmp_path)) is None
+    with instrumentation.span("tool", "x") as opened:
+        instrumentation.add(requests=1)
+    assert opened is None
+    assert instrumentation.finish_cycle() is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,34 @@
+import pytest
+
+import autostocktrading
+from autostocktrading import tools
+from benchmarks.bench_import import check, LIGHT_MODULES, measure
+
+
+# 시간 예산은 측정 환경에 따라 흔들리므로 python -m benchmarks.bench_import 로만 확인하고,
+# 테스트는 새 프로세스에서 불러온 뒤 sys.modules 에 무거운 의존성이 없는지만 확인
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_light_entry_points_start_without_crewai(module):
+    assert measure(module)["heavy"] == []
+
+
+def test_check_reports_budget_and_heavy_imports():
+    assert "main" in LIGHT_MODULES and "autostocktrading.crew" not in LIGHT_MODULES
+    slow = {"module": "main", "seconds": 3.0, "heavy": ["crewai"], "budget_s": 2.0}
+    assert check(slow) == ["main: 3.0초 > 예산 2.0초", "main: crewai 를 불러옴"]
+    # 크루 모듈은 crewAI 를 불러와도 되지만 pykrx 는 첫 조회 때까지 미룸
+    crew = {"module": "autostocktrading.crew", "seconds": 6.0, "heavy": ["crewai", "pykrx"], "budget_s": 10.0}
+    assert check(crew) == ["autostocktrading.crew: pykrx 를 불러옴"]
+
+
+def test_tools_are_resolved_lazily_and_shared(monkeypatch):
+    monkeypatch.setattr(tools, "_instances", {})
+    from autostocktrading.tools.financial_tools import ValuationTool
+
+    assert autostocktrading.ValuationTool is tools.ValuationTool is ValuationTool
+    tool = tools.get_tool("ValuationTool")
+    assert isinstance(tool, ValuationTool) and tools.get_tool("ValuationTool") is tool
+    with pytest.raises(ValueError, match="NoSuchTool"):
+        tools.get_tool("NoSuchTool")
+    with pytest.raises(AttributeError):
+        autostocktrading.NoSuchTool
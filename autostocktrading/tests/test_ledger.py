@@ -0,0 +1,104 @@
+import json
+import threading
+
+from autostocktrading.data.ledger import PortfolioLedger
+
+
+def _ledger(tmp_path, cash=1_000_000):
+    seed = tmp_path / "portfolio.json"
+    seed.write_text(json.dumps({"cash": cash, "stocks": []}), encoding="utf-8")
+    return PortfolioLedger(path=str(tmp_path / "portfolio.db"), seed_path=str(seed))
+
+
+def test_orders_update_positions_and_cash(tmp_path):
+    ledger = _ledger(tmp_path)
+    assert ledger.snapshot() == {"cash": 1_000_000, "stocks": []}
+    ledger.execute([{"ticker": "005930", "action": "BUY", "quantity": 10, "price": 50_000}])
+    ledger.execute([{"ticker": "005930", "action": "BUY", "quantity": 10, "price": 30_000}])
+    ledger.execute([{"ticker": "005930", "action": "SELL", "quantity": 5, "price": 60_000}])
+
+    snapshot = ledger.snapshot()
+    assert snapshot["cash"] == 1_000_000 - 800_000 + 300_000
+    assert snapshot["stocks"] == [{"ticker": "005930", "quantity": 15, "purchase_price": 40_000}]
+    assert len(ledger.trades()) == 3
+
+
+def test_batch_is_all_or_nothing(tmp_path):
+    ledger = _ledger(tmp_path)
+    results = ledger.execute([
+        {"ticker": "005930", "action": "BUY", "quantity": 10, "price": 50_000},
+        {"ticker": "000660", "action": "SELL", "quantity": 1, "price": 100_000},
+    ])
+
+    assert [r["status"] for r in results] == ["cancelled", "rejected"]
+    assert ledger.snapshot() == {"cash": 1_000_000, "stocks": []}
+    assert ledger.trades() == []
+
+
+def test_concurrent_executors_do_not_lose_updates(tmp_path):
+    _ledger(tmp_path)
+    seed = str(tmp_path / "portfolio.json")
+
+    def buy():
+        # 실행기마다 별도의 연결(프로세스 가정)로 같은 원장에 주문
+        executor = PortfolioLedger(path=str(tmp_path / "portfolio.db"), seed_path=seed)
+        for _ in range(10):
+            executor.execute([{"ticker": "005930", "action": "BUY", "quantity": 1, "price": 1_000}])
+
+    threads = [threading.Thread(target=buy) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snapshot = PortfolioLedger(path=str(tmp_path / "portfolio.db"), seed_path=seed).snapshot()
+    assert snapshot["cash"] == 1_000_000 - 40 * 1_000
+    assert snapshot["stocks"][0]["quantity"] == 40
+
+
+def test_validate_reports_each_rejection_in_order(tmp_path):
+    ledger = _ledger(tmp_path)
+    ledger.execute([{"ticker": "005930", "action": "BUY", "quantity": 10, "price": 50_000}])
+
+    errors = ledger.validate([
+        {"ticker": "000660", "action": "BUY", "quantity": 10, "price": 100_000},
+        {"ticker": "005930", "action": "SELL", "quantity": 11, "price": 50_000},
+        {"ticker": "035420", "action": "SELL", "quantity": 1, "price": 200_000},
+        {"ticker": "005930", "action": "SELL", "quantity": 10, "price": 50_000},
+    ])
+    assert errors[0] == "현금 부족 (필요: 1,000,000원, 보유: 500,000원)"
+    assert errors[1] == "보유 수량 부족 (005930 - 보유: 10주, 매도 요청: 11주)"
+    assert errors[2] == "보유하지 않은 종목(035420)입니다."
+    assert errors[3] is None
+    # 검증만 하고 원장은 바꾸지 않음
+    assert ledger.snapshot()["cash"] == 500_000
+
+
+def test_batch_tool_funds_buys_with_sells_and_reports_in_input_order(tmp_path, monkeypatch):
+    from autostocktrading.data import ledger as ledger_module
+    from autostocktrading.tools.trading_tools import BatchTradeExecutorTool
+
+    ledger = _ledger(tmp_path)
+    ledger.execute([{"ticker": "005930", "action": "BUY", "quantity": 10, "price": 50_000}])
+    monkeypatch.setattr(ledger_module, "_default_ledger", ledger)
+
+    # 현금 500,000원으로는 살 수 없는 매수가 뒤의 매도 대금으로 가능해짐
+    orders = [
+        {"ticker": "000660", "action": "BUY", "quantity": 5, "price": 200_000},
+        {"ticker": "005930", "action": "SELL", "quantity": 10, "price": 60_000},
+    ]
+    output = BatchTradeExecutorTool()._run(orders)
+    assert output.startswith("일괄 주문 성공")
+    assert output.index("000660") < output.index("005930")
+    assert ledger.snapshot() == {"cash": 100_000, "stocks": [{"ticker": "000660", "quantity": 5, "purchase_price": 200_000}]}
+
+    # 매도 초과 주문이 섞이면 어떤 주문도 실행하지 않고, 거부 사유는 해당 주문 행에 표시
+    orders = [
+        {"ticker": "035420", "action": "BUY", "quantity": 1, "price": 50_000},
+        {"ticker": "000660", "action": "SELL", "quantity": 6, "price": 200_000},
+    ]
+    output = BatchTradeExecutorTool()._run(orders)
+    assert output.startswith("일괄 주문 실패")
+    rows = [line for line in output.splitlines() if "035420" in line or "000660" in line]
+    assert "not executed" in rows[0] and "rejected" in rows[1] and "보유 수량 부족" in rows[1]
+    assert ledger.snapshot()["cash"] == 100_000
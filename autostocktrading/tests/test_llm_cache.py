@@ -0,0 +1,74 @@
+import time
+from types import SimpleNamespace
+
+from crewai import LLM
+
+from autostocktrading import llm_cache
+from autostocktrading.llm_cache import CachedLLM, LLMResponseCache
+
+MESSAGES = [{"role": "user", "content": "유망 섹터를 분석하라.\nObservation: 기준금리 3.50%"}]
+
+
+def test_identical_prompts_hit_cache_per_agent(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        calls.append(messages)
+        return f"응답 {len(calls)}"
+
+    monkeypatch.setattr(LLM, "call", fake_call)
+    monkeypatch.setattr(llm_cache, "_trading_day", lambda: "20240102")
+    cache = LLMResponseCache(path=str(tmp_path / "llm.db"))
+    llm = CachedLLM(model="ollama/exaone-deep", cache=cache)
+    analyst = SimpleNamespace(role="Market Trend Analyst")
+
+    assert llm.call(MESSAGES, from_agent=analyst) == "응답 1"
+    assert llm.call(MESSAGES, from_agent=analyst) == "응답 1"
+    assert len(calls) == 1
+
+    # 도구 결과가 달라지면 다른 키
+    changed = [{"role": "user", "content": MESSAGES[0]["content"].replace("3.50", "3.25")}]
+    assert llm.call(changed, from_agent=analyst) == "응답 2"
+
+    # 도구를 직접 실행하는 함수 호출 요청은 캐시하지 않음
+    llm.call(MESSAGES, available_functions={"tool": print}, from_agent=analyst)
+    assert len(calls) == 3
+
+    assert cache.stats() == {"Market Trend Analyst": {"hits": 1, "misses": 2}}
+
+    # 새 프로세스에서도 디스크에서 응답
+    reopened = CachedLLM(model="ollama/exaone-deep", cache=LLMResponseCache(path=str(tmp_path / "llm.db")))
+    assert reopened.call(MESSAGES, from_agent=analyst) == "응답 1"
+    assert len(calls) == 3
+
+
+def test_trading_day_is_part_of_key():
+    first = LLMResponseCache.make_key("m", MESSAGES, day="20240102")
+    assert first == LLMResponseCache.make_key("m", MESSAGES, day="20240102")
+    assert first != LLMResponseCache.make_key("m", MESSAGES, day="20240103")
+
+
+def test_expired_responses_are_ignored(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.db"), ttl_hours=1)
+    cache.put("key", "응답", "m")
+    assert cache.get("key") == "응답"
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get("key") is None
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    # 약 2.5KB 상한에 1KB 응답 세 개
+    cache = LLMResponseCache(path=str(tmp_path / "llm.db"), max_mb=2500 / (1024 * 1024))
+    cache.put("a", "a" * 1000, "m")
+    time.sleep(0.01)
+    cache.put("b", "b" * 1000, "m")
+    time.sleep(0.01)
+    assert cache.get("a") is not None
+    time.sleep(0.01)
+    cache.put("c", "c" * 1000, "m")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,90 @@
+import pytest
+
+from autostocktrading.data.http_client import HttpClient, StubTransport
+from autostocktrading.data.macro_store import MacroStore
+
+CONFIG = """
+base_rate:
+  name: 기준금리
+  group: kr
+  source: ecos
+  stat_code: 028Y001
+  item_code: "0101000"
+  cycle: M
+  unit: "%"
+fed_funds:
+  name: 연방기금 금리
+  group: us
+  source: fred
+  series_id: FEDFUNDS
+  unit: "%"
+"""
+
+ECOS = "https://ecos.bok.or.kr/api/StatisticSearch/"
+FRED = "https://api.stlouisfed.org/fred/series/observations"
+
+
+def _ecos(rows):
+    return {"StatisticSearch": {"row": [{"TIME": t, "DATA_VALUE": v} for t, v in rows]}}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("BOK_API_KEY", "bok")
+    monkeypatch.setenv("FRED_API_KEY", "fred")
+    config = tmp_path / "macro_series.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+    transport = StubTransport()
+    client = HttpClient(transport=transport, root=str(tmp_path / "http"), backoff=0)
+    macro_store = MacroStore(root=str(tmp_path / "macro"), config_path=str(config), client=client)
+    return macro_store, transport
+
+
+def test_full_history_then_only_new_observations(store):
+    macro_store, transport = store
+    monthly = [(f"2023{m:02d}", "3.50") for m in range(1, 13)] + [("202401", "3.50")]
+    transport.add(ECOS, _ecos(monthly))
+    transport.add(FRED, {"observations": [{"date": "2023-12-01", "value": "5.33"},
+                                          {"date": "2024-01-01", "value": "."}]})
+
+    fetched = macro_store.refresh()
+    assert not fetched.errors
+    assert len(macro_store.history("base_rate")) == 13
+    assert len(macro_store.history("fed_funds")) == 1
+    assert len(transport.calls) == 2
+
+    # 갱신 간격 안에서는 네트워크 요청 없음
+    macro_store.refresh()
+    assert len(transport.calls) == 2
+
+    # 간격이 지나면 마지막 저장일부터만 요청하여 수정치와 새 관측치를 반영
+    macro_store.refresh_seconds = 0
+    transport.add(ECOS, _ecos([("202401", "3.25"), ("202402", "3.00")]))
+    assert macro_store.update("base_rate") == 1
+    assert "/028Y001/M/202401/" in transport.calls[-1]
+
+    history = macro_store.history("base_rate")
+    assert list(history.tail(2)) == [3.25, 3.00]
+
+    trend = macro_store.trend("base_rate")
+    assert trend["date"] == "2024-02"
+    assert trend["previous_change"] == pytest.approx(-0.25)
+    assert trend["change_1y"] == pytest.approx(-0.50)
+
+
+def test_no_new_data_and_missing_key(store, monkeypatch):
+    macro_store, transport = store
+    transport.add(ECOS, _ecos([("202401", "3.50")]))
+    macro_store.update("base_rate")
+
+    macro_store.refresh_seconds = 0
+    transport.add(ECOS, {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}})
+    assert macro_store.update("base_rate") == 0
+
+    monkeypatch.delenv("FRED_API_KEY")
+    fetched = macro_store.refresh(group="us")
+    report = macro_store.report("us", fetched.errors)
+    assert "연방기금 금리: 조회 실패" in report and "FRED_API_KEY" in report
+
+    report = macro_store.report("kr")
+    assert "기준금리: 3.50% (기준일: 2024-01)" in report
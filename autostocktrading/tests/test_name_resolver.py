@@ -0,0 +1,141 @@
+import pandas as pd
+import pytest
+
+from autostocktrading.data import fetcher, krx
+from autostocktrading.data.name_resolver import NameResolver, normalize
+from autostocktrading.tools.market_data_tools import TickerResolverTool
+
+LISTED = {
+    "KOSPI": {"005930": "삼성전자", "005935": "삼성전자우", "000660": "SK하이닉스", "005380": "현대차",
+              "005385": "현대차우", "005387": "현대차2우B", "035420": "NAVER", "047040": "대우건설",
+              "000270": "기아"},
+    "KOSDAQ": {"042700": "한미반도체", "086520": "에코프로", "247540": "에코프로비엠"},
+}
+
+
+class FakeKrx:
+    def __init__(self):
+        self.list_calls = 0
+        self.listed = LISTED
+
+    def get_previous_business_days(self, fromdate, todate):
+        return list(pd.bdate_range(fromdate, todate))
+
+    def get_market_ticker_list(self, date, market):
+        self.list_calls += 1
+        return list(self.listed.get(market, []))
+
+    def get_market_ticker_name(self, ticker):
+        return next(names[ticker] for names in LISTED.values() if ticker in names)
+
+
+@pytest.fixture
+def fake_krx(tmp_path, monkeypatch, fresh_singletons):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    backend = FakeKrx()
+    krx.use_backend(backend)
+    yield backend
+    krx.use_backend(None)
+
+
+def _ticker(resolver, query):
+    match = resolver.resolve(query)
+    return match and (match["ticker"], match["method"])
+
+
+def test_normalize_ignores_case_spacing_and_corporate_marks():
+    assert normalize("(주) 삼성 전자") == normalize("삼성전자") == "삼성전자"
+    assert normalize("SK-Hynix") == "skhynix"
+
+
+def test_exact_alias_and_preferred_shares(fake_krx):
+    resolver = NameResolver()
+
+    assert _ticker(resolver, "삼성 전자") == ("005930", "exact")
+    assert _ticker(resolver, "005380") == ("005380", "ticker")
+    assert _ticker(resolver, "Samsung Electronics") == ("005930", "alias")
+    assert _ticker(resolver, "naver") == ("035420", "exact")
+    # 우선주 표기: 종목명에 붙은 '우', 별칭 + '우', '우선주' 표현
+    assert _ticker(resolver, "삼성전자우") == ("005935", "exact")
+    assert _ticker(resolver, "삼전우") == ("005935", "preferred")
+    assert _ticker(resolver, "현대차 우선주") == ("005385", "preferred")
+    assert _ticker(resolver, "현대자동차2우B") == ("005387", "preferred")
+    # '대우' 로 끝나도 보통주 '대' 가 없으므로 우선주가 아님
+    assert _ticker(resolver, "대우건설") == ("047040", "exact")
+
+
+def test_unlisted_preferred_class_is_not_swapped_for_another(fake_krx):
+    resolver = NameResolver()
+
+    # 삼성전자는 '우' 만 상장되어 있으므로 '2우B' 를 '우' 로 바꿔 확정하지 않고 낮은 신뢰도의 유사도 매칭으로 보고
+    match = resolver.resolve("삼성전자2우B")
+    assert match["method"] == "fuzzy" and match["score"] < 1
+    match = resolver.resolve("현대차3우C")
+    assert match is None or (match["method"] == "fuzzy" and match["ticker"] != "005387")
+    # 종류를 밝히지 않은 '우선주' 는 '우'
+    assert _ticker(resolver, "현대차 우선") == ("005385", "preferred")
+
+
+def test_fuzzy_match_reports_close_alternatives(fake_krx):
+    resolver = NameResolver()
+
+    match = resolver.resolve("한미 반도체㈜")
+    assert match["ticker"] == "042700" and match["method"] == "exact"
+
+    match = resolver.resolve("에코프로비엠주")
+    assert match["ticker"] == "247540" and match["method"] == "fuzzy" and match["score"] >= 0.5
+
+    assert resolver.resolve("전혀없는회사") is None
+    assert resolver.resolve("   ") is None
+
+
+def test_index_is_built_once_per_day_and_persisted(fake_krx, tmp_path):
+    resolver = NameResolver()
+    resolver.resolve_many(["삼성전자", "기아", "SK하이닉스", "기아"])
+    assert fake_krx.list_calls == 2
+
+    reloaded = NameResolver()
+    assert reloaded.name_of("000270") == "기아"
+    assert reloaded.name_of("999999") is None
+    assert fake_krx.list_calls == 2
+
+
+def test_empty_build_is_not_served_and_retried_later(fake_krx, tmp_path):
+    fake_krx.listed = {}
+    resolver = NameResolver().load("20240102")
+    assert resolver.date is None and resolver.names == {}
+    assert not (tmp_path / "cache" / "names" / "20240102.json").exists()
+
+    # 재시도 시각 전에는 다시 조회하지 않고, 그 뒤에는 새로 만들어 저장
+    fake_krx.listed = LISTED
+    calls = fake_krx.list_calls
+    resolver.load("20240102")
+    assert fake_krx.list_calls == calls and resolver.date is None
+    resolver._retry_at = 0
+    resolver.load("20240102")
+    assert resolver.date == "20240102" and resolver.names["005930"] == "삼성전자"
+    assert (tmp_path / "cache" / "names" / "20240102.json").exists()
+
+
+def test_ticker_names_go_through_the_rate_limited_gateway(fake_krx, monkeypatch):
+    class CountingLimiter:
+        acquired = 0
+
+        def acquire(self):
+            self.acquired += 1
+
+    limiter = CountingLimiter()
+    monkeypatch.setattr(fetcher, "_rate_limiter", limiter)
+    NameResolver().load("20240102")
+    # 시장별 목록 2회 + 종목명 목록을 받는 첫 이름 조회 1회 (나머지 이름은 백엔드 메모리에서 조회)
+    assert limiter.acquired == 3
+
+
+def test_tool_resolves_many_names_in_one_call(fake_krx):
+    report = TickerResolverTool(output_format="csv")._run(["삼성전자", "Kia", "현대차우", "없는회사"])
+
+    assert report.startswith("회사명 → 티커 변환 결과 (3/4개 찾음)")
+    assert "삼성전자,005930,삼성전자,exact" in report
+    assert "Kia,000270,기아,alias" in report
+    assert "현대차우,005385,현대차우,exact" in report
+    assert report.endswith("찾지 못한 이름: 없는회사")
@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+from autostocktrading.data import http_client, news_cache
+from autostocktrading.data.http_client import HttpClient, StubTransport
+from autostocktrading.data.news_cache import FETCH_SIZE, NewsCache, normalize_query, NEWS_URL
+from autostocktrading.tools.search_tools import NaverNewsSearchTool
+
+
+def _items(*links):
+    return {"items": [{"title": f"<b>기사</b> {link}", "description": "&quot;요약&quot;",
+                       "originallink": f"https://press.example/{link}", "link": f"https://n.news.example/{link}"}
+                      for link in links]}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("NAVER_CLIENT_ID", "id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "secret")
+    transport = StubTransport()
+    client = HttpClient(transport=transport, root=str(tmp_path / "http"), backoff=0)
+    return NewsCache(client=client, root=str(tmp_path / "news")), transport
+
+
+def test_normalize_query():
+    assert normalize_query("  삼성전자   ESG ") == normalize_query("esg, 삼성전자") == "esg 삼성전자"
+    assert normalize_query("!!") == ""
+
+
+def test_near_identical_queries_share_one_request(cache):
+    news, transport = cache
+    transport.add(NEWS_URL, _items(1, 2, 3))
+
+    results = news.search_many(["삼성전자 ESG", "ESG 삼성전자", "삼성전자  esg"])
+    assert len(transport.calls) == 1
+    assert all(len(articles) == 3 for articles in results.values())
+    assert results["삼성전자 ESG"][0]["title"] == "기사 1"
+    assert results["삼성전자 ESG"][0]["description"] == '"요약"'
+
+    news.search("esg 삼성전자")
+    assert len(transport.calls) == 1
+    assert news.requests == 4 and news.memory_hits == 3
+    # 정규화한 검색어는 캐시 키로만 쓰고, API 에는 처음 요청한 검색어를 그대로 보냄
+    assert "query=%EC%82%BC%EC%84%B1%EC%A0%84%EC%9E%90+ESG&" in transport.calls[0]
+
+
+def test_paging_fetches_large_blocks_and_stops_on_short_block(cache):
+    news, transport = cache
+    transport.add(NEWS_URL, _items(*range(1, FETCH_SIZE + 1))).add(NEWS_URL, _items(*range(FETCH_SIZE, 131)))
+
+    # 5 페이지(25건)는 한 번의 호출로 받아 잘라 씀
+    articles = news.search("반도체", pages=5)
+    assert [a["link"] for a in articles] == [f"https://press.example/{i}" for i in range(1, 26)]
+    assert len(transport.calls) == 1 and f"display={FETCH_SIZE}" in transport.calls[0]
+
+    # 첫 묶음을 넘는 페이지만 다음 묶음을 요청하고, 겹치는 기사는 링크 기준으로 제거
+    articles = news.search("반도체", pages=30)
+    assert [a["link"] for a in articles] == [f"https://press.example/{i}" for i in range(1, 131)]
+    assert len(transport.calls) == 2
+    assert f"start={FETCH_SIZE + 1}" in transport.calls[-1]
+
+    # 앞 페이지는 메모리에서 재사용
+    assert len(news.search("반도체", pages=1)) == 5
+    assert len(transport.calls) == 2
+
+
+def test_concurrent_identical_searches_wait_for_first(cache, monkeypatch):
+    news, transport = cache
+    transport.add(NEWS_URL, _items(1))
+    started, release = threading.Event(), threading.Event()
+    fetch = news._fetch_block
+
+    def slow_fetch(query, block):
+        started.set()
+        release.wait(5)
+        return fetch(query, block)
+
+    monkeypatch.setattr(news, "_fetch_block", slow_fetch)
+    first = threading.Thread(target=news.search, args=("반도체",))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=news.search, args=("반도체 ",))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert len(transport.calls) == 1
+
+
+def test_quota_report_counts_cycle_calls(cache):
+    news, transport = cache
+    transport.add(NEWS_URL, _items(1))
+    news.search("반도체")
+    news.search("2차전지")
+    assert "이번 사이클 API 호출 2회" in news.quota_report()
+
+    news.reset()
+    news.search("반도체")  # 디스크 캐시(TTL) 응답은 호출로 세지 않음
+    news.search("자동차")
+    report = news.quota_report()
+    assert "이번 사이클 API 호출 1회" in report and "오늘 누적 3회" in report
+
+
+def test_recent_results_survive_reset_and_last_queries_are_prefetched(cache, tmp_path):
+    news, transport = cache
+    transport.add(NEWS_URL, _items(1))
+    news.search("반도체 전망")
+    news.reuse_seconds = 600
+
+    # 재사용 시간 안의 결과는 다음 사이클에도 메모리에서 응답
+    news.reset()
+    news.search("전망 반도체")
+    assert len(transport.calls) == 1 and news.memory_hits == 1
+
+    # 재사용하지 않는 새 프로세스도 직전 사이클의 검색어를 미리 받아 둠
+    fresh = NewsCache(client=HttpClient(transport=transport, root=str(tmp_path / "http2")), root=news.root)
+    assert list(fresh.prefetch()) == ["반도체 전망"]
+    fresh.search("반도체 전망")
+    assert len(transport.calls) == 2 and fresh.memory_hits == 1
+
+
+def test_tool_batches_queries_without_repeating_articles(tmp_path, monkeypatch):
+    monkeypatch.delenv("NAVER_CLIENT_ID", raising=False)
+    monkeypatch.setattr(news_cache, "_default_cache", NewsCache(root=str(tmp_path / "news")))
+    assert "NAVER_CLIENT_ID" in NaverNewsSearchTool()._run("반도체")
+
+    transport = StubTransport().add(NEWS_URL + "?query=%EB%B0%98", _items(1, 2)).add(NEWS_URL, _items(2, 3))
+    monkeypatch.setattr(http_client, "_default_client",
+                        HttpClient(transport=transport, root=str(tmp_path / "http"), backoff=0))
+    monkeypatch.setattr(news_cache, "_default_cache", NewsCache(root=str(tmp_path / "news")))
+    monkeypatch.setenv("NAVER_CLIENT_ID", "id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "secret")
+
+    output = NaverNewsSearchTool()._run(queries=["반도체", "자동차"])
+    assert "[반도체]" in output and "[자동차]" in output
+    assert output.count("https://press.example/2") == 1
+    assert "겹치는 기사 1건 생략" in output
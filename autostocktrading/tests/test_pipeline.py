@@ -0,0 +1,101 @@
+import json
+import math
+
+import pandas as pd
+import pytest
+
+from autostocktrading.data import krx, ledger
+from autostocktrading.pipeline import QuantPipeline
+from autostocktrading.tools.trading_tools import BatchTradeExecutorTool
+
+# 티커: (PER, PBR, EPS, BPS, DIV, 기관 순매수, 외국인 순매수)
+UNIVERSE = {
+    "000010": (5.0, 0.5, 2000, 20000, 4.0, 1e9, 1e9),
+    "000020": (6.0, 0.6, 1800, 18000, 3.5, -1e9, -1e9),   # 기관/외국인 모두 순매도
+    "000030": (7.0, 0.7, 1500, 16000, 3.0, -1e9, 1e9),
+    "000040": (8.0, 0.8, 1200, 15000, 2.5, 1e9, -1e9),
+    "000050": (20.0, 2.0, 300, 10000, 0.5, 1e9, 1e9),
+    "000060": (-3.0, 1.0, -500, 10000, 0.0, 1e9, 1e9),    # 적자 기업은 평가 제외
+}
+
+
+class FakeStock:
+    """pykrx.stock 의 시장 스냅샷, 일봉, 수급, 영업일 조회를 흉내 냅니다."""
+
+    def get_previous_business_days(self, fromdate, todate):
+        return list(pd.bdate_range(fromdate, todate))
+
+    @staticmethod
+    def _close(ticker, date):
+        k = int(ticker) // 10
+        return 10000.0 * k * (1 + 0.01 * k * math.sin(date.toordinal() * k))
+
+    def get_market_ticker_list(self, date, market):
+        return list(UNIVERSE) if market == "KOSPI" else []
+
+    def get_market_ohlcv(self, *args, market=None):
+        if market is not None:
+            if market != "KOSPI":
+                return pd.DataFrame()
+            date = pd.Timestamp(args[0])
+            close = [self._close(ticker, date) for ticker in UNIVERSE]
+            return pd.DataFrame({"종가": close, "거래량": 1}, index=pd.Index(list(UNIVERSE), name="티커"))
+        fromdate, todate, ticker = args
+        dates = pd.bdate_range(fromdate, todate, name="날짜")
+        close = [self._close(ticker, date) for date in dates]
+        return pd.DataFrame({"시가": close, "고가": close, "저가": close, "종가": close, "거래량": 1}, index=dates)
+
+    def get_market_cap(self, date, market):
+        return pd.DataFrame({"시가총액": 1e12, "상장주식수": 1e8}, index=pd.Index(list(UNIVERSE), name="티커"))
+
+    def get_market_fundamental(self, date, market):
+        rows = {t: dict(zip(["PER", "PBR", "EPS", "BPS", "DIV"], v[:5]), DPS=0) for t, v in UNIVERSE.items()}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def get_market_trading_value_by_date(self, fromdate, todate, ticker):
+        inst, foreign = UNIVERSE[ticker][5:]
+        dates = pd.bdate_range(fromdate, todate)
+        return pd.DataFrame({"기관계": inst / len(dates), "외국인": foreign / len(dates)}, index=dates)
+
+    def get_market_ticker_name(self, ticker):
+        return f"종목{ticker}"
+
+
+@pytest.fixture
+def fake_market(tmp_path, monkeypatch, fresh_singletons):
+    seed = tmp_path / "portfolio.json"
+    seed.write_text(json.dumps({"cash": 10_000_000, "stocks": []}), encoding="utf-8")
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("PORTFOLIO_DB", str(tmp_path / "portfolio.db"))
+    monkeypatch.setenv("PORTFOLIO_JSON", str(seed))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    krx.use_backend(FakeStock())
+    yield
+    krx.use_backend(None)
+
+
+def test_pipeline_selects_and_plans_without_llm(fake_market):
+    result = QuantPipeline(market="KOSPI", top_n=2).run()
+
+    assert result["universe"] == list(UNIVERSE)
+    assert "000060" not in set(result["valuation"]["ticker"])
+    assert result["candidates"] == ["000010", "000020", "000030", "000040"]
+    # 기관과 외국인이 모두 순매도한 000020 은 제외
+    assert result["selected"] == ["000010", "000030"]
+
+    assert list(result["allocations"]) == ["000010", "000030"]
+    assert sum(result["allocations"].values()) == pytest.approx(100, abs=0.05)
+    assert result["total_capital"] == 10_000_000
+    spent = sum(order["quantity"] * order["price"] for order in result["orders"])
+    assert 0 < spent <= 10_000_000
+
+
+def test_pipeline_is_deterministic_and_orders_execute(fake_market):
+    first = QuantPipeline(market="KOSPI", top_n=2).run()
+    second = QuantPipeline(market="KOSPI", top_n=2).run()
+    assert first["orders"] == second["orders"]
+
+    report = BatchTradeExecutorTool()._run(first["orders"])
+    assert report.startswith("일괄 주문 성공")
+    held = {s["ticker"] for s in ledger.get_ledger().snapshot()["stocks"]}
+    assert held == {order["ticker"] for order in first["orders"]}
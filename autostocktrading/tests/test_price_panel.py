@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from autostocktrading.analysis.price_panel import PricePanel
+
+
+def _random_prices(n_dates=120, n_tickers=6, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("20240102", periods=n_dates)
+    prices = 10_000 * np.cumprod(1 + rng.normal(0, 0.02, (n_dates, n_tickers)), axis=0)
+    return pd.DataFrame(prices, index=dates, columns=[f"{i:06d}" for i in range(n_tickers)])
+
+
+def test_panel_aligns_series_on_date_union():
+    frame = _random_prices()
+    series = [frame.iloc[10:, 0].rename("A"), frame.iloc[:50, 1].rename("B")]
+    panel = PricePanel.from_series(series)
+
+    assert list(panel.tickers) == ["A", "B"]
+    assert len(panel.dates) == len(frame)
+    assert np.isnan(panel.values[:10, 0]).all() and np.isnan(panel.values[50:, 1]).all()
+
+
+def test_panel_statistics_match_pandas():
+    frame = _random_prices()
+    # 중간에 거래정지 구간이 있는 종목도 pandas 의 쌍별 결측 처리와 같아야 함
+    frame.iloc[30:40, 2] = np.nan
+    panel = PricePanel.from_series([frame[c] for c in frame.columns])
+    returns = frame / frame.shift(1) - 1
+
+    np.testing.assert_allclose(panel.volatility().values, returns.std().values, rtol=1e-10)
+    np.testing.assert_allclose(panel.correlation().values, returns.corr().values, rtol=1e-8, atol=1e-12)
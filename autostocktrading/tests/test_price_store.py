@@ -0,0 +1,69 @@
+import pandas as pd
+
+from autostocktrading.data import krx
+from autostocktrading.data.calendar import TradingCalendar
+from autostocktrading.data.price_store import PriceStore
+
+
+class FakeStock:
+    """pykrx.stock 의 일봉/영업일 조회를 흉내 내며 일봉 호출 구간을 기록합니다."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_previous_business_days(self, fromdate, todate):
+        return list(pd.bdate_range(fromdate, todate))
+
+    def get_market_ohlcv(self, fromdate, todate, ticker):
+        self.calls.append((fromdate, todate, ticker))
+        dates = pd.bdate_range(fromdate, todate, name="날짜")
+        close = [float(d.day) for d in dates]
+        return pd.DataFrame({"시가": close, "고가": close, "저가": close, "종가": close, "거래량": 1}, index=dates)
+
+
+def test_price_store_fetches_only_missing_ranges(tmp_path):
+    fake = FakeStock()
+    krx.use_backend(fake)
+    try:
+        calendar = TradingCalendar(path=str(tmp_path / "calendar.json"))
+        store = PriceStore(root=str(tmp_path), calendar=calendar)
+        first = store.get_close("005930", "20240102", "20240131")
+        assert fake.calls == [("20240102", "20240131", "005930")]
+
+        # 같은 구간 재조회는 네트워크 호출이 없어야 함 (새 프로세스 가정)
+        warm = PriceStore(root=str(tmp_path), calendar=calendar)
+        assert warm.get_close("005930", "20240102", "20240131").equals(first)
+        assert len(fake.calls) == 1
+
+        # 이틀을 더 요청하면 그 이틀만 추가로 조회
+        extended = warm.get_close("005930", "20240102", "20240202")
+        assert fake.calls[-1] == ("20240201", "20240202", "005930")
+        assert len(extended) == len(first) + 2
+
+        # 주말만 늘어난 구간은 요청하지 않음 (2024-02-03, 04 은 토/일)
+        warm.get_close("005930", "20240102", "20240204")
+        assert len(fake.calls) == 2
+    finally:
+        krx.use_backend(None)
+
+
+def test_empty_response_is_fetched_again(tmp_path):
+    fake = FakeStock()
+    krx.use_backend(fake)
+    try:
+        calendar = TradingCalendar(path=str(tmp_path / "calendar.json"))
+        store = PriceStore(root=str(tmp_path), calendar=calendar)
+        store.get_close("005930", "20240102", "20240131")
+
+        # 일시적으로 빈 응답이 오면 그 구간을 커버리지에 넣지 않음
+        fetch, fake.get_market_ohlcv = fake.get_market_ohlcv, lambda fromdate, todate, ticker: pd.DataFrame()
+        assert len(store.get_close("005930", "20240102", "20240202")) == len(store.get_close("005930", "20240102", "20240131"))
+        assert store._coverage["005930"]["end"] == "20240131"
+
+        # 다음 조회 때 그 구간만 다시 요청
+        fake.get_market_ohlcv = fetch
+        store.get_close("005930", "20240102", "20240202")
+        assert fake.calls[-1] == ("20240201", "20240202", "005930")
+        assert PriceStore(root=str(tmp_path), calendar=calendar)._load("005930")[1]["end"] == "20240202"
+    finally:
+        krx.use_backend(None)
@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from autostocktrading.analysis import rolling_stats
+from autostocktrading.analysis.price_panel import PricePanel
+from autostocktrading.analysis.rolling_stats import RollingStats, get_rolling_stats
+
+
+def _returns(n_dates=200, n_tickers=5, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("20230102", periods=n_dates)
+    returns = pd.DataFrame(rng.normal(0, 0.02, (n_dates, n_tickers)), index=dates,
+                           columns=[f"{i:06d}" for i in range(n_tickers)])
+    returns.iloc[50:70, 1] = np.nan
+    returns.iloc[180:185, 3] = np.nan
+    return returns
+
+
+def test_window_matches_pandas_tail():
+    returns = _returns()
+    stats = RollingStats(list(returns.columns), window=60)
+    stats.update_many(returns.index, returns.values)
+
+    tail = returns.tail(60)
+    np.testing.assert_allclose(stats.volatility().values, tail.std().values, rtol=1e-9)
+    np.testing.assert_allclose(stats.correlation().values, tail.corr().values, rtol=1e-8, atol=1e-12)
+
+
+def test_ewm_matches_pandas():
+    returns = _returns()
+    stats = RollingStats(list(returns.columns), halflife=20)
+    stats.update_many(returns.index, returns.values)
+
+    ewm = returns.ewm(halflife=20)
+    np.testing.assert_allclose(stats.volatility().values, ewm.std().iloc[-1].values, rtol=1e-9)
+    expected_corr = ewm.corr().loc[returns.index[-1]]
+    np.testing.assert_allclose(stats.correlation().values, expected_corr.values, rtol=1e-8, atol=1e-12)
+
+
+def test_state_round_trip_continues_incrementally(tmp_path):
+    returns = _returns()
+    path = str(tmp_path / "state.npz")
+
+    first = RollingStats(list(returns.columns), window=60)
+    first.update_many(returns.index[:150], returns.values[:150])
+    first.save(path)
+
+    resumed = RollingStats.load(path)
+    resumed.update_many(returns.index[150:], returns.values[150:])
+    assert resumed.last_date == returns.index[-1]
+    np.testing.assert_allclose(resumed.correlation().values, returns.tail(60).corr().values, rtol=1e-8, atol=1e-12)
+
+
+def test_stale_state_files_are_pruned_on_save(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(rolling_stats, "MAX_STATE_FILES", 2)
+    returns = _returns(n_dates=30)
+    prices = (1 + returns.fillna(0)).cumprod()
+
+    def panel(tickers):
+        return PricePanel(prices.index, tickers, prices[tickers].values)
+
+    first = panel(["000000", "000001"])
+    get_rolling_stats(first, window=10)
+    get_rolling_stats(panel(["000000", "000002"]), window=10)
+    # 갱신할 날이 없어 재사용만 한 상태도 최근에 쓴 것으로 남음
+    get_rolling_stats(first, window=10)
+    get_rolling_stats(panel(["000000", "000003"]), window=10)
+
+    directory = tmp_path / "rolling"
+    assert sorted(os.listdir(directory)) == sorted([
+        os.path.basename(rolling_stats._state_path(first.tickers, 10, None)),
+        os.path.basename(rolling_stats._state_path(["000000", "000003"], 10, None)),
+    ])
@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from autostocktrading.data import krx
+from autostocktrading.data.sector_index import SectorIndex
+from autostocktrading.tools.market_data_tools import SectorMembersTool
+
+CLASSIFICATIONS = {
+    "KOSPI": [("005930", "삼성전자", "전기·전자", 400e12), ("000660", "SK하이닉스", "전기·전자", 100e12),
+              ("105560", "KB금융", "금융", 30e12)],
+    "KOSDAQ": [("042700", "한미반도체", "반도체", 10e12), ("196170", "알테오젠", "제약", 15e12)],
+}
+INDICES = {
+    "KOSPI": {"1001": ("코스피", ["005930", "000660", "105560"]),
+              "1155": ("코스피 200 정보기술", ["005930", "000660"])},
+    "KOSDAQ": {"2001": ("코스닥", ["042700", "196170"])},
+    "KRX": {"5044": ("KRX 반도체", ["005930", "000660", "042700"])},
+}
+
+
+class FakeKrx:
+    def __init__(self):
+        self.calls = 0
+        self.failing = set()
+
+    def get_previous_business_days(self, fromdate, todate):
+        return list(pd.bdate_range(fromdate, todate))
+
+    def get_market_sector_classifications(self, date, market):
+        self.calls += 1
+        rows = CLASSIFICATIONS[market]
+        return pd.DataFrame([{"종목명": n, "업종명": s, "시가총액": c} for _, n, s, c in rows],
+                            index=pd.Index([t for t, *_ in rows], name="종목코드"))
+
+    def get_index_ticker_list(self, date, market):
+        return list(INDICES[market])
+
+    def _index(self, code):
+        return next(indices[code] for indices in INDICES.values() if code in indices)
+
+    def get_index_ticker_name(self, code):
+        return self._index(code)[0]
+
+    def get_index_portfolio_deposit_file(self, code, date):
+        if code in self.failing:
+            raise ValueError(f"{code} 구성종목 응답 형식 오류")
+        return self._index(code)[1]
+
+
+@pytest.fixture
+def fake_krx(tmp_path, monkeypatch, fresh_singletons):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    backend = FakeKrx()
+    krx.use_backend(backend)
+    yield backend
+    krx.use_backend(None)
+
+
+def test_themes_resolve_across_sectors_and_indices(fake_krx, tmp_path):
+    index = SectorIndex(root=str(tmp_path / "sectors")).load("20240102")
+
+    assert index.info("005930")["indices"] == ["코스피", "코스피 200 정보기술", "KRX 반도체"]
+    assert index.sectors["전기·전자"] == ["005930", "000660"]
+
+    # 별칭, 공백/가운뎃점 차이, 업종명 직접 조회
+    assert index.members("메모리") == ["005930", "000660", "042700"]
+    assert index.members("반도체", market="KOSDAQ") == ["042700"]
+    assert index.members("전기전자") == ["005930", "000660"]
+    assert index.members("금융") == ["105560"]
+    assert index.members("없는 테마") == []
+    assert index.sector_of(["196170", "999999"]).to_dict() == {"196170": "제약"}
+
+    # 같은 거래일은 저장된 색인을 사용
+    calls = fake_krx.calls
+    SectorIndex(root=str(tmp_path / "sectors")).load("20240102")
+    assert fake_krx.calls == calls
+
+
+def test_partial_index_is_not_saved_and_rebuilt_later(fake_krx, tmp_path):
+    fake_krx.failing = {"5044"}
+    index = SectorIndex(root=str(tmp_path / "sectors")).load("20240102")
+    assert not index.complete and "KRX 반도체" not in index.indices
+    assert not (tmp_path / "sectors" / "20240102.json").exists()
+
+    # 재시도 시간 전에는 메모리의 불완전한 색인을 그대로 사용
+    calls = fake_krx.calls
+    index.load("20240102")
+    assert fake_krx.calls == calls
+
+    fake_krx.failing = set()
+    index._retry_at = 0
+    assert index.load("20240102").complete
+    assert index.members("KRX 반도체") == ["005930", "000660", "042700"]
+    assert (tmp_path / "sectors" / "20240102.json").exists()
+
+
+def test_sector_members_tool(fake_krx):
+    output = SectorMembersTool()._run("바이오")
+    assert "'바이오' 소속 종목 1개" in output and "196170,알테오젠,KOSDAQ,제약" in output
+
+    missing = SectorMembersTool()._run("우주항공")
+    assert "찾지 못했습니다" in missing and "반도체" in missing
@@ -0,0 +1,71 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from autostocktrading.data import calendar, krx
+from autostocktrading.data.snapshot_store import FUNDAMENTAL_COLUMNS, MarketSnapshotStore
+from fixtures import FixtureKrx
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch, fresh_singletons):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    backend = FixtureKrx(tickers=5)
+    krx.use_backend(backend)
+    yield backend
+    krx.use_backend(None)
+
+
+def test_snapshot_round_trips_through_disk(backend, tmp_path):
+    store = MarketSnapshotStore(root=str(tmp_path / "snapshots"))
+    snapshot = store.load("20240102")
+    assert list(snapshot.index) == backend.tickers and snapshot.index.name == "티커"
+    assert set(snapshot["market"]) == {"KOSPI"}
+    assert {"종가", "시가총액", "상장주식수", *FUNDAMENTAL_COLUMNS} <= set(snapshot.columns)
+    assert os.path.exists(tmp_path / "snapshots" / "20240102.parquet")
+
+    # 새 프로세스는 디스크에서 같은 스냅샷을 읽고 KRX 를 부르지 않음
+    backend.reset_calls()
+    reloaded = MarketSnapshotStore(root=str(tmp_path / "snapshots"))
+    pd.testing.assert_frame_equal(reloaded.load("20240102"), snapshot)
+    pd.testing.assert_frame_equal(reloaded.load_columns("20240102", ["종가", "PER"]), snapshot[["종가", "PER"]])
+    assert backend.total_calls == 0
+
+
+def test_same_day_is_fetched_once_and_served_from_memory(backend, tmp_path):
+    store = MarketSnapshotStore(root=str(tmp_path / "snapshots"))
+    first = store.load("20240102")
+    calls = backend.calls["get_market_ohlcv"]
+    assert store.load("20240102") is first
+    assert store.load_columns("20240102", ["종가"]).equals(first[["종가"]])
+
+    # 요청 순서대로, 없는 종목은 제외
+    tickers = [backend.tickers[2], "999999", backend.tickers[0]]
+    assert list(store.lookup_many(tickers, "20240102").index) == [backend.tickers[2], backend.tickers[0]]
+    assert store.lookup(backend.tickers[1], "20240102")["market"] == "KOSPI"
+    assert backend.calls["get_market_ohlcv"] == calls
+
+
+def test_missing_date_returns_empty_and_is_not_stored(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, "get_market_ohlcv", lambda *args, market=None: pd.DataFrame())
+    store = MarketSnapshotStore(root=str(tmp_path / "snapshots"))
+
+    assert store.load("20240102").empty
+    assert store.load_columns("20240102", ["종가"]).empty
+    assert store.lookup("100000", "20240102") is None
+    assert store.lookup_many(["100000"], "20240102").empty
+    assert not os.listdir(tmp_path / "snapshots")
+
+
+def test_unsettled_day_is_kept_in_memory_only(backend, tmp_path):
+    # 장중에는 당일 스냅샷이 바뀔 수 있으므로 디스크에 기록하지 않음
+    calendar.freeze_clock(datetime(2024, 1, 3, 10, 0))
+    try:
+        store = MarketSnapshotStore(root=str(tmp_path / "snapshots"))
+        assert not store.load("20240103").empty
+        assert not os.path.exists(tmp_path / "snapshots" / "20240103.parquet")
+    finally:
+        calendar.freeze_clock(None)
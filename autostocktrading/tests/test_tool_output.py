@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autostocktrading.tools import output
+from autostocktrading.tools.output import CompactOutputTool, estimate_tokens, format_matrix, format_table
+
+FRAME = pd.DataFrame({"ticker": ["000010", "000020"], "PER": [5.12345, 12.5], "total_rank": [4.0, 8.0]})
+
+
+def test_table_formats_round_and_drop_padding():
+    assert format_table(FRAME, "csv", 1) == "ticker,PER,total_rank\n000010,5.1,4.0\n000020,12.5,8.0"
+    payload = json.loads(format_table(FRAME, "json", 2))
+    assert payload == {"columns": ["ticker", "PER", "total_rank"], "rows": [["000010", 5.12, 4.0], ["000020", 12.5, 8.0]]}
+    assert "5.12" in format_table(FRAME, "text", 2)
+    assert estimate_tokens(format_table(FRAME, "csv")) < estimate_tokens(FRAME.to_string())
+
+
+def test_matrix_is_summarised_as_upper_triangle_pairs():
+    tickers = [f"{i:06d}" for i in range(1, 9)]
+    matrix = pd.DataFrame(np.corrcoef(np.random.default_rng(0).random((8, 40))), index=tickers, columns=tickers)
+
+    full = format_matrix(matrix, "csv", 2, top_k=0, value="corr")
+    assert full.count("\n") == 28    # 헤더 + 8·7/2 쌍
+
+    summary = format_matrix(matrix, "csv", 2, top_k=3, value="corr")
+    assert "종목 쌍 28개" in summary and summary.count("\n") < full.count("\n")
+    assert estimate_tokens(summary) < estimate_tokens(matrix.to_string())
+
+    # text 는 기존과 같은 전체 행렬
+    assert format_matrix(matrix, "text", 2) == matrix.round(2).to_string()
+
+
+class EchoTool(CompactOutputTool):
+    name: str = "Echo Tool"
+    description: str = "표를 돌려줍니다."
+
+    def _run(self) -> str:
+        return self.table(FRAME)
+
+
+def test_tools_record_output_tokens_and_validate_format(monkeypatch):
+    output.reset_usage()
+    monkeypatch.setenv("TOOL_OUTPUT_FORMAT", "json")
+    tool = EchoTool()
+    assert tool.output_format == "json"
+
+    # 에이전트가 호출하는 경로(구조화 도구)도 집계
+    tool.to_structured_tool().func()
+    tool._run()
+    assert "Echo Tool: 2회" in output.usage_summary()
+
+    with pytest.raises(ValueError):
+        EchoTool(output_format="xml")
+    output.reset_usage()
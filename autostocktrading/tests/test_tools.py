@@ -1,35 +1,59 @@
-from autostocktrading.src.autostocktrading.tools.market_data_tools import *
-from datetime import datetime, timedelta
+from datetime import datetime
 
-def test_market_data_tools():
-    print("도구 테스트를 시작합니다.")
+import pandas as pd
+import pytest
 
-    # 1. KOSPI 시장의 티커 목록 조회 테스트
-    print("\n--- 1. KOSPI 티커 목록 조회 ---")
+from autostocktrading.data import calendar, krx
+from autostocktrading.tools.market_data_tools import TickerListTool, TickerListToolInput
+from autostocktrading.tools.financial_tools import StockFundamentalTool, StockFundamentalToolInput
+from autostocktrading.tools.trading_tools import TradingPlannerTool
+from fixtures import FixtureKrx
+
+
+@pytest.fixture
+def fixture_krx(tmp_path, monkeypatch, fresh_singletons):
+    monkeypatch.setenv("AUTOSTOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("KRX_RATE_LIMIT", "0")
+    backend = FixtureKrx(tickers=20)
+    krx.use_backend(backend)
+    yield backend
+    krx.use_backend(None)
+
+
+def test_ticker_list_tool(fixture_krx):
     TickerListToolInput(market="KOSPI")
     kospi_tickers = TickerListTool()._run("KOSPI")
-    print(f"KOSPI 종목 수: {len(kospi_tickers)}")
-    print(f"샘플 티커 5개: {kospi_tickers[:5]}")
+    assert kospi_tickers == fixture_krx.tickers
+    assert TickerListTool()._run({"description": "KOSDAQ"}) == []
+    assert TickerListTool()._run("NASDAQ")[0].startswith("오류")
+
+
+def test_stock_fundamental_tool_reads_market_snapshot(fixture_krx):
+    StockFundamentalToolInput(ticker="100010")
+    fundamentals = StockFundamentalTool()._run(ticker="100010")
+    assert set(fundamentals) == {"BPS", "PER", "PBR", "EPS", "DIV", "DPS"}
 
-    # 2. 삼성전자(005930) 재무 정보 조회 테스트
-    print("\n--- 2. 삼성전자(005930) 재무 정보 조회 ---")
-    StockFundamentalToolInput(ticker="005930")
-    samsung_fundamentals = StockFundamentalTool()._run(ticker="005930")
-    print(samsung_fundamentals)
+    # 같은 스냅샷에서 다른 종목을 조회할 때는 KRX 를 다시 부르지 않음
+    calls = fixture_krx.calls["get_market_fundamental"]
+    assert "error" in StockFundamentalTool()._run(ticker="999999")
+    assert fixture_krx.calls["get_market_fundamental"] == calls
 
-    # 3. SK하이닉스(000660) 최근 7일간 주가 조회 테스트
-    print("\n--- 3. SK하이닉스(000660) 최근 7일간 주가 조회 ---")
-    today = datetime.now()
-    start_date = today - timedelta(days=7)
 
-    today_str = today.strftime("%Y%m%d")
-    start_date_str = start_date.strftime("%Y%m%d")
+def test_planner_falls_back_to_previous_close_without_todays_row(fixture_krx, monkeypatch):
+    ohlcv = fixture_krx.get_market_ohlcv
 
-    StockOHLCVToolInput(ticker="000660", from_date=start_date_str, to_date=today_str)
-    skhynix_ohlcv = StockOHLCVTool()._run("000660", start_date_str, today_str)
-    print(skhynix_ohlcv)
+    def without_today(*args, market=None):
+        df = ohlcv(*args, market=market)
+        # 장중 재점검: 아직 당일 일봉이 없는 종목
+        return df if market is not None else df[df.index < pd.Timestamp("2024-01-03")]
 
-    print("\n✅ 모든 테스트가 완료되었습니다.")
+    monkeypatch.setattr(fixture_krx, "get_market_ohlcv", without_today)
+    calendar.freeze_clock(datetime(2024, 1, 3, 10, 0))
+    try:
+        plan, orders = TradingPlannerTool().plan({"100000": 50, "100010": 50}, 10_000_000)
+    finally:
+        calendar.freeze_clock(None)
 
-if __name__ == '__main__':
-    test_market_data_tools()
\ No newline at end of file
+    closes = ohlcv("20240102", "20240102", "100000")["종가"]
+    assert [row["종목 티커"] for row in plan] == ["100000", "100010"]
+    assert orders[0]["price"] == closes.iloc[-1]